@@ -0,0 +1,166 @@
+# neuro_symbolic_code_mentor/analysis_context.py
+
+import ast
+from typing import Dict, List, Optional, Type
+
+# Registry of checker classes: {checker_name: Checker subclass}
+CHECKERS: Dict[str, Type["Checker"]] = {}
+
+
+def register_checker(name: str):
+    """
+    Class decorator that registers a Checker under `name` so every
+    AnalysisContext runs it as part of its combined AST pass.
+    """
+    def decorator(cls):
+        CHECKERS[name] = cls
+        return cls
+    return decorator
+
+
+class Checker:
+    """
+    Base class for checkers driven by AnalysisContext.
+
+    Instead of walking the tree itself, a checker defines `visit_<NodeType>(node)`
+    (called when the node is entered) and optionally `leave_<NodeType>(node)`
+    (called once all of its children have been visited). Results are returned
+    by `result()` after the pass.
+    """
+
+    def result(self):
+        raise NotImplementedError
+
+    def parts(self):
+        """
+        A list result split into the lists it concatenates (e.g. one per
+        rule), so results of separate runs can be combined part by part in
+        the order result() uses (see definition_cache). Default: one part.
+        """
+        return [self.result()]
+
+
+@register_checker("function_names")
+class FunctionNameChecker(Checker):
+    """
+    Collects the names of all function definitions, in source order.
+    """
+    def __init__(self):
+        self.names = []
+
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        self.names.append(node.name)
+
+    def result(self):
+        return self.names
+
+
+class AnalysisContext:
+    """
+    Parses a piece of source once and shares the tree (and checker results)
+    between every analyzer that works on that source.
+
+    Checker results are computed lazily: the first `result(name)` call runs
+    every registered checker that has not run yet in a single traversal.
+    """
+
+    def __init__(self, code: str, filename: str = "<unknown>"):
+        self.code = code
+        self.filename = filename
+        self._tree: Optional[ast.AST] = None
+        self._syntax_error: Optional[SyntaxError] = None
+        self._results = {}
+        self.parse_count = 0
+        self.pass_count = 0
+
+    @property
+    def tree(self) -> ast.AST:
+        """
+        The parsed module. A SyntaxError is cached and re-raised on every access.
+        """
+        if self._syntax_error is not None:
+            raise self._syntax_error
+        if self._tree is None:
+            self.parse_count += 1
+            try:
+                self._tree = ast.parse(self.code, filename=self.filename)
+            except SyntaxError as e:
+                self._syntax_error = e
+                raise
+        return self._tree
+
+    def take_tree(self) -> ast.AST:
+        """
+        Hands the parsed tree to a caller that transforms it in place
+        (e.g. symbolic_refactor). Later reads of `tree` parse a fresh copy.
+        """
+        tree = self.tree
+        self._tree = None
+        return tree
+
+    def result(self, name: str):
+        """
+        Returns the result of the registered checker `name`, running all
+        pending registered checkers in one pass if needed.
+        """
+        if name not in self._results:
+            pending = {
+                checker_name: checker_cls()
+                for checker_name, checker_cls in CHECKERS.items()
+                if checker_name not in self._results
+            }
+            self.run(pending)
+        return self._results[name]
+
+    def set_result(self, name: str, value) -> None:
+        """
+        Supplies the result of checker `name` computed elsewhere (e.g. merged
+        from definition_cache), so it is not run on this context.
+        """
+        self._results[name] = value
+
+    def run(self, checkers: Dict[str, Checker]) -> Dict[str, object]:
+        """
+        Runs the given checkers over the tree in one combined traversal and
+        stores their results under the given names.
+        """
+        tree = self.tree
+        self.pass_count += 1
+        handlers = {}  # {node_type_name: (enter_handlers, leave_handlers)}
+
+        def handlers_for(type_name: str):
+            if type_name not in handlers:
+                enter = [getattr(c, "visit_" + type_name) for c in checkers.values()
+                         if hasattr(c, "visit_" + type_name)]
+                leave = [getattr(c, "leave_" + type_name) for c in checkers.values()
+                         if hasattr(c, "leave_" + type_name)]
+                handlers[type_name] = (enter, leave)
+            return handlers[type_name]
+
+        # Iterative depth-first walk: children are visited in source order and
+        # a node's leave handlers fire after its whole subtree.
+        stack: List = [(tree, False)]
+        while stack:
+            node, leaving = stack.pop()
+            enter, leave = handlers_for(type(node).__name__)
+            if leaving:
+                for handler in leave:
+                    handler(node)
+                continue
+            for handler in enter:
+                handler(node)
+            if leave:
+                stack.append((node, True))
+            children = list(ast.iter_child_nodes(node))
+            stack.extend((child, False) for child in reversed(children))
+
+        for name, checker in checkers.items():
+            self._results[name] = checker.result()
+        return {name: self._results[name] for name in checkers}
+
+
+def get_context(code: str, context: Optional[AnalysisContext] = None) -> AnalysisContext:
+    """
+    Returns `context` if one was supplied, otherwise a new context for `code`.
+    """
+    return context if context is not None else AnalysisContext(code)
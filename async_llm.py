@@ -0,0 +1,255 @@
+# neuro_symbolic_code_mentor/async_llm.py
+
+import asyncio
+import http.client
+import json
+import os
+import queue
+import random
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, List, Optional
+from urllib.parse import urlsplit
+
+DEFAULT_BASE_URL = "https://api.openai.com/v1"
+DEFAULT_MODEL = "gpt-3.5-turbo"
+DEFAULT_MAX_CONCURRENCY = 8
+
+# Status codes worth retrying: rate limiting and transient server failures.
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class LLMRequestError(Exception):
+    """
+    Raised when the completion endpoint returns a non-retryable error, or a
+    retryable one after all retries are used up.
+    """
+    def __init__(self, message: str, status: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status = status
+        self.retry_after = retry_after
+
+
+class _ConnectionPool:
+    """
+    Keep-alive HTTP(S) connections reused across requests. Connections are
+    created on demand and returned to the pool after a fully read response.
+    """
+
+    def __init__(self, base_url: str, timeout: float):
+        parts = urlsplit(base_url)
+        self.https = parts.scheme == "https"
+        self.host = parts.hostname
+        self.port = parts.port or (443 if self.https else 80)
+        self.path_prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self.created = 0
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()
+
+    def acquire(self) -> http.client.HTTPConnection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            self.created += 1
+            conn_cls = http.client.HTTPSConnection if self.https else http.client.HTTPConnection
+            return conn_cls(self.host, self.port, timeout=self.timeout)
+
+    def release(self, conn: http.client.HTTPConnection, reusable: bool) -> None:
+        if reusable:
+            self._idle.put(conn)
+        else:
+            conn.close()
+
+    def close(self) -> None:
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                return
+
+
+class AsyncLLMClient:
+    """
+    Non-blocking client for an OpenAI-compatible chat completions endpoint.
+
+    - at most `max_concurrency` requests are in flight (asyncio semaphore)
+    - HTTP connections are pooled and kept alive between requests
+    - 429/5xx responses and connection errors are retried with exponential
+      backoff and jitter (honouring Retry-After)
+
+    Mirrors LLMAssistant.generate_explanation, but as a coroutine, and adds
+    `gather_explanations` for fan-out over many prompts and
+    `stream_explanation` for reading a completion as it is generated.
+    """
+
+    def __init__(self, model: Optional[str] = None, base_url: Optional[str] = None,
+                 api_key: Optional[str] = None, max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 max_retries: int = 3, backoff: float = 0.5, timeout: float = 60.0,
+                 temperature: float = 0.2):
+        self.model = model or os.environ.get("OPENAI_MODEL", DEFAULT_MODEL)
+        self.base_url = base_url or os.environ.get("OPENAI_BASE_URL", DEFAULT_BASE_URL)
+        self.api_key = api_key if api_key is not None else os.environ.get("OPENAI_API_KEY", "")
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.temperature = temperature
+        self.pool = _ConnectionPool(self.base_url, timeout)
+        self._semaphores: Dict[int, asyncio.Semaphore] = {}
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        # Semaphores are bound to an event loop; keep one per loop so the
+        # client can be reused across asyncio.run() calls.
+        loop_id = id(asyncio.get_running_loop())
+        if loop_id not in self._semaphores:
+            self._semaphores = {loop_id: asyncio.Semaphore(self.max_concurrency)}
+        return self._semaphores[loop_id]
+
+    def _payload(self, prompt: str) -> Dict:
+        return {
+            "model": self.model,
+            "messages": [{"role": "user", "content": prompt}],
+            "temperature": self.temperature,
+        }
+
+    def _headers(self) -> Dict[str, str]:
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+        if self.api_key:
+            headers["Authorization"] = f"Bearer {self.api_key}"
+        return headers
+
+    def _open(self, path: str, payload: Dict):
+        """
+        Blocking POST on a pooled connection; runs in a worker thread.
+        Returns (connection, response) with the body still unread, for the
+        caller to read and then release; error statuses raise LLMRequestError.
+        """
+        body = json.dumps(payload).encode("utf-8")
+        conn = self.pool.acquire()
+        try:
+            conn.request("POST", self.pool.path_prefix + path, body=body, headers=self._headers())
+            response = conn.getresponse()
+            if response.status < 400:
+                return conn, response
+            data = response.read()
+            self.pool.release(conn, not response.will_close)
+        except (OSError, http.client.HTTPException) as e:
+            self.pool.release(conn, False)
+            raise LLMRequestError(f"Connection error: {e}") from e
+
+        if response.status in RETRYABLE_STATUS:
+            retry_after = response.getheader("Retry-After")
+            raise LLMRequestError(
+                f"HTTP {response.status}", status=response.status,
+                retry_after=float(retry_after) if retry_after and retry_after.isdigit() else None,
+            )
+        raise LLMRequestError(f"HTTP {response.status}: {data[:200]!r}", status=response.status)
+
+    def _post(self, path: str, payload: Dict) -> Dict:
+        """
+        Blocking POST returning the decoded JSON body; runs in a worker thread.
+        """
+        conn, response = self._open(path, payload)
+        reusable = False
+        try:
+            data = response.read()
+            reusable = not response.will_close
+        except (OSError, http.client.HTTPException) as e:
+            raise LLMRequestError(f"Connection error: {e}") from e
+        finally:
+            self.pool.release(conn, reusable)
+        return json.loads(data)
+
+    async def _request(self, payload: Dict, call=None):
+        call = call or self._post
+        for attempt in range(self.max_retries + 1):
+            try:
+                return await asyncio.to_thread(call, "/chat/completions", payload)
+            except LLMRequestError as e:
+                retryable = e.status is None or e.status in RETRYABLE_STATUS
+                if not retryable or attempt == self.max_retries:
+                    raise
+                delay = e.retry_after if e.retry_after is not None else self.backoff * (2 ** attempt)
+                await asyncio.sleep(delay * (1 + random.random() * 0.25))
+
+    async def generate_explanation(self, prompt: str) -> str:
+        async with self._semaphore():
+            data = await self._request(self._payload(prompt))
+        return data["choices"][0]["message"]["content"].strip()
+
+    async def stream_explanation(self, prompt: str) -> AsyncIterator[str]:
+        """
+        Yields the completion's text as it is generated, from the endpoint's
+        server-sent events ("stream": true). Opening the stream is retried
+        like any request; an error once text has arrived is raised as is.
+        """
+        payload = dict(self._payload(prompt), stream=True)
+        async with self._semaphore():
+            conn, response = await self._request(payload, call=self._open)
+            reusable = False
+            try:
+                while True:
+                    line = await asyncio.to_thread(response.readline)
+                    if not line:
+                        break
+                    line = line.decode("utf-8").strip()
+                    if not line.startswith("data:"):
+                        continue  # blank separators, comments, "event:" lines
+                    data = line[len("data:"):].strip()
+                    if data == "[DONE]":
+                        await asyncio.to_thread(response.read)  # drain, so the connection can be reused
+                        break
+                    for choice in json.loads(data).get("choices") or []:
+                        text = (choice.get("delta") or {}).get("content")
+                        if text:
+                            yield text
+                reusable = not response.will_close
+            except (OSError, http.client.HTTPException) as e:
+                raise LLMRequestError(f"Connection error: {e}") from e
+            finally:
+                self.pool.release(conn, reusable)
+
+    async def gather_explanations(self, prompts: List[str]) -> List[str]:
+        """
+        Sends every prompt concurrently (bounded by max_concurrency) and
+        returns the explanations in prompt order.
+        """
+        return list(await asyncio.gather(*(self.generate_explanation(p) for p in prompts)))
+
+    def close(self) -> None:
+        self.pool.close()
+
+
+async def gather_explanations(assistant, prompts: List[str],
+                              max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> List[str]:
+    """
+    Fan-out helper usable with any assistant: AsyncLLMClient runs natively;
+    a synchronous LLMAssistant is driven from worker threads, at most
+    `max_concurrency` at a time. Results keep the order of `prompts`.
+    """
+    if isinstance(assistant, AsyncLLMClient):
+        return await assistant.gather_explanations(prompts)
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def one(prompt):
+        async with semaphore:
+            return await asyncio.to_thread(assistant.generate_explanation, prompt)
+
+    return list(await asyncio.gather(*(one(p) for p in prompts)))
+
+
+def explain_many(assistant, prompts: List[str], max_concurrency: int = DEFAULT_MAX_CONCURRENCY) -> List[str]:
+    """
+    Synchronous entry point for the fan-out: explanations for all prompts,
+    fetched concurrently instead of one round-trip after another. Also works
+    when called from code running inside an event loop.
+    """
+    if not prompts:
+        return []
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(gather_explanations(assistant, prompts, max_concurrency))
+    # asyncio.run cannot nest in a running loop: run the fan-out on a fresh
+    # loop in a worker thread (this caller blocks, as it would without a loop).
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="explain-many") as executor:
+        return executor.submit(asyncio.run, gather_explanations(assistant, prompts, max_concurrency)).result()
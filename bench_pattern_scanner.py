@@ -0,0 +1,84 @@
+# neuro_symbolic_code_mentor/bench_pattern_scanner.py
+"""
+Benchmark: per-rule `pattern.search` vs. the single-pass PatternScanner.
+
+Grows the rule set from 5 to 500 rules (the stock rules from patterns.py plus
+synthetic call-site rules) and scans a multi-megabyte generated source.
+
+Usage:
+    python bench_pattern_scanner.py [--megabytes 4] [--rules 5 50 200 500]
+"""
+
+import argparse
+import random
+import re
+import time
+
+from neuro_symbolic_code_mentor.patterns import get_patterns
+from neuro_symbolic_code_mentor.pattern_scanner import PatternScanner
+
+
+def build_rules(count):
+    rules = get_patterns()[:count]
+    for k in range(count - len(rules)):
+        rules.append((re.compile(rf"\bcall_{k}_helper\s*\("), f"Synthetic rule {k}"))
+    return rules
+
+
+def build_source(megabytes, seed=0):
+    rng = random.Random(seed)
+    templates = [
+        "def func_{n}(items, value):\n",
+        "    result = compute_{n}(items) + value\n",
+        "    if result is not None and value > {n}:\n",
+        "        return [item for item in items if item != {n}]\n",
+        "    total = sum(x * {n} for x in items)\n",
+        "    # normal comment number {n}\n",
+    ]
+    chunks = []
+    size = 0
+    target = megabytes * 1024 * 1024
+    while size < target:
+        line = rng.choice(templates).format(n=rng.randint(0, 10000))
+        chunks.append(line)
+        size += len(line)
+    # A handful of genuine hits at the very end so every scan covers the whole input.
+    chunks.append("if flag == None:\n    print('done')\n")
+    return "".join(chunks)
+
+
+def time_call(func, *args, repeat=3):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def naive_fired(rules, code):
+    return [idx for idx, (pattern, _s) in enumerate(rules) if pattern.search(code)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pattern scanning benchmark")
+    parser.add_argument("--megabytes", type=int, default=4)
+    parser.add_argument("--rules", type=int, nargs="+", default=[5, 50, 200, 500])
+    args = parser.parse_args()
+
+    code = build_source(args.megabytes)
+    print(f"Input: {len(code) / 1024 / 1024:.1f} MB, {code.count(chr(10))} lines")
+    print(f"{'rules':>6} {'per-rule search':>16} {'single pass':>12} {'speedup':>8}")
+    for count in args.rules:
+        rules = build_rules(count)
+        scanner = PatternScanner(rules)
+        start = time.perf_counter()
+        expected = naive_fired(rules, code)
+        naive = time.perf_counter() - start
+        assert scanner.fired_rules(code) == expected
+        single = time_call(scanner.fired_rules, code)
+        print(f"{count:>6} {naive:>15.3f}s {single:>11.3f}s {naive / single:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
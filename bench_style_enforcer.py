@@ -0,0 +1,106 @@
+# neuro_symbolic_code_mentor/bench_style_enforcer.py
+"""
+Benchmark: the original list-based check (split the whole file, then
+`re.search` every uncompiled rule on every line) vs. the streaming
+`iter_violations` over an open file.
+
+Writes a generated source of the requested size to a temporary file and
+reports throughput in lines per second plus the peak Python memory of each
+approach.
+
+Usage:
+    python bench_style_enforcer.py [--megabytes 64] [--rules 1 10 50]
+"""
+
+import argparse
+import os
+import random
+import re
+import tempfile
+import time
+import tracemalloc
+
+from style_enforcer import STYLE_RULES, compile_rules, iter_violations
+
+
+def build_rules(count):
+    rules = dict(list(STYLE_RULES.items())[:count])
+    for k in range(count - len(rules)):
+        rules[rf"\bcall_{k}_helper\s*\(\s*None"] = f"Synthetic rule {k}"
+    return rules
+
+
+def write_source(path, megabytes, seed=0):
+    rng = random.Random(seed)
+    templates = [
+        "def func_{n}(items, value):\n",
+        "def func_{n}(items):  # returns the total\n",
+        "    result = compute_{n}(items) + value\n",
+        "    if result is not None and value > {n}:\n",
+        "        return [item for item in items if item != {n}]\n",
+        "    # normal comment number {n}\n",
+    ]
+    target = megabytes * 1024 * 1024
+    size = lines = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while size < target:
+            chunk = "".join(rng.choice(templates).format(n=rng.randint(0, 10000)) for _ in range(1000))
+            f.write(chunk)
+            size += len(chunk)
+            lines += 1000
+    return lines
+
+
+def list_based(path, rules):
+    with open(path, encoding="utf-8") as f:
+        code = f.read().splitlines()
+    violations = []
+    for i, line in enumerate(code):
+        for pattern, note in rules.items():
+            if re.search(pattern, line):
+                violations.append((i + 1, line.strip(), note))
+    return len(violations)
+
+
+def streaming(path, rules):
+    table = compile_rules(rules)
+    with open(path, encoding="utf-8") as f:
+        return sum(1 for _ in iter_violations(f, table))
+
+
+def measure(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    func(*args)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Style enforcer throughput benchmark")
+    parser.add_argument("--megabytes", type=int, default=64)
+    parser.add_argument("--rules", type=int, nargs="+", default=[1, 10, 50])
+    args = parser.parse_args()
+
+    fd, path = tempfile.mkstemp(suffix=".py")
+    os.close(fd)
+    try:
+        lines = write_source(path, args.megabytes)
+        print(f"Input: {args.megabytes} MB, {lines} lines")
+        print(f"{'rules':>6} {'list lines/s':>14} {'stream lines/s':>15} {'list peak':>10} {'stream peak':>12}")
+        for count in args.rules:
+            rules = build_rules(count)
+            expected, naive, naive_peak = measure(list_based, path, rules)
+            found, stream, stream_peak = measure(streaming, path, rules)
+            assert found == expected
+            print(f"{count:>6} {lines / naive:>14,.0f} {lines / stream:>15,.0f} "
+                  f"{naive_peak / 2**20:>8.1f}MB {stream_peak / 2**20:>10.1f}MB")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
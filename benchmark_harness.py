@@ -0,0 +1,242 @@
+# neuro_symbolic_code_mentor/benchmark_harness.py
+
+import gc
+import math
+import random
+import statistics
+import timeit
+from typing import Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+Snippet = Union[str, Callable[[], object]]
+
+DEFAULT_REPEAT = 20
+DEFAULT_WARMUP = 3
+# Each sample runs the snippet in a loop for at least this long, so timer
+# resolution and per-call overhead are negligible.
+DEFAULT_SAMPLE_TIME = 0.01
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_ALPHA = 0.05
+BOOTSTRAP_RESAMPLES = 2000
+
+
+def calibrate(timer: timeit.Timer, sample_time: float = DEFAULT_SAMPLE_TIME) -> int:
+    """
+    Smallest loop count from the 1, 2, 5, 10, 20, 50... sequence whose run
+    takes at least `sample_time` seconds (timeit.autorange with a
+    configurable threshold).
+    """
+    i = 1
+    while True:
+        for multiplier in (1, 2, 5):
+            number = i * multiplier
+            if timer.timeit(number) >= sample_time:
+                return number
+        i *= 10
+
+
+def summarize(samples: Sequence[float], confidence: float = DEFAULT_CONFIDENCE, seed: int = 0) -> Dict:
+    """
+    Robust summary of per-loop times: median and IQR (insensitive to the
+    occasional slow outlier), plus a bootstrap confidence interval for the median.
+    """
+    ordered = sorted(samples)
+    if len(ordered) >= 2:
+        q1, median, q3 = statistics.quantiles(ordered, n=4, method="inclusive")
+    else:
+        q1 = median = q3 = ordered[0]
+    low, high = bootstrap_ci(ordered, statistics.median, confidence, seed)
+    return {
+        "samples": len(ordered),
+        "median": median,
+        "q1": q1,
+        "q3": q3,
+        "iqr": q3 - q1,
+        "mean": statistics.fmean(ordered),
+        "stdev": statistics.stdev(ordered) if len(ordered) >= 2 else 0.0,
+        "min": ordered[0],
+        "max": ordered[-1],
+        "ci_low": low,
+        "ci_high": high,
+        "confidence": confidence,
+    }
+
+
+def bootstrap_ci(samples: Sequence[float], statistic: Callable[[Sequence[float]], float],
+                 confidence: float = DEFAULT_CONFIDENCE, seed: int = 0,
+                 resamples: int = BOOTSTRAP_RESAMPLES) -> Tuple[float, float]:
+    """
+    Percentile bootstrap interval for `statistic`. Seeded, so the same
+    samples always give the same interval.
+    """
+    rng = random.Random(seed)
+    estimates = [statistic(rng.choices(samples, k=len(samples))) for _ in range(resamples)]
+    return _percentile_interval(estimates, confidence)
+
+
+def speedup_ci(before: Sequence[float], after: Sequence[float], confidence: float = DEFAULT_CONFIDENCE,
+               seed: int = 0, resamples: int = BOOTSTRAP_RESAMPLES) -> Tuple[float, float]:
+    """
+    Bootstrap interval for median(before) / median(after), resampling both
+    groups independently.
+    """
+    rng = random.Random(seed)
+    estimates = []
+    for _ in range(resamples):
+        numerator = statistics.median(rng.choices(before, k=len(before)))
+        denominator = statistics.median(rng.choices(after, k=len(after)))
+        estimates.append(numerator / denominator if denominator else math.inf)
+    return _percentile_interval(estimates, confidence)
+
+
+def _percentile_interval(estimates: List[float], confidence: float) -> Tuple[float, float]:
+    estimates = sorted(estimates)
+    tail = (1 - confidence) / 2
+    last = len(estimates) - 1
+    return estimates[int(tail * last)], estimates[int((1 - tail) * last)]
+
+
+def mann_whitney_u(a: Sequence[float], b: Sequence[float]) -> Tuple[float, float]:
+    """
+    Two-sided Mann-Whitney U test (normal approximation with tie and
+    continuity correction). Returns (U for `a`, p-value). Makes no
+    normality assumption, which suits skewed timing distributions.
+    """
+    n1, n2 = len(a), len(b)
+    combined = sorted([(value, 0) for value in a] + [(value, 1) for value in b])
+    rank_sum_a = 0.0
+    tie_term = 0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        average_rank = (i + j) / 2 + 1
+        rank_sum_a += average_rank * sum(1 for k in range(i, j + 1) if combined[k][1] == 0)
+        ties = j - i + 1
+        tie_term += ties ** 3 - ties
+        i = j + 1
+
+    u = rank_sum_a - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    if n1 == 0 or n2 == 0 or n < 3:
+        return u, 1.0
+    mean_u = n1 * n2 / 2
+    variance = n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return u, 1.0
+    z = (abs(u - mean_u) - 0.5) / math.sqrt(variance)
+    return u, min(1.0, math.erfc(max(z, 0.0) / math.sqrt(2)))
+
+
+def module_runner(code: str, filename: str = "<benchmark>") -> Callable[[], None]:
+    """
+    Zero-argument callable that runs `code` as a whole module in a fresh
+    namespace, exactly like `exec(code, {})` but compiled only once.
+    """
+    compiled = compile(code, filename, "exec")
+    return lambda: exec(compiled, {})
+
+
+def _timer(snippet: Snippet, setup: Snippet, globals: Optional[Dict]) -> timeit.Timer:
+    return timeit.Timer(snippet, setup, globals=dict(globals or {}))
+
+
+def _sample(timer: timeit.Timer, number: int) -> float:
+    return timer.timeit(number) / number
+
+
+def benchmark(snippet: Snippet, setup: Snippet = "pass", globals: Optional[Dict] = None,
+              repeat: int = DEFAULT_REPEAT, warmup: int = DEFAULT_WARMUP,
+              sample_time: float = DEFAULT_SAMPLE_TIME, confidence: float = DEFAULT_CONFIDENCE) -> Dict:
+    """
+    Times `snippet` (source code or a zero-argument callable): calibrates the
+    loop count, discards `warmup` samples, then collects `repeat` samples of
+    seconds per run. Returns `summarize()` of them plus "number" (loops per
+    sample). Exceptions raised by the snippet propagate.
+    """
+    timer = _timer(snippet, setup, globals)
+    number = calibrate(timer, sample_time)
+    for _ in range(warmup):
+        timer.timeit(number)
+    samples = [_sample(timer, number) for _ in range(repeat)]
+    result = summarize(samples, confidence)
+    result["number"] = number
+    return result
+
+
+def compare(before: Snippet, after: Snippet, setup: Snippet = "pass", globals: Optional[Dict] = None,
+            repeat: int = DEFAULT_REPEAT, warmup: int = DEFAULT_WARMUP,
+            sample_time: float = DEFAULT_SAMPLE_TIME, confidence: float = DEFAULT_CONFIDENCE,
+            alpha: float = DEFAULT_ALPHA) -> Dict:
+    """
+    Benchmarks a before/after pair and decides whether `after` is really
+    faster or slower. Samples of the two snippets are interleaved so drift
+    (thermal throttling, background load) hits both equally.
+
+    Returns {"before": summary, "after": summary, "speedup": median ratio,
+    "speedup_ci": (low, high), "p_value", "significant", "verdict"}, where
+    the difference is significant when the Mann-Whitney p-value is below
+    `alpha` and the bootstrap interval of the speedup excludes 1.
+    """
+    timers = [_timer(before, setup, globals), _timer(after, setup, globals)]
+    numbers = [calibrate(timer, sample_time) for timer in timers]
+    for _ in range(warmup):
+        for timer, number in zip(timers, numbers):
+            timer.timeit(number)
+
+    samples: List[List[float]] = [[], []]
+    for _ in range(repeat):
+        for side, (timer, number) in enumerate(zip(timers, numbers)):
+            samples[side].append(_sample(timer, number))
+        gc.collect()
+
+    summary_before = summarize(samples[0], confidence)
+    summary_after = summarize(samples[1], confidence)
+    summary_before["number"], summary_after["number"] = numbers
+    speedup = summary_before["median"] / summary_after["median"] if summary_after["median"] else math.inf
+
+    interval = speedup_ci(samples[0], samples[1], confidence)
+    _u, p_value = mann_whitney_u(samples[0], samples[1])
+    significant = p_value < alpha and not (interval[0] <= 1.0 <= interval[1])
+    if not significant:
+        verdict = "no significant difference"
+    elif speedup > 1:
+        verdict = f"after is {speedup:.2f}x faster"
+    else:
+        verdict = f"after is {1 / speedup:.2f}x slower"
+    return {
+        "before": summary_before,
+        "after": summary_after,
+        "speedup": speedup,
+        "speedup_ci": interval,
+        "p_value": p_value,
+        "significant": significant,
+        "verdict": verdict,
+    }
+
+
+def _format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def format_benchmark(result: Dict) -> str:
+    return (
+        f"median {_format_time(result['median'])} per run "
+        f"(IQR {_format_time(result['iqr'])}, "
+        f"{result['confidence']:.0%} CI {_format_time(result['ci_low'])} - {_format_time(result['ci_high'])}; "
+        f"{result['samples']} samples x {result['number']} loops)"
+    )
+
+
+def format_comparison(result: Dict) -> str:
+    low, high = result["speedup_ci"]
+    return "\n".join([
+        f"Before: {format_benchmark(result['before'])}",
+        f"After:  {format_benchmark(result['after'])}",
+        f"Speedup: {result['speedup']:.2f}x "
+        f"({result['before']['confidence']:.0%} CI {low:.2f}x - {high:.2f}x, p={result['p_value']:.4f})",
+        f"Verdict: {result['verdict']}",
+    ])
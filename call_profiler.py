@@ -0,0 +1,153 @@
+# neuro_symbolic_code_mentor/call_profiler.py
+
+import cProfile
+import os
+import pstats
+import time
+from typing import Dict, List, Optional, Tuple
+
+DEFAULT_FILENAME = "<profiled>"
+DEFAULT_TOP = 15
+DEFAULT_MAX_PATHS = 5
+# A call edge is followed when it carries at least this share of the total time.
+DEFAULT_MIN_PATH_FRACTION = 0.05
+MAX_PATH_DEPTH = 12
+
+FuncKey = Tuple[str, int, str]  # pstats key: (file, line, function name)
+
+
+def _is_profiler_entry(key: FuncKey) -> bool:
+    # The exec() that starts the code and the disable() that stops the profiler.
+    return key[0] == "~" and ("builtins.exec" in key[2] or "_lsprof.Profiler" in key[2])
+
+
+def function_label(key: FuncKey, filename: str = DEFAULT_FILENAME) -> str:
+    file, line, name = key
+    if file == "~":
+        return name  # built-in, e.g. "<built-in method builtins.sorted>"
+    if file == filename:
+        return f"{name} (line {line})"
+    return f"{name} ({os.path.basename(file)}:{line})"
+
+
+def profile_code(code: str, filename: str = DEFAULT_FILENAME, top: int = DEFAULT_TOP,
+                 max_paths: int = DEFAULT_MAX_PATHS,
+                 min_path_fraction: float = DEFAULT_MIN_PATH_FRACTION) -> Dict:
+    """
+    Runs `code` under cProfile and returns a JSON-serializable report:
+
+      {"total_time": seconds, "error": None or "Type: message",
+       "functions": [{"function", "file", "line", "calls", "primitive_calls",
+                      "own_time", "cumulative_time", "own_per_call"}, ...],
+       "hot_paths": [{"path": [label, ...], "cumulative_time", "calls"}, ...]}
+
+    `functions` is sorted by own time and cut to `top` entries. cProfile's
+    built-in timer is the monotonic high-resolution clock behind
+    time.perf_counter, so short functions are timed accurately without a
+    Python-level timer callback on every event. A runtime error stops the
+    code, but whatever ran before it is still reported; code that does not
+    compile is reported the same way, with nothing profiled.
+    """
+    try:
+        compiled = compile(code, filename, "exec")
+    except (SyntaxError, ValueError) as e:  # ValueError: null bytes in the source
+        return {"total_time": 0.0, "error": f"{type(e).__name__}: {e}", "functions": [], "hot_paths": []}
+    profiler = cProfile.Profile()
+    error = None
+    start = time.perf_counter()
+    profiler.enable()
+    try:
+        exec(compiled, {})
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        profiler.disable()
+    total_time = time.perf_counter() - start
+
+    try:
+        raw = pstats.Stats(profiler).stats
+    except TypeError:  # nothing was recorded
+        raw = {}
+    stats = {key: value for key, value in raw.items() if not _is_profiler_entry(key)}
+
+    functions = []
+    for key, (primitive_calls, calls, own_time, cumulative_time, _callers) in stats.items():
+        functions.append({
+            "function": function_label(key, filename),
+            "file": key[0],
+            "line": key[1],
+            "calls": calls,
+            "primitive_calls": primitive_calls,
+            "own_time": own_time,
+            "cumulative_time": cumulative_time,
+            "own_per_call": own_time / calls if calls else 0.0,
+        })
+    functions.sort(key=lambda f: (f["own_time"], f["cumulative_time"]), reverse=True)
+
+    return {
+        "total_time": total_time,
+        "error": error,
+        "functions": functions[:top],
+        "hot_paths": hot_paths(stats, filename, max_paths, min_path_fraction * total_time),
+    }
+
+
+def hot_paths(stats: Dict, filename: str = DEFAULT_FILENAME, max_paths: int = DEFAULT_MAX_PATHS,
+              min_time: float = 0.0) -> List[Dict]:
+    """
+    Heaviest call chains from the profiled module down, following only
+    caller->callee edges whose cumulative time is at least `min_time`.
+    Each path ends where no heavy enough edge continues it; its weight is the
+    time spent in the last function when called along that edge.
+    """
+    children: Dict[FuncKey, List[Tuple[float, int, FuncKey]]] = {}
+    for callee, (_cc, _nc, _tt, _ct, callers) in stats.items():
+        for caller, (_ecc, edge_calls, _ett, edge_time) in callers.items():
+            if caller in stats and edge_time >= min_time:
+                children.setdefault(caller, []).append((edge_time, edge_calls, callee))
+
+    roots = [key for key in stats if key[0] == filename and key[2] == "<module>"]
+    paths = []
+    # Iterative DFS; a function already on the current path is not revisited,
+    # so recursion shows up once instead of looping.
+    stack = [([root], stats[root][3], stats[root][1]) for root in roots]
+    while stack:
+        path, weight, calls = stack.pop()
+        extensions = [] if len(path) >= MAX_PATH_DEPTH else [
+            (edge_time, edge_calls, callee)
+            for edge_time, edge_calls, callee in children.get(path[-1], [])
+            if callee not in path
+        ]
+        if not extensions:
+            paths.append((weight, calls, path))
+            continue
+        for edge_time, edge_calls, callee in extensions:
+            stack.append((path + [callee], edge_time, edge_calls))
+
+    paths.sort(key=lambda p: p[0], reverse=True)
+    return [
+        {"path": [function_label(key, filename) for key in path], "cumulative_time": weight, "calls": calls}
+        for weight, calls, path in paths[:max_paths]
+    ]
+
+
+def format_profile(report: Dict, top: Optional[int] = None) -> str:
+    """
+    Plain-text table of a `profile_code` report, for the console and prompts.
+    """
+    lines = [f"Execution Time: {report['total_time']:.6f} seconds"]
+    if report["error"]:
+        lines.append(f"Runtime Error during profiling: {report['error']}")
+    functions = report["functions"][:top] if top else report["functions"]
+    if functions:
+        lines.append("")
+        lines.append(f"{'calls':>10} {'own (s)':>10} {'cumul (s)':>10}  function")
+        for f in functions:
+            calls = str(f["calls"]) if f["calls"] == f["primitive_calls"] else f"{f['calls']}/{f['primitive_calls']}"
+            lines.append(f"{calls:>10} {f['own_time']:>10.6f} {f['cumulative_time']:>10.6f}  {f['function']}")
+    if report["hot_paths"]:
+        lines.append("")
+        lines.append("Hot call paths:")
+        for p in report["hot_paths"]:
+            lines.append(f"  {p['cumulative_time']:.6f}s ({p['calls']} calls)  " + " -> ".join(p["path"]))
+    return "\n".join(lines)
@@ -1,13 +1,395 @@
 import ast
+import sys
 from llm_handler import LLMAssistant
+from neuro_symbolic_code_mentor.analysis_context import Checker, get_context, register_checker
+from neuro_symbolic_code_mentor.streaming import explain
+
+@register_checker("loops")
+class LoopCountChecker(Checker):
+    """
+    Counts for/while loops during the shared AnalysisContext pass.
+    """
+    def __init__(self):
+        self.loop_count = 0
+
+    def visit_For(self, node):
+        self.loop_count += 1
+
+    visit_While = visit_For
+
+    def result(self):
+        return self.loop_count
+
+# Cost of one iteration's anti-pattern as (power of n, log factor).
+CONSTANT, LINEAR, LINEARITHMIC = (0, False), (1, False), (1, True)
+
+def cost_class(power, log=False):
+    """
+    Renders n^power (log n) as big-O notation, e.g. cost_class(2) == "O(n^2)".
+    """
+    if power == 0:
+        return "O(log n)" if log else "O(1)"
+    base = "n" if power == 1 else f"n^{power}"
+    return f"O({base} log n)" if log else f"O({base})"
+
+def _is_call_to(node, name):
+    return isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == name
+
+def _value_kind(node):
+    # What an assigned value is known to be: "list", "dict", "str" or None.
+    if isinstance(node, (ast.List, ast.ListComp)) or _is_call_to(node, "list"):
+        return "list"
+    if isinstance(node, (ast.Dict, ast.DictComp)) or _is_call_to(node, "dict"):
+        return "dict"
+    if (isinstance(node, ast.Constant) and isinstance(node.value, str)) or \
+            isinstance(node, ast.JoinedStr) or _is_call_to(node, "str"):
+        return "str"
+    return None
+
+def _appended_name(stmt):
+    # `x.append(...)`, optionally under a single `if` without else.
+    if isinstance(stmt, ast.If) and not stmt.orelse and len(stmt.body) == 1:
+        stmt = stmt.body[0]
+    if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Call):
+        func = stmt.value.func
+        if isinstance(func, ast.Attribute) and func.attr == "append" and isinstance(func.value, ast.Name):
+            return func.value.id
+    return None
+
+class LoopScopeChecker(Checker):
+    """
+    Base for checkers that need to know where they are: the enclosing
+    function, how many loops deep (comprehensions included) and what local
+    names are known to hold. Subclasses extend the visit_ methods with
+    super() calls.
+    """
+    def __init__(self):
+        self.frames = [self._frame("<module>", 0)]
+        self.functions = []
+        # Nodes evaluated once per iteration of the *enclosing* loop (a for
+        # loop's iterable, a comprehension's first iterable), with the
+        # depth they really run at.
+        self.header_depth = {}
+
+    @staticmethod
+    def _frame(function, line):
+        return {"function": function, "line": line, "depth": 0, "max_depth": 0, "kinds": {}}
+
+    def visit_FunctionDef(self, node):
+        self.frames.append(self._frame(node.name, node.lineno))
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def leave_FunctionDef(self, node):
+        self.leave_function(self.frames.pop())
+
+    leave_AsyncFunctionDef = leave_FunctionDef
+
+    def leave_function(self, frame):
+        self.functions.append(frame)
+
+    def _enter_loops(self, count):
+        frame = self.frames[-1]
+        frame["depth"] += count
+        frame["max_depth"] = max(frame["max_depth"], frame["depth"])
+
+    def _depth(self, node):
+        return self.header_depth.get(id(node), self.frames[-1]["depth"])
+
+    def _mark_header(self, header, depth):
+        for child in ast.walk(header):
+            self.header_depth.setdefault(id(child), depth)
+
+    def visit_For(self, node):
+        self._mark_header(node.iter, self._depth(node))
+        self._enter_loops(1)
+
+    visit_AsyncFor = visit_For
+
+    def leave_For(self, node):
+        self.frames[-1]["depth"] -= 1
+
+    leave_AsyncFor = leave_While = leave_For
+
+    def visit_While(self, node):
+        self._enter_loops(1)
+
+    def visit_ListComp(self, node):
+        self._mark_header(node.generators[0].iter, self._depth(node))
+        self._enter_loops(len(node.generators))
+
+    visit_SetComp = visit_DictComp = visit_GeneratorExp = visit_ListComp
+
+    def leave_ListComp(self, node):
+        self.frames[-1]["depth"] -= len(node.generators)
+
+    leave_SetComp = leave_DictComp = leave_GeneratorExp = leave_ListComp
+
+    def visit_Assign(self, node):
+        kind = _value_kind(node.value)
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                self.bind(target.id, kind, node)
+
+    def visit_AnnAssign(self, node):
+        if isinstance(node.target, ast.Name) and node.value is not None:
+            self.bind(node.target.id, _value_kind(node.value), node)
+
+    def bind(self, name, kind, node):
+        self.frames[-1]["kinds"][name] = kind
+
+    def _kind(self, node):
+        if isinstance(node, ast.Name):
+            return self.frames[-1]["kinds"].get(node.id)
+        return _value_kind(node)
+
+@register_checker("loop_performance")
+class LoopPerformanceChecker(LoopScopeChecker):
+    """
+    Static hot-loop analysis in the shared AnalysisContext pass: the deepest
+    loop nesting per function (comprehensions included) and anti-patterns
+    that make every iteration expensive. Each finding carries the cost of one
+    iteration and the resulting cost class of the whole loop nest, where n
+    stands for the size of every loop and collection involved.
+    """
+    def __init__(self):
+        super().__init__()
+        self.findings = []
+
+    def _report(self, node, kind, message, per_iteration):
+        depth = self._depth(node)
+        power, log = per_iteration
+        self.findings.append({
+            "line": node.lineno, "function": self.frames[-1]["function"], "kind": kind,
+            "message": message, "loop_depth": depth,
+            "per_iteration": cost_class(power, log), "cost": cost_class(depth + power, log),
+        })
+
+    def visit_For(self, node):
+        super().visit_For(node)
+        if self._depth(node.iter) > 0:
+            self._check_header(node.iter, "re-evaluated on every iteration of the enclosing loop")
+        name = _appended_name(node.body[0]) if len(node.body) == 1 and not node.orelse else None
+        if name is not None:
+            self._report(node, "append_loop",
+                         f"Loop only appends to '{name}'; a list comprehension avoids the per-iteration "
+                         f"'.append' lookup and call.", CONSTANT)
+
+    visit_AsyncFor = visit_For
+
+    def visit_While(self, node):
+        super().visit_While(node)
+        self._check_header(node.test, "re-evaluated on every iteration of this while loop")
+
+    def _check_header(self, header, where):
+        repeated = []
+        for child in ast.walk(header):
+            if _is_call_to(child, "len"):
+                repeated.append(ast.unparse(child))
+            elif isinstance(child, ast.Attribute) and isinstance(child.ctx, ast.Load):
+                repeated.append(ast.unparse(child))
+        if repeated:
+            repeated = list(dict.fromkeys(repeated))
+            listed = ", ".join(f"'{text}'" for text in repeated)
+            verb, hoist = ("are", "them into locals") if len(repeated) > 1 else ("is", "it into a local")
+            self._report(header, "loop_header",
+                         f"{listed} {verb} {where}; hoist {hoist} if unchanged.", CONSTANT)
+
+    # -- per-iteration anti-patterns --
+
+    def visit_Compare(self, node):
+        if self._depth(node) == 0:
+            return
+        for op, comparator in zip(node.ops, node.comparators):
+            # A literal list is a small constant (CPython turns it into a tuple).
+            if isinstance(op, (ast.In, ast.NotIn)) and not isinstance(comparator, ast.List) \
+                    and self._kind(comparator) == "list":
+                self._report(node, "list_membership",
+                             f"Membership test on list '{ast.unparse(comparator)}' inside a loop scans the list "
+                             f"every iteration; use a set built once before the loop.", LINEAR)
+
+    def visit_Call(self, node):
+        if self._depth(node) == 0:
+            return
+        func = node.func
+        if isinstance(func, ast.Attribute) and func.attr == "index":
+            self._report(node, "list_index",
+                         f"'{ast.unparse(func)}()' inside a loop is a linear search every iteration; "
+                         f"keep a dict from value to position instead.", LINEAR)
+        elif _is_call_to(node, "sorted") or (isinstance(func, ast.Attribute) and func.attr == "sort"):
+            self._report(node, "sort_in_loop",
+                         "Sorting inside a loop re-sorts every iteration; sort once outside the loop, "
+                         "or keep the data ordered with bisect.insort or heapq.", LINEARITHMIC)
+
+    def visit_AugAssign(self, node):
+        if self._depth(node) == 0 or not isinstance(node.op, ast.Add) or not isinstance(node.target, ast.Name):
+            return
+        if self._kind(node.target) == "str" or _value_kind(node.value) == "str":
+            self._report(node, "string_concat",
+                         f"'{node.target.id} +=' builds a new string every iteration (quadratic copying); "
+                         f"collect the pieces in a list and ''.join() them.", LINEAR)
+
+    def result(self):
+        frames = sorted(self.functions, key=lambda frame: frame["line"])
+        if self.frames[0]["max_depth"]:
+            frames.insert(0, self.frames[0])
+        functions = [{"function": frame["function"], "line": frame["line"], "max_loop_depth": frame["max_depth"]}
+                     for frame in frames]
+        return {"functions": functions, "findings": self.findings}
+
+def _is_numeric(node):
+    # Expressions that certainly produce an int or float.
+    if isinstance(node, ast.Constant):
+        return isinstance(node.value, (int, float)) and not isinstance(node.value, bool)
+    if isinstance(node, ast.UnaryOp):
+        return _is_numeric(node.operand)
+    if isinstance(node, ast.BinOp):
+        # + * % also work on strings and lists: need a numeric operand and no string.
+        if _value_kind(node.left) == "str" or _value_kind(node.right) == "str":
+            return False
+        return not isinstance(node.op, (ast.Add, ast.Mult, ast.Mod)) or \
+            _is_numeric(node.left) or _is_numeric(node.right)
+    return any(_is_call_to(node, name) for name in ("int", "float", "len", "abs", "round", "sum"))
+
+# Built-ins whose result does not depend on the order of the list passed in.
+ORDER_FREE_CALLS = ("len", "set", "frozenset", "sum", "min", "max", "any", "all")
+
+@register_checker("data_structures")
+class DataStructureUsageChecker(LoopScopeChecker):
+    """
+    Records how every list or dict bound to a local name is used, in the
+    shared AnalysisContext pass. One record per binding:
+      {"name", "kind": "list" | "dict", "function", "line",
+       "ops": {operation: count}, "ops_in_loop": {operation: count},
+       "numeric": only numbers were ever put in}
+    Operations are "membership", "append", "pop_front", "insert_front",
+    "index_access", "index_store", "index_lookup" (list.index), "sort",
+    "iterate" (for loops and comprehensions), "escape" (returned, yielded,
+    passed to a call or assigned elsewhere, so other code may see its order)
+    and any other method name called on it.
+    """
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def bind(self, name, kind, node):
+        super().bind(name, kind, node)
+        usage = self.frames[-1].setdefault("usage", {})
+        if kind not in ("list", "dict"):
+            usage.pop(name, None)
+            return
+        elements = node.value.elts if isinstance(node.value, ast.List) else []
+        record = {"name": name, "kind": kind, "function": self.frames[-1]["function"], "line": node.lineno,
+                  "ops": {}, "ops_in_loop": {}, "numeric": all(_is_numeric(e) for e in elements)}
+        self.records.append(record)
+        usage[name] = record
+
+    def _record(self, node):
+        if isinstance(node, ast.Name):
+            return self.frames[-1].get("usage", {}).get(node.id)
+        return None
+
+    def _use(self, record, op, node):
+        record["ops"][op] = record["ops"].get(op, 0) + 1
+        if self._depth(node) > 0:
+            record["ops_in_loop"][op] = record["ops_in_loop"].get(op, 0) + 1
+
+    def visit_For(self, node):
+        super().visit_For(node)
+        record = self._record(node.iter)
+        if record is not None:
+            self._use(record, "iterate", node)
+
+    visit_AsyncFor = visit_For
+
+    def visit_comprehension(self, node):
+        record = self._record(node.iter)
+        if record is not None:
+            self._use(record, "iterate", node)
+
+    def visit_Assign(self, node):
+        super().visit_Assign(node)
+        record = self._record(node.value)
+        if record is not None:
+            self._use(record, "escape", node)
+
+    def visit_Return(self, node):
+        record = self._record(node.value)
+        if record is not None:
+            self._use(record, "escape", node)
+
+    visit_Yield = visit_YieldFrom = visit_Return
+
+    def visit_Compare(self, node):
+        for op, comparator in zip(node.ops, node.comparators):
+            record = self._record(comparator)
+            if record is not None and isinstance(op, (ast.In, ast.NotIn)):
+                self._use(record, "membership", node)
+
+    def visit_Subscript(self, node):
+        record = self._record(node.value)
+        if record is not None:
+            self._use(record, "index_store" if isinstance(node.ctx, ast.Store) else "index_access", node)
+
+    def visit_Call(self, node):
+        if _is_call_to(node, "sorted") and node.args:
+            record = self._record(node.args[0])
+            if record is not None:
+                self._use(record, "sort", node)
+            return
+        if not any(_is_call_to(node, name) for name in ORDER_FREE_CALLS):
+            for arg in node.args + [keyword.value for keyword in node.keywords]:
+                record = self._record(arg.value if isinstance(arg, ast.Starred) else arg)
+                if record is not None:
+                    self._use(record, "escape", node)
+        if not isinstance(node.func, ast.Attribute):
+            return
+        record = self._record(node.func.value)
+        if record is None:
+            return
+        method = node.func.attr
+        front = bool(node.args) and isinstance(node.args[0], ast.Constant) and node.args[0].value == 0
+        if method == "pop" and front:
+            op = "pop_front"
+        elif method == "insert" and front:
+            op = "insert_front"
+        elif method == "index":
+            op = "index_lookup"
+        else:
+            op = method
+        if method in ("append", "insert", "extend"):
+            value = node.args[-1] if node.args else None
+            if method == "extend" or value is None or not _is_numeric(value):
+                record["numeric"] = False
+        self._use(record, op, node)
+
+    def result(self):
+        return self.records
+
+def format_loop_report(report):
+    """
+    Plain-text rendering of the "loop_performance" result, for the console and prompts.
+    """
+    lines = ["Loop nesting by function:"]
+    for entry in report["functions"]:
+        where = f" (line {entry['line']})" if entry["line"] else ""
+        lines.append(f"  {entry['function']}{where}: depth {entry['max_loop_depth']}")
+    if report["findings"]:
+        lines.append("Hot-loop findings:")
+        for finding in report["findings"]:
+            lines.append(f"  line {finding['line']} [{finding['cost']}] {finding['message']}")
+    else:
+        lines.append("No hot-loop anti-patterns found.")
+    return "\n".join(lines)
 
 class CodeOptimizer:
     """
     Day 8: An interactive explorer that checks code for possible performance issues,
     then uses the LLM for optimization suggestions.
     """
-    def __init__(self, code):
+    def __init__(self, code, context=None):
         self.code = code
+        self.context = get_context(code, context)
         self.assistant = LLMAssistant()
 
     def analyze_loops(self):
@@ -15,16 +397,32 @@ class CodeOptimizer:
         Simple example: count how many for/while loops exist.
         Real versions might measure time complexity, spot nested loops, etc.
         """
-        tree = ast.parse(self.code)
-        loop_count = 0
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.For, ast.While)):
-                loop_count += 1
-        return loop_count
+        return self.context.result("loops")
+
+    def analyze_performance(self):
+        """
+        Loop nesting depth per function and hot-loop anti-patterns with line
+        numbers and cost classes (see LoopPerformanceChecker).
+        """
+        return self.context.result("loop_performance")
 
-    def suggest_optimizations(self, context):
+    def vectorize_loops(self, measure=False):
+        """
+        Numeric loops that can be rewritten with NumPy: the rewrite as a
+        diff, whether it gives the same results (see vectorizer.check_rewrite)
+        and, with `measure`, the measured speedup.
+        """
+        # Imported here: NumPy and the rewrite machinery are only needed for this.
+        from neuro_symbolic_code_mentor.vectorizer import vectorize
+        try:
+            return vectorize(self.code, measure=measure)
+        except SyntaxError:
+            return []
+
+    def suggest_optimizations(self, context, stream=None):
         """
         Calls the LLM to propose improvements based on the code and context info.
+        With `stream` (a file), the suggestions are written there as they are generated.
         """
         prompt = f"""
         Code:
@@ -34,22 +432,34 @@ class CodeOptimizer:
 
         Suggest performance optimizations or data structure improvements.
         """
-        return self.assistant.generate_explanation(prompt)
+        return explain(self.assistant, prompt, stream, label="suggest_optimizations")
 
-def interactive_optimizer(code):
+def interactive_optimizer(code, context=None):
     """
-    Main Day 8 function: prints loop analysis, then repeatedly prompts for 'suggest'
-    to show optimization tips from the LLM, or 'quit' to exit.
+    Main Day 8 function: prints loop analysis and NumPy rewrites of numeric loops,
+    then repeatedly prompts for 'suggest' to show optimization tips from the LLM,
+    'vectorize' to time the rewrites, or 'quit' to exit.
     """
-    optimizer = CodeOptimizer(code)
+    from neuro_symbolic_code_mentor.vectorizer import format_vectorization  # see vectorize_loops
+
+    optimizer = CodeOptimizer(code, context)
     loops = optimizer.analyze_loops()
+    report = format_loop_report(optimizer.analyze_performance())
+    vectorized = optimizer.vectorize_loops()
     print(f"Detected {loops} loop(s) in your code.\n")
+    print(report, "\n")
+    if vectorized:
+        report += "\n" + format_vectorization(vectorized)
+        print(format_vectorization(vectorized))
 
     while True:
-        cmd = input("Enter 'suggest' for optimization tips, or 'quit' to exit: ")
+        cmd = input("Enter 'suggest' for optimization tips, 'vectorize' to time the NumPy rewrites, "
+                    "or 'quit' to exit: ")
         if cmd.lower() == 'quit':
             break
+        if cmd.lower() == 'vectorize':
+            print(format_vectorization(optimizer.vectorize_loops(measure=True)))
         if cmd.lower() == 'suggest':
-            context_info = f"{loops} total loop(s)"
-            suggestions = optimizer.suggest_optimizations(context_info)
-            print("\n=== Optimization Suggestions ===\n", suggestions)
+            context_info = f"{loops} total loop(s).\n{report}"
+            print("\n=== Optimization Suggestions ===\n")
+            optimizer.suggest_optimizations(context_info, stream=sys.stdout)
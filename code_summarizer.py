@@ -1,37 +1,41 @@
 import ast
 from llm_handler import LLMAssistant
+from neuro_symbolic_code_mentor.analysis_context import get_context
+from neuro_symbolic_code_mentor.prompt_builder import slice_code
 
 class CodeSummarizer:
     """
     Day 18: Summarizes code structure + explains top-level decisions.
     """
-    def __init__(self, code):
+    def __init__(self, code, context=None):
         self.code = code
+        self.context = get_context(code, context)
         self.assistant = LLMAssistant()
 
     def summarize_structure(self):
-        tree = ast.parse(self.code)
         summary = []
-        for node in tree.body:
+        for node in self.context.tree.body:
             if isinstance(node, ast.FunctionDef):
                 summary.append(f"Function: {node.name}")
             elif isinstance(node, ast.ClassDef):
                 summary.append(f"Class: {node.name}")
         return summary
 
-    def explain_decisions(self, structure):
+    def explain_decisions(self, structure, budget=None):
+        # Large modules are sent as an outline, filled in with full
+        # definitions as far as `budget` tokens allow.
         prompt = f"""
 Code structure: {structure}
 Code:
-{self.code}
+{slice_code(self.code, budget=budget, context=self.context)}
 
 Explain the key decisions (why these classes/functions might exist, 
 and how they interact) in plain language.
 """
         return self.assistant.generate_explanation(prompt)
 
-def run_code_summarizer(code):
-    cs = CodeSummarizer(code)
+def run_code_summarizer(code, context=None):
+    cs = CodeSummarizer(code, context)
     structure = cs.summarize_structure()
     explanation = cs.explain_decisions(structure)
     print("\n=== Code Summarizer (Day 18) ===\n")
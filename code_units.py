@@ -0,0 +1,110 @@
+# neuro_symbolic_code_mentor/code_units.py
+
+import ast
+import hashlib
+import re
+from collections import namedtuple
+from typing import List, Optional
+
+# A top-level slice of a module: a function, a class, or a run of module-level
+# statements. `start`/`end` are 1-based inclusive line numbers.
+CodeUnit = namedtuple("CodeUnit", ["name", "kind", "start", "end", "source", "digest"])
+
+_HEADER = re.compile(r"(?:async\s+def|def|class)\s+([A-Za-z_]\w*)")
+_TRIPLE_QUOTE = re.compile(r"'''|\"\"\"")
+
+
+def unit_digest(source: str) -> str:
+    return hashlib.sha256(source.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+def _make_unit(lines: List[str], start: int, end: int) -> CodeUnit:
+    """
+    Builds a unit from lines[start-1:end], naming it from its def/class header.
+    """
+    source = "".join(lines[start - 1:end])
+    for line in lines[start - 1:end]:
+        stripped = line.strip()
+        if not stripped or stripped.startswith(("@", "#")):
+            continue
+        match = _HEADER.match(stripped)
+        if match:
+            kind = "class" if stripped.startswith("class") else "function"
+            return CodeUnit(match.group(1), kind, start, end, source, unit_digest(source))
+        break
+    return CodeUnit(f"<module:{start}>", "module", start, end, source, unit_digest(source))
+
+
+def split_units(code: str) -> List[CodeUnit]:
+    """
+    Splits a module into top-level units by scanning the text, without
+    parsing it: a unit starts at every unindented line outside a
+    triple-quoted string (decorators and comments stick to the following
+    definition). Cheap enough to run on every edit; use `split_units_exact`
+    when the heuristic cannot be trusted.
+    """
+    lines = code.splitlines(keepends=True)
+    starts = []
+    open_quote = None
+    attached = None  # first line of a pending decorator/comment block
+    for number, line in enumerate(lines, 1):
+        if open_quote is None and line[:1] not in ("", " ", "\t", "\n", "\r"):
+            stripped = line.lstrip()
+            if stripped.startswith(("@", "#")):
+                attached = attached or number
+            else:
+                is_def = _HEADER.match(stripped) is not None
+                block_start = attached if (attached and is_def) else number
+                if attached and not is_def:
+                    starts.append(attached)
+                starts.append(block_start)
+                attached = None
+        elif open_quote is None and line.strip():
+            attached = None  # an indented line: the comment belonged to the body above
+        for quote in _TRIPLE_QUOTE.findall(line):
+            if open_quote is None:
+                open_quote = quote
+            elif quote == open_quote:
+                open_quote = None
+    if attached:
+        starts.append(attached)
+    starts = sorted(set(starts))
+    if not starts or starts[0] != 1:
+        starts.insert(0, 1)
+
+    units = []
+    bounds = starts + [len(lines) + 1]
+    for start, next_start in zip(bounds, bounds[1:]):
+        if start < next_start:
+            units.append(_make_unit(lines, start, next_start - 1))
+    return _merge_module_runs(units, lines)
+
+
+def _merge_module_runs(units: List[CodeUnit], lines: List[str]) -> List[CodeUnit]:
+    """
+    Merges consecutive module-level units so a run of imports/assignments
+    forms one unit instead of one per line.
+    """
+    merged = []
+    for unit in units:
+        if merged and unit.kind == "module" and merged[-1].kind == "module":
+            merged[-1] = _make_unit(lines, merged[-1].start, unit.end)
+        else:
+            merged.append(unit)
+    return merged
+
+
+def split_units_exact(code: str, tree: Optional[ast.Module] = None) -> List[CodeUnit]:
+    """
+    Same contract as `split_units`, but the boundaries come from the parsed
+    AST, so they are always right. Raises SyntaxError for invalid code.
+    """
+    tree = tree if tree is not None else ast.parse(code)
+    lines = code.splitlines(keepends=True)
+    starts = {1}
+    for node in tree.body:
+        start = min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+        starts.add(start)
+    bounds = sorted(line for line in starts if line <= len(lines)) + [len(lines) + 1]
+    units = [_make_unit(lines, start, end - 1) for start, end in zip(bounds, bounds[1:]) if start < end]
+    return _merge_module_runs(units, lines)
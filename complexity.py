@@ -1,62 +1,55 @@
 import ast
+from neuro_symbolic_code_mentor.analysis_context import Checker, get_context, register_checker
+from neuro_symbolic_code_mentor.result_cache import ANALYZER_VERSION, cache_key, default_cache
 
 COMPLEXITY_THRESHOLD = 10
 
-class ComplexityAnalyzer(ast.NodeVisitor):
+@register_checker("complexity")
+class ComplexityChecker(Checker):
     """
-    Walks the AST, calculates a simple cyclomatic complexity for each function,
-    and stores the results in a dict: {function_name: complexity_score}.
+    Calculates a simple cyclomatic complexity for each function: 1 plus one per
+    if/for/while/try/with inside it. Runs as enter/leave hooks so it shares a
+    single traversal with the other checkers in an AnalysisContext.
     """
     def __init__(self):
         self.current_func = None
         self.complexities = {}  # {func_name: score}
 
     def visit_FunctionDef(self, node: ast.FunctionDef):
-        func_name = node.name
-        self.current_func = func_name
-        self.complexities[func_name] = 1  # Base complexity
-        self.generic_visit(node)  # Continue walking inside the function
-        self.current_func = None
-
-    def visit_If(self, node: ast.If):
-        if self.current_func:
-            self.complexities[self.current_func] += 1
-        self.generic_visit(node)
+        self.current_func = node.name
+        self.complexities[node.name] = 1  # Base complexity
 
-    def visit_For(self, node: ast.For):
-        if self.current_func:
-            self.complexities[self.current_func] += 1
-        self.generic_visit(node)
+    def leave_FunctionDef(self, node: ast.FunctionDef):
+        self.current_func = None
 
-    def visit_While(self, node: ast.While):
+    def _branch(self, node):
         if self.current_func:
             self.complexities[self.current_func] += 1
-        self.generic_visit(node)
 
-    def visit_Try(self, node: ast.Try):
-        if self.current_func:
-            self.complexities[self.current_func] += 1
-        self.generic_visit(node)
+    visit_If = visit_For = visit_While = visit_Try = visit_With = _branch
 
-    def visit_With(self, node: ast.With):
-        if self.current_func:
-            self.complexities[self.current_func] += 1
-        self.generic_visit(node)
+    def result(self):
+        return self.complexities
 
-def analyze_complexity(code: str):
+def analyze_complexity(code: str, context=None):
     """
     Returns a dict of function_name -> complexity_score.
+    Pass an AnalysisContext to reuse a tree that has already been parsed.
     """
-    tree = ast.parse(code)
-    analyzer = ComplexityAnalyzer()
-    analyzer.visit(tree)
-    return analyzer.complexities
+    return dict(get_context(code, context).result("complexity"))
 
-def complexity_report(code: str) -> str:
+def complexity_report(code: str, context=None, cache=None) -> str:
     """
     Generates a text report highlighting functions above the complexity threshold.
+    Reports are cached by source hash (see result_cache); pass a ResultCache
+    to use a specific cache instead of the process-wide default.
     """
-    complexities = analyze_complexity(code)
+    cache = cache if cache is not None else default_cache()
+    key = cache_key("complexity_report", code, ANALYZER_VERSION, str(COMPLEXITY_THRESHOLD))
+    return cache.get_or_compute(key, lambda: _build_complexity_report(code, context))
+
+def _build_complexity_report(code: str, context=None) -> str:
+    complexities = analyze_complexity(code, context)
     if not complexities:
         return "No functions found to analyze."
 
@@ -0,0 +1,254 @@
+# neuro_symbolic_code_mentor/complexity_estimator.py
+
+import copy
+import math
+import random
+import signal
+import string
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Union
+
+from neuro_symbolic_code_mentor.benchmark_harness import benchmark
+
+MIN_SIZE = 8
+MAX_SIZE = 2 ** 16
+GROWTH = 2
+MIN_POINTS = 4
+MAX_POINTS = 16
+TIME_LIMIT = 0.1  # seconds a single call may take before sizes stop growing
+TIME_BUDGET = 3.0  # seconds for the whole estimate
+CALL_TIMEOUT = 2.0  # seconds the first call at each size may take before the estimate stops
+# Among models whose fit is within this much R^2 of the best, the simplest wins.
+R2_TOLERANCE = 0.01
+# Timings that grow less than this over the measured sizes count as O(1).
+FLAT_RATIO = 1.5
+# The next size is kept small enough that its predicted time is at most this
+# many times the last one, so fast-growing functions still get enough points.
+MAX_STEP_RATIO = 8
+
+
+def _random_list(n: int) -> List[int]:
+    rng = random.Random(n)
+    return [rng.randrange(n * 10) for _ in range(n)]
+
+
+def _random_string(n: int) -> str:
+    rng = random.Random(n)
+    return "".join(rng.choice(string.ascii_lowercase) for _ in range(n))
+
+
+# Named input generators: size -> argument for the measured function.
+INPUT_GENERATORS: Dict[str, Callable[[int], object]] = {
+    "list": _random_list,
+    "sorted_list": lambda n: sorted(_random_list(n)),
+    "string": _random_string,
+    "int": lambda n: n,
+}
+
+# (name, growth function), simplest first.
+MODELS = [
+    ("O(1)", lambda n: 1.0),
+    ("O(log n)", lambda n: math.log2(n)),
+    ("O(n)", lambda n: float(n)),
+    ("O(n log n)", lambda n: n * math.log2(n)),
+    ("O(n^2)", lambda n: float(n) ** 2),
+    ("O(2^n)", None),  # c^n, with the base c fitted from the data
+]
+
+
+def fit_model(sizes: List[int], times: List[float], growth: Callable[[int], float]) -> Optional[Dict]:
+    """
+    Fits times ~ a * growth(n) + b (a >= 0) by least squares weighted by
+    1 / time^2, i.e. on relative error, so the small sizes count as much as
+    the large ones. Returns {"r2", "a", "b"} with `a` per unit of
+    growth(n) / growth(largest n), or None if growth overflows.
+    """
+    try:
+        features = [growth(n) for n in sizes]
+    except OverflowError:
+        return None
+    scale = max(features)
+    if not all(math.isfinite(f) for f in features) or scale <= 0:
+        return None
+    features = [f / scale for f in features]
+    weights = [1 / t ** 2 if t > 0 else 0.0 for t in times]
+    sw = sum(weights)
+    sx = sum(w * x for w, x in zip(weights, features))
+    sy = sum(w * y for w, y in zip(weights, times))
+    sxx = sum(w * x * x for w, x in zip(weights, features))
+    sxy = sum(w * x * y for w, x, y in zip(weights, features, times))
+    det = sw * sxx - sx * sx
+    a = (sw * sxy - sx * sy) / det if det > 1e-12 * sw * sxx else 0.0
+    if a < 0:
+        a = 0.0
+    b = (sy - a * sx) / sw
+    mean = sy / sw
+    rss = sum(w * (y - a * x - b) ** 2 for w, x, y in zip(weights, features, times))
+    tss = sum(w * (y - mean) ** 2 for w, y in zip(weights, times))
+    return {"r2": 1 - rss / tss if tss > 0 else 1.0, "a": a, "b": b}
+
+
+def classify(sizes: List[int], times: List[float], tolerance: float = R2_TOLERANCE) -> Dict:
+    """
+    Picks the complexity class for measured (size, time) points: the
+    simplest model whose R^2 is within `tolerance` of the best one, or O(1)
+    when the times barely grow. Returns {"complexity", "r2", "models"}.
+    """
+    models = []
+    for name, growth in MODELS[1:]:
+        if growth is None:
+            growth = _exponential_growth(sizes, times)
+        fit = fit_model(sizes, times, growth)
+        if fit is not None:
+            models.append({"model": name, "r2": fit["r2"]})
+    third = max(1, len(times) // 3)
+    small = sorted(times[:third])[third // 2]
+    large = sorted(times[-third:])[third // 2]
+    if not models or (small > 0 and large / small < FLAT_RATIO):
+        return {"complexity": "O(1)", "r2": None, "models": models}
+    best = max(model["r2"] for model in models)
+    chosen = next(model for model in models if model["r2"] >= best - tolerance)
+    return {"complexity": chosen["model"], "r2": chosen["r2"], "models": models}
+
+
+def _exponential_growth(sizes: List[int], times: List[float]) -> Callable[[int], float]:
+    # Base of c^n from a least-squares line through (n, log time).
+    logs = [math.log(t) for t in times]
+    mean_n = sum(sizes) / len(sizes)
+    mean_log = sum(logs) / len(logs)
+    spread = sum((n - mean_n) ** 2 for n in sizes)
+    slope = sum((n - mean_n) * (y - mean_log) for n, y in zip(sizes, logs)) / spread if spread else 0.0
+    base = math.exp(max(slope, 0.01))
+    return lambda n: base ** n
+
+
+def _next_size(sizes: List[int], times: List[float], growth: int, time_limit: float) -> int:
+    n = sizes[-1] * growth
+    if times[-1] >= time_limit:
+        return sizes[-1]
+    if len(sizes) >= 2 and times[-2] > 0 and times[-1] > times[-2]:
+        # Extrapolate as if the growth were exponential: exact for O(2^n),
+        # pessimistic for polynomials, so a single call never runs far past
+        # `time_limit`.
+        rate = math.log(times[-1] / times[-2]) / (sizes[-1] - sizes[-2])
+        allowed = min(MAX_STEP_RATIO, time_limit / times[-1])
+        n = min(n, sizes[-1] + max(1, int(math.log(allowed) / rate)))
+    return n
+
+
+class CallTimeout(BaseException):
+    # Not an Exception, so measured code that catches Exception cannot swallow it.
+    pass
+
+
+@contextmanager
+def call_time_limit(seconds: Optional[float]):
+    """
+    Raises CallTimeout in the block once it has run for `seconds` of wall
+    time. Uses SIGALRM, so it only applies on POSIX in the main thread;
+    elsewhere (or with `seconds` None) the block runs unbounded.
+    """
+    if not seconds or not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+        yield
+        return
+
+    def on_alarm(signum, frame):
+        raise CallTimeout(f"call took longer than {seconds:g}s")
+
+    previous = signal.signal(signal.SIGALRM, on_alarm)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _resolve_input(make_input: Union[str, Callable[[int], object], None]) -> Callable[[int], object]:
+    if make_input is None:
+        return INPUT_GENERATORS["list"]
+    if isinstance(make_input, str):
+        try:
+            return INPUT_GENERATORS[make_input]
+        except KeyError:
+            raise ValueError(f"Unknown input kind: {make_input!r}") from None
+    return make_input
+
+
+def estimate_complexity(func: Callable, make_input: Union[str, Callable[[int], object], None] = None,
+                        min_size: int = MIN_SIZE, max_size: int = MAX_SIZE, growth: int = GROWTH,
+                        time_limit: float = TIME_LIMIT, time_budget: float = TIME_BUDGET,
+                        repeat: int = 5, sample_time: float = 0.005,
+                        call_timeout: Optional[float] = CALL_TIMEOUT) -> Dict:
+    """
+    Measures how `func(input)` scales. Inputs come from `make_input(n)` (a
+    callable or a name from INPUT_GENERATORS, default "list"). If `func`
+    modifies its argument (e.g. sorts in place) each call gets a fresh copy,
+    and the time to copy is subtracted. Sizes start at `min_size` and grow
+    by `growth` until a call takes `time_limit`, `max_size` is reached or
+    `time_budget` is spent. The first call at each size is stopped after
+    `call_timeout` seconds (see call_time_limit), so a call that never
+    returns ends the estimate instead of hanging it.
+
+    Returns {"complexity": "O(n^2)" etc., "r2": fit of that model (None for
+    O(1)), "models": [{"model", "r2"}, ...], "measurements": [{"n", "time"}, ...]},
+    with "complexity" None and an "error" when too few sizes could be measured.
+    """
+    make_input = _resolve_input(make_input)
+    sizes: List[int] = []
+    times: List[float] = []
+    error = None
+    started = time.perf_counter()
+    n = min_size
+    while n <= max_size and len(sizes) < MAX_POINTS:
+        data = make_input(n)
+        try:
+            probe = copy.copy(data)
+            with call_time_limit(call_timeout):
+                func(probe)
+            mutates = probe != data
+            if mutates:
+                run = benchmark(lambda: func(copy.copy(data)), repeat=repeat, warmup=1, sample_time=sample_time)
+            else:
+                run = benchmark(lambda: func(data), repeat=repeat, warmup=1, sample_time=sample_time)
+        except (Exception, CallTimeout) as e:
+            error = f"{type(e).__name__} at n={n}: {e}"
+            break
+        seconds = run["median"]
+        if mutates:
+            seconds -= benchmark(lambda: copy.copy(data), repeat=repeat, warmup=1, sample_time=sample_time)["median"]
+        sizes.append(n)
+        times.append(max(seconds, 1e-9))
+        if time.perf_counter() - started > time_budget:
+            break
+        next_n = _next_size(sizes, times, growth, time_limit)
+        if next_n <= n * 1.1:
+            break
+        n = next_n
+
+    measurements = [{"n": size, "time": seconds} for size, seconds in zip(sizes, times)]
+    if len(sizes) < MIN_POINTS:
+        return {"complexity": None, "r2": None, "models": [], "measurements": measurements,
+                "error": error or f"only {len(sizes)} input sizes could be measured"}
+    result = classify(sizes, times)
+    result["measurements"] = measurements
+    result["error"] = error
+    return result
+
+
+def format_estimate(result: Dict) -> str:
+    """
+    Plain-text rendering of an `estimate_complexity` result, for the console and prompts.
+    """
+    if result["complexity"] is None:
+        return f"Could not estimate complexity: {result['error']}"
+    fit = f" (R^2 = {result['r2']:.3f})" if result["r2"] is not None else " (time does not grow with n)"
+    lines = [f"Measured scaling: {result['complexity']}{fit}"]
+    lines.append("  " + ", ".join(f"{model['model']} {model['r2']:.3f}" for model in result["models"]))
+    for point in result["measurements"]:
+        lines.append(f"  n={point['n']:<8} {point['time'] * 1e6:.1f} us")
+    if result["error"]:
+        lines.append(f"  stopped early: {result['error']}")
+    return "\n".join(lines)
@@ -0,0 +1,186 @@
+# neuro_symbolic_code_mentor/data_structure_advisor.py
+
+import tracemalloc
+from typing import Dict, List
+
+from neuro_symbolic_code_mentor.benchmark_harness import compare
+
+DEFAULT_SIZE = 2000  # elements in the generated micro-benchmarks
+DEFAULT_REPEAT = 7
+
+# Operations after which a list can no longer be swapped for a set (they rely
+# on order or position, or hand the list to code that may).
+ORDERED_OPS = {"index_access", "index_store", "sort", "pop_front", "insert_front", "insert", "pop",
+               "index_lookup", "reverse", "iterate", "escape"}
+ARRAY_OPS = {"append", "index_access", "index_store", "iterate", "escape"}
+
+# Generated micro-benchmarks, one per usage pattern: the setup builds
+# `values` ({n} elements), before/after replay the pattern with the current
+# structure and with the recommended one.
+BENCHMARKS = {
+    "set_dedupe": {
+        "setup": "import random\nrandom.seed(0)\nvalues = [random.randrange({n}) for _ in range({n})]",
+        "before": "data = []\nfor v in values:\n    if v not in data:\n        data.append(v)",
+        "after": "data = set()\nfor v in values:\n    if v not in data:\n        data.add(v)",
+    },
+    "set_lookup": {
+        "setup": "import random\nrandom.seed(0)\nvalues = [random.randrange({n}) for _ in range({n})]\n"
+                 "data = values[::2]",
+        "before": "for v in values:\n    v in data",
+        "after": "lookup = set(data)\nfor v in values:\n    v in lookup",
+    },
+    "set_alongside": {
+        "setup": "import random\nrandom.seed(0)\nvalues = [random.randrange({n}) for _ in range({n})]",
+        "before": "data = []\nfor v in values:\n    if v not in data:\n        data.append(v)\nfirst = data[0]",
+        "after": "data = []\nseen = set()\nfor v in values:\n    if v not in seen:\n        seen.add(v)\n"
+                 "        data.append(v)\nfirst = data[0]",
+    },
+    "deque_popleft": {
+        "setup": "from collections import deque\nvalues = list(range({n}))",
+        "before": "data = list(values)\nwhile data:\n    data.pop(0)",
+        "after": "data = deque(values)\nwhile data:\n    data.popleft()",
+    },
+    "deque_appendleft": {
+        "setup": "from collections import deque\nvalues = list(range({n}))",
+        "before": "data = []\nfor v in values:\n    data.insert(0, v)",
+        "after": "data = deque()\nfor v in values:\n    data.appendleft(v)",
+    },
+    "dict_position": {
+        "setup": "import random\nrandom.seed(0)\ndata = list(range({n}))\nrandom.shuffle(data)\nvalues = data[::-1]",
+        "before": "for v in values:\n    data.index(v)",
+        "after": "position = {{v: i for i, v in enumerate(data)}}\nfor v in values:\n    position[v]",
+    },
+    "bisect_insort": {
+        "setup": "import bisect, random\nrandom.seed(0)\nvalues = [random.random() for _ in range({n})]",
+        "before": "data = []\nfor v in values:\n    data.append(v)\n    data.sort()",
+        "after": "data = []\nfor v in values:\n    bisect.insort(data, v)",
+    },
+    "array_numbers": {
+        "setup": "import array",
+        "before": "data = []\nfor i in range({n}):\n    data.append(i * 0.5)\ntotal = sum(data)",
+        "after": "data = array.array('d')\nfor i in range({n}):\n    data.append(i * 0.5)\ntotal = sum(data)",
+    },
+}
+
+
+def _recommendation(record: Dict, replacement: str, pattern: str, reason: str,
+                    cost_before: str, cost_after: str) -> Dict:
+    return {"name": record["name"], "kind": record["kind"], "function": record["function"],
+            "line": record["line"], "usage": dict(record["ops"]), "replacement": replacement,
+            "pattern": pattern, "reason": reason, "cost_before": cost_before, "cost_after": cost_after}
+
+
+def recommend(records: List[Dict]) -> List[Dict]:
+    """
+    Turns usage records (the "data_structures" checker result in
+    code_optimizer) into recommendations:
+      {"name", "kind", "function", "line", "usage", "replacement", "pattern",
+       "reason", "cost_before", "cost_after"}
+    Only patterns repeated inside a loop are reported, except for
+    array.array, which is about memory rather than asymptotic cost.
+    """
+    recommendations = []
+    for record in records:
+        ops, in_loop = record["ops"], record["ops_in_loop"]
+        name = record["name"]
+        if record["kind"] == "dict":
+            if in_loop.get("sort"):
+                recommendations.append(_recommendation(
+                    record, "bisect", "bisect_insort",
+                    f"The keys of '{name}' are sorted inside a loop; keep a sorted key list next to the dict "
+                    f"with bisect.insort instead.", "O(n log n) per iteration", "O(log n) search + O(n) shift"))
+            continue
+
+        if in_loop.get("pop_front"):
+            recommendations.append(_recommendation(
+                record, "collections.deque", "deque_popleft",
+                f"'{name}.pop(0)' shifts every remaining element; deque.popleft() does not.",
+                "O(n) per pop", "O(1) per pop"))
+        if in_loop.get("insert_front"):
+            recommendations.append(_recommendation(
+                record, "collections.deque", "deque_appendleft",
+                f"'{name}.insert(0, ...)' shifts every element; deque.appendleft() does not.",
+                "O(n) per insert", "O(1) per insert"))
+        if in_loop.get("index_lookup"):
+            recommendations.append(_recommendation(
+                record, "dict", "dict_position",
+                f"'{name}.index(...)' searches the list every time; a dict from value to position answers at once.",
+                "O(n) per lookup", "O(1) per lookup"))
+        if in_loop.get("sort"):
+            recommendations.append(_recommendation(
+                record, "bisect", "bisect_insort",
+                f"'{name}' is re-sorted inside a loop; bisect.insort keeps it sorted as items arrive "
+                f"(and bisect_left finds them in O(log n)).", "O(n log n) per insert", "O(log n) search + O(n) shift"))
+        elif in_loop.get("membership"):
+            if set(ops) & ORDERED_OPS:
+                recommendations.append(_recommendation(
+                    record, "set", "set_alongside",
+                    f"Membership tests on '{name}' scan the list; the order is needed too, so keep a set "
+                    f"alongside it for the tests.", "O(n) per test", "O(1) per test"))
+            else:
+                recommendations.append(_recommendation(
+                    record, "set", "set_dedupe" if "append" in ops else "set_lookup",
+                    f"Membership tests on '{name}' scan the list; nothing depends on its order, so a set "
+                    f"does the same in constant time.", "O(n) per test", "O(1) per test"))
+        if record["numeric"] and ops.get("append") and set(ops) <= ARRAY_OPS:
+            recommendations.append(_recommendation(
+                record, "array.array", "array_numbers",
+                f"'{name}' only holds numbers; array.array stores them unboxed, several times smaller.",
+                "~32 bytes per number", "8 bytes per number"))
+    return recommendations
+
+
+def benchmark_code(recommendation: Dict, size: int = DEFAULT_SIZE) -> Dict[str, str]:
+    """
+    The generated micro-benchmark for a recommendation: {"setup", "before", "after"} source.
+    """
+    template = BENCHMARKS[recommendation["pattern"]]
+    return {part: code.format(n=size) for part, code in template.items()}
+
+
+def _peak_memory(setup: str, code: str) -> int:
+    namespace = {}
+    exec(setup, namespace)
+    started_here = not tracemalloc.is_tracing()
+    if started_here:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+        exec(code, namespace)
+        return tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        if started_here:
+            tracemalloc.stop()
+
+
+def measure(recommendation: Dict, size: int = DEFAULT_SIZE, repeat: int = DEFAULT_REPEAT, **options) -> Dict:
+    """
+    Runs the recommendation's micro-benchmark: a benchmark_harness.compare()
+    result for before/after plus "peak_memory": {"before", "after"} in bytes.
+    """
+    code = benchmark_code(recommendation, size)
+    result = compare(code["before"], code["after"], setup=code["setup"], repeat=repeat, **options)
+    result["peak_memory"] = {side: _peak_memory(code["setup"], code[side]) for side in ("before", "after")}
+    result["size"] = size
+    return result
+
+
+def format_recommendations(recommendations: List[Dict]) -> str:
+    """
+    Plain-text rendering, including measurements where `measure` results
+    were stored under "benchmark".
+    """
+    if not recommendations:
+        return "No data-structure changes recommended."
+    lines = []
+    for rec in recommendations:
+        lines.append(f"line {rec['line']} ({rec['function']}): '{rec['name']}' -> {rec['replacement']}  "
+                     f"[{rec['cost_before']} -> {rec['cost_after']}]")
+        lines.append(f"  {rec['reason']}")
+        measured = rec.get("benchmark")
+        if measured:
+            memory = measured["peak_memory"]
+            lines.append(f"  micro-benchmark (n={measured['size']}): {measured['speedup']:.2f}x, "
+                         f"{measured['verdict']}; peak memory {memory['before']} -> {memory['after']} bytes")
+    return "\n".join(lines)
@@ -1,51 +1,182 @@
+import sys
 import time
 import ast
 from llm_handler import LLMAssistant
+from neuro_symbolic_code_mentor.benchmark_harness import benchmark, compare, module_runner
+from neuro_symbolic_code_mentor.call_profiler import format_profile, profile_code
+from neuro_symbolic_code_mentor.hotspots import DEFAULT_INTERVAL, annotate_source, line_findings, profile_lines
+from neuro_symbolic_code_mentor.memory_tracker import format_memory, track_memory
+from neuro_symbolic_code_mentor.sandbox import resolve_pool
+from neuro_symbolic_code_mentor.streaming import explain
+
+def _sandboxed(result, key):
+    """The `key` report of a sandbox result, or RuntimeError when the run failed."""
+    if key not in result:
+        raise RuntimeError(f"Benchmark failed in the sandbox: {result['error_type']}: {result['error_message']}")
+    return result[key]
 
 class PerformanceProfiler:
     """
     Day 14: Profiles code performance, highlights bottlenecks, then uses LLM to explain optimizations.
+
+    With `sandbox` (a SandboxPool, or True for the shared default pool),
+    every method that runs the code (profiling and benchmarking alike) does
+    so in a worker process under CPU, wall-clock and memory limits.
     """
-    def __init__(self, code):
+    def __init__(self, code, sandbox=None):
         self.code = code
         self.assistant = LLMAssistant()
+        self.sandbox = sandbox
 
     def run_profile(self):
         """
-        Simple approach: time the execution of the code (or specific functions).
-        Real approach might use cProfile or an AST-based function hooking.
+        Simple approach: time the execution of the whole code.
+        See profile_calls for a per-function breakdown.
         """
-        start = time.time()
+        pool = resolve_pool(self.sandbox)
+        if pool is not None:
+            result = pool.run(self.code)
+            if not result["ok"]:
+                return f"Runtime Error during profiling: {result['error_message']}"
+            return f"Execution Time: {result['elapsed']:.4f} seconds"
+        start = time.perf_counter()
         try:
             exec(self.code, {})
         except Exception as e:
             return f"Runtime Error during profiling: {str(e)}"
-        elapsed = time.time() - start
+        elapsed = time.perf_counter() - start
         return f"Execution Time: {elapsed:.4f} seconds"
 
-    def explain_optimizations(self, timing):
+    def profile_calls(self, top=15):
+        """
+        Runs the code under cProfile. Returns a dict with the total time,
+        per-function call counts / own / cumulative time and the hottest call
+        paths (see call_profiler.profile_code).
+        """
+        pool = resolve_pool(self.sandbox)
+        if pool is None:
+            return profile_code(self.code, top=top)
+        result = pool.run(self.code, kind="profile")
+        if "profile" not in result:  # stopped by a sandbox limit
+            return {"total_time": result["elapsed"], "error": f"{result['error_type']}: {result['error_message']}",
+                    "functions": [], "hot_paths": []}
+        report = result["profile"]
+        report["functions"] = report["functions"][:top]
+        return report
+
+    def profile_memory(self, top=10):
+        """
+        Runs the code under tracemalloc. Returns a dict with peak and retained
+        memory, the top allocation sites by line (bytes allocated / freed,
+        executions) and the before/after snapshot diff (see
+        memory_tracker.track_memory).
+        """
+        pool = resolve_pool(self.sandbox)
+        if pool is None:
+            return track_memory(self.code, top=top)
+        result = pool.run(self.code, kind="memory")
+        if "memory" not in result:  # stopped by a sandbox limit
+            return {"total_time": result["elapsed"], "error": f"{result['error_type']}: {result['error_message']}",
+                    "peak": 0, "retained": 0, "allocation_sites": [], "retained_sites": []}
+        report = result["memory"]
+        report["allocation_sites"] = report["allocation_sites"][:top]
+        report["retained_sites"] = report["retained_sites"][:top]
+        return report
+
+    def profile_lines(self, mode="auto", interval=DEFAULT_INTERVAL, expected_time=None):
+        """
+        Per-line hit counts and time fractions. "sampling" mode barely slows
+        the code down, "tracing" counts every line execution exactly, "auto"
+        picks one of them up front from `expected_time` (e.g. the total_time
+        of profile_calls); the code runs once (see hotspots.profile_lines).
+        """
+        pool = resolve_pool(self.sandbox)
+        if pool is None:
+            return profile_lines(self.code, mode=mode, interval=interval, expected_time=expected_time)
+        result = pool.run(self.code, kind="lines",
+                          options={"mode": mode, "interval": interval, "expected_time": expected_time})
+        if "lines" not in result:  # stopped by a sandbox limit
+            return {"mode": mode, "total_time": result["elapsed"], "samples": None, "lines": [],
+                    "error": f"{result['error_type']}: {result['error_message']}"}
+        return result["lines"]
+
+    def annotate_hotspots(self, mode="auto", interval=DEFAULT_INTERVAL, expected_time=None):
         """
-        LLM call to explain potential optimizations based on the code & timing result.
+        The source with per-line hits and time fractions in front of each
+        line and the pattern / complexity findings for it as comments.
         """
+        report = self.profile_lines(mode=mode, interval=interval, expected_time=expected_time)
+        return annotate_source(self.code, report, line_findings(self.code))
+
+    def benchmark(self, **options):
+        """
+        Repeated, calibrated timing of the whole code with median, IQR and a
+        confidence interval (see benchmark_harness.benchmark). With a
+        sandbox the timing loop runs in a worker, and a failed run raises
+        RuntimeError.
+        """
+        pool = resolve_pool(self.sandbox)
+        if pool is None:
+            return benchmark(module_runner(self.code), **options)
+        return _sandboxed(pool.run(self.code, kind="benchmark", options=options), "benchmark")
+
+    def compare_with(self, optimized_code, **options):
+        """
+        Benchmarks this code against an optimized version and reports whether
+        the speedup is statistically significant (see benchmark_harness.compare).
+        """
+        pool = resolve_pool(self.sandbox)
+        if pool is None:
+            return compare(module_runner(self.code), module_runner(optimized_code), **options)
+        result = pool.run(self.code, kind="compare", options=dict(options, optimized_code=optimized_code))
+        return _sandboxed(result, "comparison")
+
+    def explain_optimizations(self, timing, memory=None, stream=None):
+        """
+        LLM call to explain potential optimizations based on the code & timing result
+        (a timing string, or a profile_calls report) and, optionally, a
+        profile_memory report. With `stream` (a file), the text is written
+        there as it is generated.
+        """
+        if isinstance(timing, dict):
+            timing = f"{timing['total_time']:.4f} seconds. Profile (hottest functions first):\n{format_profile(timing)}"
+        memory_section = ""
+        if memory is not None:
+            memory_section = f"""
+Memory profile (allocation sites that dominate first):
+{format_memory(memory)}
+"""
         prompt = f"""
 We profiled this code, which took about {timing}.
+{memory_section}
 Code:
 {self.code}
 
 Suggest how to optimize any bottlenecks, providing symbolic reasoning for each suggestion.
+Where the memory profile shows heavy allocation, target those lines first.
 """
-        return self.assistant.generate_explanation(prompt)
+        return explain(self.assistant, prompt, stream, label="explain_optimizations")
 
-def run_performance_profiler(code):
+def run_performance_profiler(code, memory=False, lines=False, sandbox=None):
     """
-    Main Day 14 function: runs a simple performance test, then calls LLM for explanation.
+    Main Day 14 function: profiles the code per function, then calls LLM for explanation.
+    The code runs once; `memory` and `lines` each add one more run, for its memory
+    use and per-line hot spots (so any side effects of the code repeat).
+    `sandbox` is passed to PerformanceProfiler.
     """
-    profiler = PerformanceProfiler(code)
-    timing_str = profiler.run_profile()
-    if "Runtime Error" in timing_str:
-        print(timing_str)
+    profiler = PerformanceProfiler(code, sandbox=sandbox)
+    report = profiler.profile_calls()
+    if report["error"]:
+        print(f"Runtime Error during profiling: {report['error']}")
         return
-    explanation = profiler.explain_optimizations(timing_str)
+    memory_report = profiler.profile_memory() if memory else None
     print("\n=== Performance Profiler (Day 14) ===\n")
-    print(timing_str)
-    print("\nOptimizations:\n", explanation)
+    print(format_profile(report))
+    if memory_report is not None:
+        print()
+        print(format_memory(memory_report))
+    if lines:
+        print()
+        print(profiler.annotate_hotspots(expected_time=report["total_time"]))
+    print("\nOptimizations:")
+    profiler.explain_optimizations(report, memory_report, stream=sys.stdout)
@@ -1,33 +1,137 @@
 import ast
 from llm_handler import LLMAssistant
+from neuro_symbolic_code_mentor.complexity_estimator import (CALL_TIMEOUT, TIME_BUDGET, CallTimeout, call_time_limit,
+                                                              estimate_complexity, format_estimate)
+from neuro_symbolic_code_mentor.sandbox import resolve_pool
+
+def _failed_estimate(error):
+    return {"complexity": None, "r2": None, "models": [], "measurements": [], "error": error}
 
 class AlgorithmOptimizer:
     """
     Day 22: Identifies algorithmic complexity, suggests optimizations (like better sorting or data structures).
+
+    The complexity is measured: a function from the code is run on inputs of
+    growing size and its timings are fitted to O(1) ... O(2^n) (see
+    complexity_estimator.estimate_complexity).
+
+    With `sandbox` (a SandboxPool, or True for the shared default pool),
+    measure_scaling runs the code in a worker process under CPU, wall-clock
+    and memory limits.
     """
-    def __init__(self, code):
+    def __init__(self, code, sandbox=None):
         self.code = code
         self.llm = LLMAssistant()
+        self.sandbox = sandbox
+        self.estimate = None
+        self.function_name = None
+
+    def find_function(self):
+        """
+        Name of the first top-level function that can be called with a
+        single argument, or None.
+        """
+        try:
+            tree = ast.parse(self.code)
+        except SyntaxError:
+            return None
+        for node in tree.body:
+            if isinstance(node, ast.FunctionDef):
+                args = node.args
+                required = len(args.posonlyargs) + len(args.args) - len(args.defaults)
+                if (args.posonlyargs or args.args) and required <= 1 and \
+                        all(default is not None for default in args.kw_defaults):
+                    return node.name
+        return None
 
-    def analyze_algorithms(self):
-        # Toy example: detect "bubble sort" pattern or "insertion sort"
+    def measure_scaling(self, function_name=None, make_input=None, **options):
+        """
+        Runs the code, then estimates the complexity of `function_name`
+        (default: find_function()) on generated inputs: `make_input` is a
+        callable n -> argument or a name such as "list", "sorted_list",
+        "string" or "int" (only names in the sandbox). Returns the estimate
+        dict, or None when there is no function to measure; failures (the
+        code raising, no such function, a call that does not return within
+        `call_timeout`) come back as an estimate with an "error".
+        """
+        function_name = function_name or self.find_function()
+        if function_name is None:
+            return None
+        self.function_name = function_name
+        pool = resolve_pool(self.sandbox)
+        if pool is not None:
+            self.estimate = self._measure_in_sandbox(pool, function_name, make_input, options)
+            return self.estimate
+        namespace = {}
+        try:
+            with call_time_limit(options.get("call_timeout", CALL_TIMEOUT)):
+                exec(self.code, namespace)
+        except Exception as e:
+            self.estimate = _failed_estimate(f"{type(e).__name__} while running the code: {e}")
+            return self.estimate
+        except CallTimeout as e:
+            self.estimate = _failed_estimate(f"running the code: {e}")
+            return self.estimate
+        func = namespace.get(function_name)
+        if not callable(func):
+            self.estimate = _failed_estimate(f"No function named {function_name!r} in the code")
+            return self.estimate
+        try:
+            self.estimate = estimate_complexity(func, make_input, **options)
+        except ValueError as e:  # unknown input kind
+            self.estimate = _failed_estimate(str(e))
+        return self.estimate
+
+    def _measure_in_sandbox(self, pool, function_name, make_input, options):
+        if callable(make_input):
+            return _failed_estimate("make_input must be an input kind name when running in the sandbox")
+        # The estimate stops itself after time_budget plus one last size; the
+        # limits only catch what it cannot stop (e.g. a C call that never returns).
+        limit = options.get("time_budget", TIME_BUDGET) + 4 * (options.get("call_timeout") or CALL_TIMEOUT)
+        result = pool.run(self.code, kind="scaling", cpu_time=limit, wall_time=limit,
+                          options={"function_name": function_name, "make_input": make_input, "estimate": options})
+        if "scaling" not in result:  # the code raised, or stopped by a sandbox limit
+            return _failed_estimate(f"{result['error_type']} while running the code: {result['error_message']}")
+        return result["scaling"]
+
+    def analyze_algorithms(self, function_name=None, make_input=None, **options):
+        # The loop shape only names the likely algorithm; the complexity comes
+        # from measure_scaling.
+        findings = []
         if "for i in range(len(" in self.code and "for j in range(i+1, len(" in self.code:
-            return "Possible bubble sort"
-        return "No recognized algorithm pattern"
+            findings.append("Possible bubble sort")
+        estimate = self.measure_scaling(function_name, make_input, **options)
+        if estimate is not None:
+            if estimate["complexity"] is None:
+                findings.append(f"Could not measure {self.function_name or function_name}: {estimate['error']}")
+            else:
+                fit = f", R^2 = {estimate['r2']:.3f}" if estimate["r2"] is not None else ""
+                findings.append(f"{self.function_name} measured {estimate['complexity']}{fit}")
+        return "; ".join(findings) if findings else "No recognized algorithm pattern"
 
     def propose_optimizations(self, pattern):
+        measured = ""
+        if self.estimate is not None and self.estimate["complexity"] is not None:
+            measured = f"""
+Timings of {self.function_name} on inputs of growing size:
+{format_estimate(self.estimate)}
+"""
         prompt = f"""
 Code:
 {self.code}
 
 We detected: {pattern}
-
+{measured}
 Suggest a more optimal algorithm (and explain why) using symbolic reasoning.
+Base the suggestion on the measured scaling, and say which complexity class it would reach.
 """
         return self.llm.generate_explanation(prompt)
 
-def run_algo_optimization(code):
-    optimizer = AlgorithmOptimizer(code)
+def run_algo_optimization(code, sandbox=None):
+    optimizer = AlgorithmOptimizer(code, sandbox=sandbox)
     pattern = optimizer.analyze_algorithms()
     explanation = optimizer.propose_optimizations(pattern)
-    print("\n=== Algorithm Optimization (Day 22) ===\n", explanation)
+    print("\n=== Algorithm Optimization (Day 22) ===\n")
+    if optimizer.estimate is not None:
+        print(format_estimate(optimizer.estimate), "\n")
+    print(explanation)
@@ -0,0 +1,57 @@
+from llm_handler import LLMAssistant
+from neuro_symbolic_code_mentor.analysis_context import get_context
+from neuro_symbolic_code_mentor.data_structure_advisor import format_recommendations, measure, recommend
+import code_optimizer  # registers the "data_structures" checker
+
+class DataStructureOptimizer:
+    """
+    Day 39: Tracks how each list and dict in the code is used and recommends
+    set, collections.deque, dict, array.array or bisect where that lowers the
+    cost, with a micro-benchmark replaying the usage pattern as evidence.
+    """
+    def __init__(self, code, context=None):
+        self.code = code
+        self.context = get_context(code, context)
+        self.llm = LLMAssistant()
+
+    def analyze_usage(self):
+        """
+        Usage records for every list/dict binding (see
+        code_optimizer.DataStructureUsageChecker).
+        """
+        return self.context.result("data_structures")
+
+    def recommend(self, benchmark=True, size=None):
+        """
+        Recommendations for the code; with `benchmark`, each one carries its
+        micro-benchmark result under "benchmark".
+        """
+        recommendations = recommend(self.analyze_usage())
+        if benchmark:
+            for rec in recommendations:
+                rec["benchmark"] = measure(rec) if size is None else measure(rec, size=size)
+        return recommendations
+
+    def explain(self, recommendations):
+        prompt = f"""
+Code:
+{self.code}
+
+A usage analysis recommends these data-structure changes (measured on micro-benchmarks):
+{format_recommendations(recommendations)}
+
+Explain each change with symbolic reasoning about the asymptotic cost, and show the rewritten lines.
+"""
+        return self.llm.generate_explanation(prompt)
+
+def run_data_structure_optimizer(code):
+    optimizer = DataStructureOptimizer(code)
+    try:
+        recommendations = optimizer.recommend()
+    except SyntaxError as e:
+        print(f"SyntaxError: {e}")
+        return
+    print("\n=== Data Structure Optimization (Day 39) ===\n")
+    print(format_recommendations(recommendations))
+    if recommendations:
+        print("\n", optimizer.explain(recommendations))
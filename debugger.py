@@ -1,6 +1,7 @@
 import ast
 import traceback
 import pdb
+from neuro_symbolic_code_mentor.sandbox import resolve_pool
 
 # Extended dictionary with potential fixes
 ERROR_DICT = {
@@ -28,6 +29,23 @@ ERROR_DICT = {
         "explanation": "Malformed Python code (e.g., missing colons or parentheses).",
         "fix": "Check Python syntax, colons, indentation, parentheses, or quotes.",
     },
+    # Raised when code runs in the sandbox and hits one of its limits
+    "MemoryError": {
+        "explanation": "The code tried to allocate more memory than it is allowed to use.",
+        "fix": "Process data in chunks or use generators instead of building huge lists or buffers.",
+    },
+    "TimeoutError": {
+        "explanation": "The code did not finish within the wall-clock limit (an infinite loop, or blocking I/O).",
+        "fix": "Check loop exit conditions and avoid waiting on input, sleeps or network calls.",
+    },
+    "CPUTimeExceeded": {
+        "explanation": "The code used up its CPU-time budget, most likely in an infinite or very long loop.",
+        "fix": "Check loop exit conditions, or use a more efficient algorithm.",
+    },
+    "WorkerCrashed": {
+        "explanation": "The process running the code exited abruptly (os._exit, a crash in a C extension, or being killed).",
+        "fix": "Look for calls that terminate the interpreter or native code that can crash.",
+    },
 }
 
 def minimal_patch_suggestion(code_line: str, error_type: str) -> str:
@@ -52,12 +70,41 @@ def syntax_check(code: str) -> str:
     except SyntaxError as e:
         return f"SyntaxError: {str(e)}"
 
-def debug_code(code: str, interactive: bool = False) -> str:
+def explain_error(tb_str: str, error_type: str) -> str:
+    """
+    Plain-language explanation, suggested fix and minimal patch for a traceback.
+    """
+    details = ERROR_DICT.get(error_type, {"explanation": "No explanation available.", "fix": "No suggested fix."})
+
+    # Attempt to extract the line that caused the error
+    # (very naive approach: look for 'File "<string>", line ...')
+    error_line = "Unknown"
+    for line in tb_str.split("\n"):
+        if 'File "<string>", line ' in line:
+            error_line = line.strip()
+            break
+
+    # Provide minimal patch suggestion if possible
+    patch = minimal_patch_suggestion(error_line, error_type)
+
+    return (
+        f"Error found:\n{tb_str}\n\n"
+        f"Explanation:\n{error_type}: {details['explanation']}\n"
+        f"Suggested Fix:\n{details['fix']}\n"
+        f"Minimal Patch:\n{patch}"
+    )
+
+def debug_code(code: str, interactive: bool = False, sandbox=None) -> str:
     """
     1. Checks syntax with AST.
     2. Executes code if syntax is okay.
     3. If an error occurs, returns a plain‑language explanation & minimal fix suggestions.
     4. Optionally offers post‑mortem debugging if interactive = True.
+
+    With `sandbox` (a SandboxPool, or True for the shared default pool) the
+    code runs in a worker process under CPU, wall-clock and memory limits
+    instead of in this process. Post-mortem debugging needs the live frames,
+    so interactive mode always runs in-process.
     """
 
     # Attempt to parse code
@@ -65,10 +112,19 @@ def debug_code(code: str, interactive: bool = False) -> str:
     if syntax_err:
         return f"Syntax Error Detected:\n{syntax_err}\n\nExplanation:\n{ERROR_DICT['SyntaxError']['explanation']}\nSuggested Fix:\n{ERROR_DICT['SyntaxError']['fix']}"
 
+    # Remove non-ascii if needed
+    safe_code = code.encode('ascii', 'ignore').decode('ascii')
+
+    pool = None if interactive else resolve_pool(sandbox)
+    if pool is not None:
+        result = pool.run(safe_code)
+        if result["ok"]:
+            return "No errors found."
+        return explain_error(result["traceback"] or f"{result['error_type']}: {result['error_message']}",
+                             result["error_type"])
+
     # Attempt to run code
     try:
-        # Remove non-ascii if needed
-        safe_code = code.encode('ascii', 'ignore').decode('ascii')
         exec(safe_code, {})
         return "No errors found."
     except Exception as e:
@@ -76,25 +132,7 @@ def debug_code(code: str, interactive: bool = False) -> str:
         # Last line of the traceback shows the error type
         last_line = tb_str.strip().split("\n")[-1]
         error_type = last_line.split(":")[0]
-        details = ERROR_DICT.get(error_type, {"explanation": "No explanation available.", "fix": "No suggested fix."})
-        
-        # Attempt to extract the line that caused the error
-        # (very naive approach: look for 'File "<string>", line ...')
-        error_line = "Unknown"
-        for line in tb_str.split("\n"):
-            if 'File "<string>", line ' in line:
-                error_line = line.strip()
-                break
-        
-        # Provide minimal patch suggestion if possible
-        patch = minimal_patch_suggestion(error_line, error_type)
-
-        debug_msg = (
-            f"Error found:\n{tb_str}\n\n"
-            f"Explanation:\n{error_type}: {details['explanation']}\n"
-            f"Suggested Fix:\n{details['fix']}\n"
-            f"Minimal Patch:\n{patch}"
-        )
+        debug_msg = explain_error(tb_str, error_type)
 
         if interactive:
             # Enter post-mortem debugging
@@ -0,0 +1,156 @@
+# neuro_symbolic_code_mentor/definition_cache.py
+
+from typing import Dict, List, Optional, Sequence
+
+from neuro_symbolic_code_mentor.analysis_context import CHECKERS, AnalysisContext
+from neuro_symbolic_code_mentor.code_units import CodeUnit, split_units, split_units_exact
+from neuro_symbolic_code_mentor.result_cache import ANALYZER_VERSION, ResultCache, cache_key, default_cache
+# Imported for their side effect: they register the checkers cached below.
+from neuro_symbolic_code_mentor import complexity, security_analyzer, static_bug_predictor  # noqa: F401
+
+# Checkers whose results only depend on the definition they are found in:
+# {function: score} dicts, or (lineno, message) lists.
+DEFAULT_CHECKERS = ("complexity", "bugs", "security")
+# Memory entries of the default definition cache: per-definition results are
+# small but numerous, and must not compete with whole-file and LLM entries.
+DEFINITION_CACHE_ENTRIES = 1 << 15
+
+_definition_cache: Optional[ResultCache] = None
+
+
+def definition_cache() -> ResultCache:
+    """
+    Process-wide cache of per-definition results, separate from
+    default_cache() but stored in the same directory (if any), with room
+    for DEFINITION_CACHE_ENTRIES in memory. analyze_definitions grows it
+    for files with more definitions.
+    """
+    global _definition_cache
+    directory = default_cache().directory
+    if _definition_cache is None or _definition_cache.directory != directory:
+        _definition_cache = ResultCache(max_entries=DEFINITION_CACHE_ENTRIES, directory=directory)
+    return _definition_cache
+
+
+def _analyze_unit(unit: CodeUnit, checkers: Sequence[str], filename: str) -> Dict:
+    """
+    Runs `checkers` on one unit on its own. Line numbers are relative to
+    the unit (its first line is 1), so the result stays valid when the
+    definition moves. List results are kept as the checker's parts (see
+    Checker.parts). Raises SyntaxError if the unit does not parse alone.
+    """
+    context = AnalysisContext(unit.source, filename=filename)
+    instances = {name: CHECKERS[name]() for name in checkers}
+    results = context.run(instances)
+    return {name: value if isinstance(value, dict) else instances[name].parts()
+            for name, value in results.items()}
+
+
+def _shift(found: List, offset: int) -> List:
+    return [(line + offset, *rest) for line, *rest in found]
+
+
+def _merge(merged: Dict, unit_result: Dict, offset: int) -> None:
+    # Lists are merged part by part, so e.g. every unit's eval() findings
+    # come before any redefinition, as in a whole-module BugChecker result.
+    for name, value in unit_result.items():
+        if isinstance(value, dict):
+            merged[name].update(value)
+        else:
+            for part, found in zip(merged[name], value):
+                part.extend(_shift(found, offset))
+
+
+def analyze_definitions(code: str, cache: Optional[ResultCache] = None,
+                        checkers: Sequence[str] = DEFAULT_CHECKERS, filename: str = "<unknown>") -> Dict:
+    """
+    Runs per-definition checkers (default: complexity scores, bug-predictor
+    issues and security findings) one top-level definition at a time, caching
+    each definition's results under the hash of its source text. After an edit
+    only the definitions whose text changed are parsed and analyzed again.
+
+    Returns {"results": {checker: merged result, with module line numbers},
+    "units": count, "reanalyzed": [names of units analyzed in this call]}.
+    The results are those of the same checkers run on the whole module.
+    Raises SyntaxError if `code` does not parse.
+
+    Uses definition_cache() unless `cache` is given; a given cache should
+    hold more entries in memory than the file has definitions.
+    """
+    grow = cache is None
+    cache = cache if cache is not None else definition_cache()
+    checkers = tuple(checkers)
+    versions = (ANALYZER_VERSION, ",".join(checkers))
+
+    # Unchanged file: one lookup instead of one per definition.
+    file_key = cache_key("definitions", code, *versions)
+    cached = cache.get(file_key)
+    if cached is not None:
+        results = {name: dict(value) if isinstance(value, dict) else _shift(value, 0)
+                   for name, value in cached["results"].items()}
+        return {"results": results, "units": cached["units"], "reanalyzed": []}
+
+    units = split_units(code)
+    if grow:  # keep every definition of this file (and the next version of it) in memory
+        cache.max_entries = max(cache.max_entries, 2 * len(units) + 1)
+    try:
+        analyzed = _analyze_units(units, cache, checkers, versions, filename)
+    except SyntaxError:
+        # The text heuristic split inside a statement (or the code is
+        # invalid, in which case the exact split raises).
+        units = split_units_exact(code)
+        analyzed = _analyze_units(units, cache, checkers, versions, filename)
+
+    results = {}
+    for name in checkers:
+        empty = CHECKERS[name]()
+        results[name] = {} if isinstance(empty.result(), dict) else empty.parts()
+    reanalyzed = []
+    for unit, (unit_result, was_cached) in zip(units, analyzed):
+        _merge(results, unit_result, unit.start - 1)
+        if not was_cached:
+            reanalyzed.append(unit.name)
+    results = {name: value if isinstance(value, dict) else [item for part in value for item in part]
+               for name, value in results.items()}
+    cache.set(file_key, {"results": results, "units": len(units)})
+    return {"results": results, "units": len(units), "reanalyzed": reanalyzed}
+
+
+def _analyze_units(units: List[CodeUnit], cache: ResultCache, checkers: Sequence[str],
+                   versions: Sequence[str], filename: str) -> List:
+    """
+    [(unit result, whether it came from the cache)] for every unit. Nothing
+    is stored until all units have parsed, so a failed split leaves no
+    fragments behind.
+    """
+    analyzed, fresh = [], []
+    for unit in units:
+        key = cache_key("definition", unit.source, *versions)
+        unit_result = cache.get(key)
+        was_cached = unit_result is not None
+        if not was_cached:
+            unit_result = _analyze_unit(unit, checkers, filename)
+            fresh.append((key, unit_result))
+        analyzed.append((unit_result, was_cached))
+    for key, unit_result in fresh:
+        cache.set(key, unit_result)
+    return analyzed
+
+
+def incremental_context(code: str, cache: Optional[ResultCache] = None,
+                        filename: str = "<unknown>") -> AnalysisContext:
+    """
+    An AnalysisContext whose per-definition checker results come from
+    analyze_definitions, so analyzers built on it (analyze_complexity,
+    SecurityAnalyzer, StaticBugPredictor...) only pay for changed
+    definitions. Other checkers still run on the whole module when asked
+    for. Invalid code gets a plain context, which reports the SyntaxError.
+    """
+    context = AnalysisContext(code, filename=filename)
+    try:
+        analysis = analyze_definitions(code, cache, filename=filename)
+    except SyntaxError:
+        return context
+    for name, value in analysis["results"].items():
+        context.set_result(name, value)
+    return context
@@ -1,43 +1,240 @@
 import ast
+import inspect
+import json
+from collections import Counter
+import astor
 from llm_handler import LLMAssistant
+from neuro_symbolic_code_mentor.analysis_context import get_context
+from neuro_symbolic_code_mentor.async_llm import explain_many
+from neuro_symbolic_code_mentor.prompt_builder import count_tokens, default_budget, truncate_to_budget
+
+# Cap on functions per batched request, so the JSON reply stays well within
+# the model's output limit. The prompt size itself follows
+# prompt_builder.default_budget().
+MAX_FUNCTIONS_PER_BATCH = 20
+
+BATCH_INSTRUCTIONS = """Write a docstring for each Python function below: a symbolic summary of what it does,
+its parameters and its return value, plus a short usage note where helpful.
+Reply with only a JSON object mapping each function id (the text after ###) to its docstring
+text, without quotes around the docstring itself:
+{"<function id>": "<docstring>", ...}
+"""
+
+_DEFINITIONS = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+def _definitions(statements, prefix="", depth=0):
+    """
+    (node, qualified name, indentation depth) for every def and class in
+    `statements`, in source order, including those under if/try/with/for
+    blocks. Only defs and classes add to the qualified name.
+    """
+    for node in statements:
+        if isinstance(node, _DEFINITIONS):
+            yield node, prefix + node.name, depth
+            yield from _definitions(node.body, f"{prefix}{node.name}.", depth + 1)
+            continue
+        for field in ("body", "handlers", "cases", "orelse", "finalbody"):
+            for child in getattr(node, field, None) or []:
+                if isinstance(child, ast.excepthandler):
+                    yield from _definitions(child.body, prefix, depth + 1)
+                elif isinstance(child, ast.match_case):
+                    yield from _definitions(child.body, prefix, depth + 2)
+                else:
+                    yield from _definitions([child], prefix, depth + 1)
+
+def _functions(tree):
+    """
+    (node, id, depth) for every function and method. The id is the
+    qualified name, suffixed with "@<line>" when several functions share it
+    (a property's getter and setter, alternative definitions under if/else).
+    """
+    found = [(node, name, depth) for node, name, depth in _definitions(tree.body)
+             if not isinstance(node, ast.ClassDef)]
+    counts = Counter(name for _node, name, _depth in found)
+    return [(node, name if counts[name] == 1 else f"{name}@{node.lineno}", depth) for node, name, depth in found]
 
 class DocumentationGenerator:
     """
     Day 15: Builds docstrings or external docs for each function, referencing symbolic logic.
+
+    The batched mode (generate_batched_documentation) sends each function's
+    own source instead of the whole module, as many functions per prompt as
+    the token budget allows, and reads back a JSON reply; apply_docstrings
+    writes the results into the code.
     """
-    def __init__(self, code):
+    def __init__(self, code, context=None, assistant=None):
         self.code = code
-        self.assistant = LLMAssistant()
+        self.context = get_context(code, context)
+        self.assistant = assistant or LLMAssistant()
+        self.requests_sent = 0
+        self.prompt_tokens = 0  # batched mode, see prompt_builder.count_tokens
 
     def extract_functions(self):
-        tree = ast.parse(self.code)
-        funcs = []
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                funcs.append(node.name)
-        return funcs
+        return list(self.context.result("function_names"))
 
-    def generate_documentation(self, func_name):
-        """
-        Calls the LLM to produce a docstring or summary for the function.
-        """
-        prompt = f"""
+    def build_prompt(self, func_name):
+        return f"""
 Analyze the function '{func_name}' in this code and produce a symbolic summary + usage doc.
 Code:
 {self.code}
 """
-        return self.assistant.generate_explanation(prompt)
 
-def run_documentation_generator(code):
+    def generate_documentation(self, func_name):
+        """
+        Calls the LLM to produce a docstring or summary for the function.
+        """
+        return self.assistant.generate_explanation(self.build_prompt(func_name))
+
+    def generate_all_documentation(self, func_names):
+        """
+        Requests the docs for every function concurrently; returns them in order.
+        """
+        return explain_many(self.assistant, [self.build_prompt(fn) for fn in func_names])
+
+    # -- batched mode --
+
+    def extract_function_sources(self):
+        """
+        Every function and method with its own source:
+        [{"name": id (Class.method, with "@<line>" when the name repeats), "signature",
+        "source", "line", "docstring"}] in source order, including functions
+        defined under if/try/with blocks.
+        """
+        functions = []
+        for node, name, _depth in _functions(self.context.tree):
+            keyword = "async def" if isinstance(node, ast.AsyncFunctionDef) else "def"
+            returns = f" -> {ast.unparse(node.returns)}" if node.returns else ""
+            functions.append({
+                "name": name,
+                "signature": f"{keyword} {node.name}({ast.unparse(node.args)}){returns}",
+                "source": ast.get_source_segment(self.code, node),
+                "line": node.lineno,
+                "docstring": ast.get_docstring(node),
+            })
+        return functions
+
+    def pack_batches(self, functions, token_budget=None):
+        """
+        Groups functions, in order, into batches whose prompt fits
+        `token_budget`. A function too large for the budget on its own is
+        cut to its first lines (signature included) and sent alone.
+        """
+        token_budget = token_budget if token_budget is not None else default_budget()
+        header = 4  # the "### name" line
+        room = token_budget - count_tokens(BATCH_INSTRUCTIONS)
+        batches, current, used = [], [], 0
+        for function in functions:
+            cost = count_tokens(function["source"]) + header
+            if cost > room:
+                function = dict(function, source=truncate_to_budget(function["source"], room - header))
+                cost = room
+            if current and (used + cost > room or len(current) >= MAX_FUNCTIONS_PER_BATCH):
+                batches.append(current)
+                current, used = [], 0
+            current.append(function)
+            used += cost
+        if current:
+            batches.append(current)
+        return batches
+
+    @staticmethod
+    def build_batch_prompt(batch):
+        sections = "\n\n".join(f"### {function['name']}\n{function['source']}" for function in batch)
+        return f"{BATCH_INSTRUCTIONS}\n{sections}\n"
+
+    @staticmethod
+    def parse_batch_reply(reply, names):
+        """
+        {name: docstring} for the functions in `names` found in a JSON reply
+        (code fences and text around the object are ignored). Missing or
+        malformed entries are simply absent.
+        """
+        start, end = reply.find("{"), reply.rfind("}")
+        if start == -1 or end <= start:
+            return {}
+        try:
+            parsed = json.loads(reply[start:end + 1])
+        except ValueError:
+            return {}
+        if not isinstance(parsed, dict):
+            return {}
+        docs = {}
+        for name in names:
+            text = parsed.get(name)
+            if not isinstance(text, str):
+                continue
+            text = text.strip()
+            if text[:3] in ('"""', "'''") and text[-3:] == text[:3]:
+                text = text[3:-3]
+            text = inspect.cleandoc(text)
+            if text:
+                docs[name] = text
+        return docs
+
+    def generate_batched_documentation(self, token_budget=None, functions=None):
+        """
+        Docstrings for every function (or the given extract_function_sources()
+        entries) as {name: docstring}, in source order. Batches are requested
+        concurrently; functions a reply leaves out are asked for again one by
+        one, still with only their own source.
+        """
+        functions = functions if functions is not None else self.extract_function_sources()
+        batches = self.pack_batches(functions, token_budget)
+        prompts = [self.build_batch_prompt(batch) for batch in batches]
+        docs = {}
+        for batch, reply in zip(batches, self._send(prompts)):
+            docs.update(self.parse_batch_reply(reply, [function["name"] for function in batch]))
+
+        missing = [function for batch in batches for function in batch if function["name"] not in docs]
+        retry_prompts = [self.build_batch_prompt([function]) for function in missing]
+        for function, reply in zip(missing, self._send(retry_prompts)):
+            parsed = self.parse_batch_reply(reply, [function["name"]])
+            docs[function["name"]] = parsed.get(function["name"], reply.strip())
+        return {function["name"]: docs[function["name"]] for function in functions}
+
+    def _send(self, prompts):
+        self.requests_sent += len(prompts)
+        self.prompt_tokens += sum(count_tokens(prompt) for prompt in prompts)
+        return explain_many(self.assistant, prompts)
+
+    def apply_docstrings(self, docs, overwrite=False):
+        """
+        Writes {function id: docstring} (ids as in extract_function_sources)
+        into a fresh parse of the code and returns the regenerated source (via
+        astor, so formatting and comments are normalized like the other
+        refactorings). Existing docstrings are kept unless `overwrite`.
+        """
+        tree = ast.parse(self.code)
+        for node, name, depth in _functions(tree):
+            if name not in docs:
+                continue
+            has_docstring = ast.get_docstring(node) is not None
+            if overwrite or not has_docstring:
+                indent = " " * 4 * (depth + 1)
+                text = "\n".join(indent + line if line.strip() else "" for line in docs[name].splitlines())
+                docstring = ast.Expr(ast.Constant(f"\n{text}\n{indent}"))
+                if has_docstring:
+                    node.body[0] = docstring
+                else:
+                    node.body.insert(0, docstring)
+        ast.fix_missing_locations(tree)
+        return astor.to_source(tree)
+
+def run_documentation_generator(code, context=None, assistant=None, batched=True):
     """
     Main Day 15 function: for each function, produce symbolic doc text.
+    Batched by default (one prompt per group of functions, each sent with
+    only its own source); batched=False asks once per function with the whole module.
     """
-    generator = DocumentationGenerator(code)
+    generator = DocumentationGenerator(code, context, assistant)
     funcs = generator.extract_functions()
     if not funcs:
         print("No functions found for documentation.")
         return
     print("\n=== Documentation Generator (Day 15) ===\n")
-    for fn in funcs:
-        doc_text = generator.generate_documentation(fn)
+    if batched:
+        docs = generator.generate_batched_documentation()
+    else:
+        docs = dict(zip(funcs, generator.generate_all_documentation(funcs)))
+    for fn, doc_text in docs.items():
         print(f"\n--- Doc for {fn} ---\n{doc_text}")
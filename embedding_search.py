@@ -0,0 +1,438 @@
+# neuro_symbolic_code_mentor/embedding_search.py
+
+import ast
+import hashlib
+import json
+import math
+import os
+import tempfile
+import threading
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from neuro_symbolic_code_mentor.code_units import unit_digest
+from neuro_symbolic_code_mentor.symbol_index import (
+    DEFAULT_INDEX_DIR, _remove_quietly, format_hit, scan_sources, tokenize,
+)
+
+# "hashing" needs no model: a bag of identifier parts hashed into a fixed
+# number of dimensions. Anything else is a Hugging Face encoder run on CPU.
+DEFAULT_MODEL = "hashing"
+HASHING_DIM = 512
+EMBED_BATCH_SIZE = 32
+MAX_TOKENS = 256  # transformer input is truncated to this many tokens
+
+SEARCH_CHUNK_ROWS = 65536     # rows multiplied at once, bounds the memory of a search
+APPROXIMATE_MIN_ROWS = 50000  # searches switch to LSH candidates above this size
+LSH_TABLES = 8
+LSH_BUCKET_ROWS = 256         # average bucket size the number of hyperplanes is chosen for
+
+_MODELS: Dict[str, object] = {}
+_MODELS_LOCK = threading.Lock()
+
+_DEFINITIONS = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return (vectors / np.where(norms == 0, 1, norms)).astype(np.float32)
+
+
+@lru_cache(maxsize=1 << 16)
+def _feature(term: str):
+    value = int.from_bytes(hashlib.blake2b(term.encode("utf-8", "surrogatepass"), digest_size=8).digest(), "big")
+    return value >> 1, (1.0 if value & 1 else -1.0)
+
+
+class HashingEmbedder:
+    """
+    Model-free embedder: the identifier parts and words of a text (see
+    symbol_index.tokenize), weighted 1 + log(tf) and hashed into `dim` signed
+    buckets. Fast and fully offline; it matches vocabulary rather than
+    meaning, so a transformer model finds more paraphrases.
+    """
+
+    def __init__(self, dim: int = HASHING_DIM):
+        self.dim = dim
+        self.name = f"hashing-{dim}"
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        vectors = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            counts = {}
+            for term in tokenize(text):
+                counts[term] = counts.get(term, 0) + 1
+            for term, count in counts.items():
+                bucket, sign = _feature(term)
+                vectors[row, bucket % self.dim] += sign * (1.0 + math.log(count))
+        return _normalize(vectors)
+
+
+def _load_model(model_name: str):
+    # Heavy imports, only when a transformer model is actually used.
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(model_name)
+    model = AutoModel.from_pretrained(model_name)
+    model.eval()
+    return torch, tokenizer, model
+
+
+class TransformerEmbedder:
+    """
+    Mean-pooled hidden states of a Hugging Face encoder (e.g.
+    "sentence-transformers/all-MiniLM-L6-v2" or "microsoft/unixcoder-base"),
+    run on CPU in batches. Each model is loaded once per process.
+    """
+
+    def __init__(self, model_name: str, batch_size: int = EMBED_BATCH_SIZE, max_tokens: int = MAX_TOKENS):
+        with _MODELS_LOCK:
+            if model_name not in _MODELS:
+                _MODELS[model_name] = _load_model(model_name)
+            self._torch, self.tokenizer, self.model = _MODELS[model_name]
+        self.name = model_name
+        self.dim = self.model.config.hidden_size
+        self.batch_size = batch_size
+        self.max_tokens = max_tokens
+
+    def embed(self, texts: Sequence[str]) -> np.ndarray:
+        torch = self._torch
+        batches = []
+        with torch.no_grad():
+            for start in range(0, len(texts), self.batch_size):
+                encoded = self.tokenizer(list(texts[start:start + self.batch_size]), padding=True,
+                                         truncation=True, max_length=self.max_tokens, return_tensors="pt")
+                hidden = self.model(**encoded).last_hidden_state
+                mask = encoded["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+                pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+                batches.append(pooled.cpu().numpy())
+        if not batches:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return _normalize(np.vstack(batches))
+
+
+def get_embedder(model: str = DEFAULT_MODEL):
+    """
+    "hashing" (or "hashing-<dim>") for the model-free embedder, otherwise
+    the name of a Hugging Face encoder.
+    """
+    if model == "hashing":
+        return HashingEmbedder()
+    if model.startswith("hashing-"):
+        return HashingEmbedder(int(model.split("-", 1)[1]))
+    return TransformerEmbedder(model)
+
+
+def iter_definitions(source: str, path: str, tree: Optional[ast.Module] = None) -> List[Dict]:
+    """
+    Every function, class and method in the module:
+    [{"kind", "name", "line", "end_line", "text", "digest"}], where `text`
+    is the definition's source (decorators included) and `digest` its hash.
+    Raises SyntaxError for invalid code.
+    """
+    tree = tree if tree is not None else ast.parse(source, filename=path)
+    lines = source.splitlines(keepends=True)
+    definitions = []
+    stack = [(node, None) for node in reversed(tree.body)]
+    while stack:
+        node, parent = stack.pop()
+        if isinstance(node, _DEFINITIONS):
+            if isinstance(node, ast.ClassDef):
+                kind = "class"
+            else:
+                kind = "method" if parent and parent[0] == "class" else "function"
+            name = f"{parent[1]}.{node.name}" if parent else node.name
+            start = min([node.lineno] + [d.lineno for d in node.decorator_list])
+            text = "".join(lines[start - 1:node.end_lineno])
+            definitions.append({"kind": kind, "name": name, "line": start, "end_line": node.end_lineno,
+                                "text": text, "digest": unit_digest(text)})
+            parent = (kind, name)
+        stack.extend((child, parent) for child in reversed(list(ast.iter_child_nodes(node))))
+    return definitions
+
+
+class LSHIndex:
+    """
+    Approximate nearest-neighbour candidates by random-hyperplane LSH:
+    `tables` hash tables, each keyed by the sign pattern of the rows against
+    `bits` random hyperplanes. A query collects the rows sharing its bucket,
+    or a bucket one bit away, in any table; only those are then scored
+    exactly.
+    """
+
+    def __init__(self, vectors: np.ndarray, tables: int = LSH_TABLES, bits: Optional[int] = None, seed: int = 0):
+        rows, dim = vectors.shape
+        self.bits = bits or int(min(24, max(1, round(math.log2(max(rows, 1) / LSH_BUCKET_ROWS)))))
+        self.planes = np.random.default_rng(seed).standard_normal((dim, tables * self.bits)).astype(np.float32)
+        self._weights = 1 << np.arange(self.bits, dtype=np.int64)
+        codes = np.empty((tables, rows), dtype=np.int64)
+        for start in range(0, rows, SEARCH_CHUNK_ROWS):
+            chunk = np.asarray(vectors[start:start + SEARCH_CHUNK_ROWS])
+            codes[:, start:start + len(chunk)] = self._codes(chunk).T
+        # Rows sorted by code per table; a bucket is a contiguous slice.
+        self._order = np.argsort(codes, axis=1, kind="stable")
+        self._sorted = np.take_along_axis(codes, self._order, axis=1)
+
+    def _codes(self, vectors: np.ndarray) -> np.ndarray:
+        signs = (vectors @ self.planes > 0).reshape(len(vectors), -1, self.bits)
+        return signs.astype(np.int64) @ self._weights
+
+    def candidates(self, query: np.ndarray) -> np.ndarray:
+        probes = self._codes(query[None, :])[0]
+        found = []
+        for table, code in enumerate(probes):
+            for probe in [code] + [code ^ (1 << bit) for bit in range(self.bits)]:
+                lo, hi = np.searchsorted(self._sorted[table], [probe, probe + 1])
+                if hi > lo:
+                    found.append(self._order[table, lo:hi])
+        return np.unique(np.concatenate(found)) if found else np.zeros(0, dtype=np.int64)
+
+
+class EmbeddingIndex:
+    """
+    Vector search over the functions, classes and methods of a code base.
+
+    Each definition is embedded once per content hash: re-indexing copies
+    the vectors of unchanged definitions and only embeds new or edited ones.
+    With `directory`, the vectors live in a memory-mapped float32 matrix
+    (vectors.f32) next to meta.json and survive across runs; an index built
+    with a different model is discarded.
+
+    Vectors are unit length, so cosine similarity is a matrix product,
+    computed in chunks of SEARCH_CHUNK_ROWS rows. Past APPROXIMATE_MIN_ROWS
+    rows, searches only score LSH candidates (see LSHIndex).
+    """
+
+    def __init__(self, directory: Optional[str] = None, embedder=None):
+        self.directory = directory
+        self.embedder = embedder if embedder is not None else get_embedder()
+        self.files = {}  # {path: {"mtime_ns", "size", "digest", "definitions": [...], "error"}}
+        self.rows = []   # row -> {"path", "kind", "name", "line", "end_line", "digest"}
+        self.vectors = np.zeros((0, self.embedder.dim), dtype=np.float32)
+        self.embedded = 0  # definitions embedded by this object (cache misses)
+        self._lsh = None
+        if directory and os.path.exists(os.path.join(directory, "meta.json")):
+            self._load()
+
+    # -- building --
+
+    def add_source(self, source: str, path: str, tree: Optional[ast.Module] = None) -> int:
+        """
+        Indexes (or re-indexes) one module under `path`; returns the number
+        of definitions. Raises SyntaxError for invalid code.
+        """
+        definitions = iter_definitions(source, path, tree)
+        self._rebuild({path: {"definitions": definitions, "error": None}})
+        if self.directory:
+            self._save_meta()
+        return len(definitions)
+
+    def update(self, root: str) -> Dict[str, int]:
+        """
+        Brings the index up to date with every .py file under `root`, like
+        SymbolIndex.update: only files whose mtime and content hash changed
+        are parsed, and only their changed definitions are embedded. Saves
+        the index when it has a directory. Returns counts per outcome,
+        including how many definitions were "embedded".
+        """
+        counts = {"added": 0, "updated": 0, "unchanged": 0, "removed": 0, "errors": 0}
+        seen = set()
+        changes = {}
+        touched = False
+        for path, source, digest, stat in scan_sources(root, self.files, counts, seen):
+            entry = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "digest": digest}
+            if source is None:
+                self.files[path].update(entry)
+                touched = True
+                continue
+            try:
+                entry.update(definitions=iter_definitions(source, path), error=None)
+            except (SyntaxError, ValueError) as e:
+                counts["errors"] += 1
+                entry.update(definitions=[], error=f"{type(e).__name__}: {e}")
+            changes[path] = entry
+        for path in self.files:
+            if path not in seen:
+                changes[path] = None
+                counts["removed"] += 1
+        before = self.embedded
+        if changes:
+            self._rebuild(changes)
+        counts["embedded"] = self.embedded - before
+        if self.directory and (changes or touched):
+            self._save_meta()
+        return counts
+
+    def _rebuild(self, changes: Dict[str, Optional[Dict]]) -> None:
+        """
+        Applies {path: new file entry, or None for removed files} and
+        rewrites the matrix: vectors of known digests are copied, the rest
+        are embedded in batches.
+        """
+        known = {row["digest"]: i for i, row in enumerate(self.rows)}
+        for path, entry in changes.items():
+            if entry is None:
+                self.files.pop(path, None)
+            else:
+                self.files[path] = entry
+
+        rows, missing = [], {}  # missing: {digest: text} still to embed
+        for path in sorted(self.files):
+            for definition in self.files[path]["definitions"]:
+                text = definition.pop("text", None)
+                row = dict(definition, path=path)
+                rows.append(row)
+                if row["digest"] not in known and row["digest"] not in missing:
+                    missing[row["digest"]] = text
+
+        vectors = self._new_matrix(len(rows))
+        fresh = {}
+        texts = list(missing.items())
+        for start in range(0, len(texts), EMBED_BATCH_SIZE):
+            batch = texts[start:start + EMBED_BATCH_SIZE]
+            embedded = self.embedder.embed([text for _digest, text in batch])
+            for (digest, _text), vector in zip(batch, embedded):
+                fresh[digest] = vector
+        self.embedded += len(fresh)
+        for i, row in enumerate(rows):
+            digest = row["digest"]
+            vectors[i] = fresh[digest] if digest in fresh else self.vectors[known[digest]]
+        self._install(rows, vectors)
+
+    def _new_matrix(self, count: int) -> np.ndarray:
+        if not self.directory or count == 0:
+            return np.zeros((count, self.embedder.dim), dtype=np.float32)
+        os.makedirs(self.directory, exist_ok=True)
+        fd, self._pending_path = tempfile.mkstemp(dir=self.directory, suffix=".f32.tmp")
+        os.close(fd)
+        return np.memmap(self._pending_path, dtype=np.float32, mode="w+", shape=(count, self.embedder.dim))
+
+    def _install(self, rows: List[Dict], vectors: np.ndarray) -> None:
+        self.rows = rows
+        self._lsh = None
+        if isinstance(vectors, np.memmap):
+            vectors.flush()
+            del vectors
+            matrix_path = os.path.join(self.directory, "vectors.f32")
+            os.replace(self._pending_path, matrix_path)
+            vectors = np.memmap(matrix_path, dtype=np.float32, mode="r", shape=(len(rows), self.embedder.dim))
+        self.vectors = vectors
+
+    # -- querying --
+
+    def search(self, query: str, limit: int = 10, kinds: Optional[List[str]] = None,
+               approximate: Optional[bool] = None) -> List[Dict]:
+        """
+        The `limit` definitions most similar to `query`:
+        [{"name", "kind", "path", "line", "end_line", "score"}], best first,
+        score being the cosine similarity. `approximate` forces LSH on or off
+        (default: on past APPROXIMATE_MIN_ROWS rows).
+        """
+        return self.search_batch([query], limit, kinds, approximate)[0]
+
+    def search_batch(self, queries: Sequence[str], limit: int = 10, kinds: Optional[List[str]] = None,
+                     approximate: Optional[bool] = None) -> List[List[Dict]]:
+        """
+        search() for several queries: they are embedded together and scored
+        in one pass over the matrix.
+        """
+        if not self.rows or not queries:
+            return [[] for _query in queries]
+        embedded = self.embedder.embed(list(queries))
+        if approximate is None:
+            approximate = len(self.rows) >= APPROXIMATE_MIN_ROWS
+        if approximate:
+            if self._lsh is None:
+                self._lsh = LSHIndex(self.vectors)
+            return [self._top(self._lsh.candidates(vector), vector[:, None], limit, kinds)[0]
+                    for vector in embedded]
+        scores = np.empty((len(self.rows), len(queries)), dtype=np.float32)
+        for start in range(0, len(self.rows), SEARCH_CHUNK_ROWS):
+            scores[start:start + SEARCH_CHUNK_ROWS] = self.vectors[start:start + SEARCH_CHUNK_ROWS] @ embedded.T
+        return self._rank(np.arange(len(self.rows)), scores, limit, kinds)
+
+    def _top(self, candidates: np.ndarray, query: np.ndarray, limit: int, kinds) -> List[List[Dict]]:
+        scores = np.asarray(self.vectors[candidates]) @ query
+        return self._rank(candidates, scores, limit, kinds)
+
+    def _rank(self, candidates: np.ndarray, scores: np.ndarray, limit: int, kinds) -> List[List[Dict]]:
+        if kinds:
+            keep = np.array([self.rows[i]["kind"] in kinds for i in candidates], dtype=bool)
+            candidates, scores = candidates[keep], scores[keep]
+        results = []
+        for column in scores.T:
+            count = min(limit, len(column))
+            if count == 0:
+                results.append([])
+                continue
+            top = np.argpartition(-column, count - 1)[:count]
+            top = top[np.argsort(-column[top], kind="stable")]
+            results.append([self._hit(int(candidates[i]), float(column[i])) for i in top])
+        return results
+
+    def _hit(self, row: int, score: float) -> Dict:
+        meta = self.rows[row]
+        return {"name": meta["name"], "kind": meta["kind"], "path": meta["path"], "line": meta["line"],
+                "end_line": meta["end_line"], "score": round(score, 4)}
+
+    def stats(self) -> Dict[str, object]:
+        return {"files": len(self.files), "definitions": len(self.rows), "model": self.embedder.name,
+                "dim": self.embedder.dim}
+
+    # -- persistence --
+
+    def _save_meta(self) -> None:
+        state = {"model": self.embedder.name, "dim": self.embedder.dim, "files": self.files,
+                 "count": len(self.rows)}
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(state, f, separators=(",", ":"))
+            os.replace(tmp_path, os.path.join(self.directory, "meta.json"))
+        except BaseException:
+            _remove_quietly(tmp_path)
+            raise
+
+    def _load(self) -> None:
+        try:
+            with open(os.path.join(self.directory, "meta.json"), "r", encoding="utf-8") as f:
+                state = json.load(f)
+            if state["model"] != self.embedder.name or state["dim"] != self.embedder.dim:
+                return
+            files, count = state["files"], state["count"]
+            rows = [dict(definition, path=path) for path in sorted(files) for definition in files[path]["definitions"]]
+            if len(rows) != count:
+                return
+            vectors = (np.memmap(os.path.join(self.directory, "vectors.f32"), dtype=np.float32, mode="r",
+                                 shape=(count, self.embedder.dim)) if count else self.vectors)
+        except (OSError, ValueError, KeyError, TypeError):
+            return  # unreadable or outdated index: start over, the next update rebuilds it
+        self.files, self.rows, self.vectors = files, rows, vectors
+
+
+def default_index_dir(root: str, model: str = DEFAULT_MODEL) -> str:
+    """
+    Where the vectors of `root` are kept unless told otherwise, next to the
+    keyword indexes under ~/.cache/neuro_symbolic_code_mentor/index.
+    """
+    root = os.path.abspath(root)
+    name = hashlib.sha256(f"{root}\0{model}".encode("utf-8", "surrogateescape")).hexdigest()[:16]
+    return os.path.join(DEFAULT_INDEX_DIR, f"{os.path.basename(root) or 'root'}-vectors-{name}")
+
+
+def run_vector_search(root: str, query: str, index_dir: Optional[str] = None, model: str = DEFAULT_MODEL,
+                      limit: int = 10) -> None:
+    index = EmbeddingIndex(index_dir or default_index_dir(root, model), get_embedder(model))
+    counts = index.update(root)
+    print("\n=== Vector Search ===\n")
+    print(f"Index: {len(index.rows)} definitions in {len(index.files)} files, model {index.embedder.name} "
+          f"({counts['embedded']} definitions embedded)")
+    hits = index.search(query, limit)
+    if hits:
+        for hit in hits:
+            print(" -", format_hit(hit))
+    else:
+        print("No matches found.")
@@ -1,5 +1,7 @@
 import re
+import sys
 from llm_handler import LLMAssistant
+from neuro_symbolic_code_mentor.streaming import echo, explain
 
 COMMON_ERRORS = {
     r"ZeroDivisionError": "Guide: Check your denominator before dividing.",
@@ -23,10 +25,11 @@ class ErrorPatternRecognizer:
                 suggestions.append(guide)
         return suggestions
 
-    def symbolic_troubleshoot(self):
+    def symbolic_troubleshoot(self, stream=None):
+        # With `stream` (a file), the guide is written there as it is generated.
         patterns = self.find_patterns()
         if not patterns:
-            return "No known error patterns found."
+            return echo("No known error patterns found.", stream)
         prompt = f"""
 We found these known error patterns: {patterns}
 Traceback:
@@ -34,9 +37,9 @@ Traceback:
 
 Provide a short symbolic troubleshooting guide.
 """
-        return self.llm.generate_explanation(prompt)
+        return explain(self.llm, prompt, stream, label="symbolic_troubleshoot")
 
 def run_error_pattern_recognition(traceback_str):
     epr = ErrorPatternRecognizer(traceback_str)
-    result = epr.symbolic_troubleshoot()
-    print("\n=== Error Pattern Recognition (Day 20) ===\n", result)
+    print("\n=== Error Pattern Recognition (Day 20) ===\n")
+    epr.symbolic_troubleshoot(stream=sys.stdout)
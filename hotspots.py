@@ -0,0 +1,286 @@
+# neuro_symbolic_code_mentor/hotspots.py
+
+import ast
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+
+from neuro_symbolic_code_mentor.analysis_context import get_context
+from neuro_symbolic_code_mentor.complexity import COMPLEXITY_THRESHOLD, analyze_complexity
+from neuro_symbolic_code_mentor.pattern_scanner import PatternScanner
+from neuro_symbolic_code_mentor.patterns import get_patterns
+
+DEFAULT_FILENAME = "<profiled>"
+DEFAULT_INTERVAL = 0.005  # seconds between samples
+# A sampled run with fewer samples than this is too short for reliable
+# fractions; the report says so rather than running the code again.
+MIN_SAMPLES = 20
+# "auto" samples a run expected to last at least this many intervals and
+# traces shorter ones, which would get too few samples.
+AUTO_SAMPLING_INTERVALS = 200
+
+
+def _snippet_lines(frame, filename: str):
+    """
+    Lines of the snippet on the stack of `frame`: (innermost line, all lines).
+    """
+    innermost = None
+    on_stack = set()
+    while frame is not None:
+        if frame.f_code.co_filename == filename:
+            if innermost is None:
+                innermost = frame.f_lineno
+            on_stack.add(frame.f_lineno)
+        frame = frame.f_back
+    return innermost, on_stack
+
+
+class SamplingCollector:
+    """
+    Statistical collector: a background thread looks at the profiled
+    thread's current frame every `interval` seconds and counts the snippet
+    line it is on ("self") and every snippet line on its stack ("total").
+    The profiled code runs at full speed; only the sampler costs anything.
+    The sampler needs the GIL, so the effective interval is at least
+    sys.getswitchinterval(); times are scaled from the real sample count.
+    """
+
+    def __init__(self, filename: str = DEFAULT_FILENAME, interval: float = DEFAULT_INTERVAL):
+        self.filename = filename
+        self.interval = interval
+        self.samples = 0
+        self.self_counts: Dict[int, int] = {}
+        self.total_counts: Dict[int, int] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._target = None
+
+    def start(self) -> None:
+        self._target = threading.get_ident()
+        self._thread = threading.Thread(target=self._run, name="hotspot-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target)
+            innermost, on_stack = _snippet_lines(frame, self.filename)
+            if innermost is None:
+                continue
+            self.samples += 1
+            self.self_counts[innermost] = self.self_counts.get(innermost, 0) + 1
+            for line in on_stack:
+                self.total_counts[line] = self.total_counts.get(line, 0) + 1
+
+    def lines(self, total_time: float) -> List[Dict]:
+        if not self.samples:
+            return []
+        per_sample = total_time / self.samples
+        return [
+            {"line": line, "hits": self.self_counts.get(line, 0),
+             "self_time": self.self_counts.get(line, 0) * per_sample,
+             "self_fraction": self.self_counts.get(line, 0) / self.samples,
+             "total_fraction": total / self.samples}
+            for line, total in sorted(self.total_counts.items())
+        ]
+
+
+class TracingCollector:
+    """
+    Exact collector: a line tracer on the snippet's frames counts every
+    execution of every line and charges the time until the next event to
+    it, keyed by the snippet lines that were waiting on calls at the time,
+    so calls are credited to the lines that made them. Precise, but the code
+    runs many times slower.
+    """
+
+    def __init__(self, filename: str = DEFAULT_FILENAME):
+        self.filename = filename
+        self.hits: Dict[int, int] = {}
+        self.times: Dict = {}  # (lines waiting on calls, current line) -> seconds
+        self._line: Optional[int] = None
+        self._callers: List[Optional[int]] = []
+        self._waiting = frozenset()
+        self._last = 0.0
+        self._previous_trace = None
+
+    def start(self) -> None:
+        self._previous_trace = sys.gettrace()
+        self._last = time.perf_counter()
+        sys.settrace(self._global_trace)
+
+    def stop(self) -> None:
+        sys.settrace(self._previous_trace)
+        self._charge(time.perf_counter())
+
+    def _charge(self, now: float) -> None:
+        if self._line is not None:
+            key = (self._waiting, self._line)
+            self.times[key] = self.times.get(key, 0.0) + now - self._last
+
+    def _global_trace(self, frame, event, arg):
+        # "call" also fires when a generator resumes, and "return" when it yields.
+        if frame.f_code.co_filename != self.filename:
+            return None
+        self._charge(time.perf_counter())
+        self._callers.append(self._line)
+        self._waiting = frozenset(line for line in self._callers if line is not None)
+        self._line = frame.f_lineno or None  # 0 before a module's first line
+        self._last = time.perf_counter()  # leave the tracer's own cost out
+        return self._local_trace
+
+    def _local_trace(self, frame, event, arg):
+        self._charge(time.perf_counter())
+        if event == "line":
+            self._line = frame.f_lineno
+            self.hits[self._line] = self.hits.get(self._line, 0) + 1
+        elif event == "return" and self._callers:
+            self._line = self._callers.pop()
+            self._waiting = frozenset(line for line in self._callers if line is not None)
+        self._last = time.perf_counter()
+        return self._local_trace
+
+    def lines(self, total_time: float) -> List[Dict]:
+        measured = sum(self.times.values()) or 1.0
+        self_time: Dict[int, float] = {}
+        inclusive: Dict[int, float] = {}
+        for (waiting, line), seconds in self.times.items():
+            self_time[line] = self_time.get(line, 0.0) + seconds
+            for on_stack in waiting | {line}:
+                inclusive[on_stack] = inclusive.get(on_stack, 0.0) + seconds
+        return [
+            {"line": line, "hits": self.hits.get(line, 0),
+             "self_time": self_time.get(line, 0.0),
+             "self_fraction": self_time.get(line, 0.0) / measured,
+             "total_fraction": total / measured}
+            for line, total in sorted(inclusive.items())
+        ]
+
+
+def _run_collector(compiled, collector) -> Dict:
+    error = None
+    start = time.perf_counter()
+    collector.start()
+    try:
+        exec(compiled, {})
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    finally:
+        collector.stop()
+    total_time = time.perf_counter() - start
+    return {"total_time": total_time, "error": error, "lines": collector.lines(total_time)}
+
+
+def _has_loops(code: str) -> bool:
+    # Without a measured run time: only loops (or recursion through them) make
+    # a run long enough to sample; straight-line code is cheap to trace.
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return True
+    return any(isinstance(node, (ast.For, ast.AsyncFor, ast.While, ast.comprehension)) for node in ast.walk(tree))
+
+
+def profile_lines(code: str, mode: str = "auto", interval: float = DEFAULT_INTERVAL,
+                  filename: str = DEFAULT_FILENAME, expected_time: Optional[float] = None) -> Dict:
+    """
+    Runs `code` and returns per-line hot-spot data:
+
+      {"mode": "sampling" | "tracing", "total_time", "error", "samples",
+       "lines": [{"line", "hits", "self_time", "self_fraction", "total_fraction"}, ...]}
+
+    "sampling" samples every `interval` seconds (hits are samples); "tracing"
+    records every line execution (hits are executions). "auto" traces runs
+    shorter than AUTO_SAMPLING_INTERVALS intervals of `expected_time` (e.g.
+    the total_time of an earlier profile_code run) and samples longer ones;
+    without `expected_time` it samples code with loops and traces the rest.
+    Either way the code runs exactly once: it is never re-run with another
+    collector. Code that does not compile is reported in "error", with no lines.
+    """
+    if mode not in ("auto", "sampling", "tracing"):
+        raise ValueError(f"Unknown mode: {mode!r}")
+    try:
+        compiled = compile(code, filename, "exec")
+    except (SyntaxError, ValueError) as e:  # ValueError: null bytes in the source
+        return {"mode": "tracing" if mode == "auto" else mode, "total_time": 0.0,
+                "error": f"{type(e).__name__}: {e}", "samples": 0 if mode == "sampling" else None, "lines": []}
+    if mode == "auto":
+        if expected_time is not None:
+            long_run = expected_time >= AUTO_SAMPLING_INTERVALS * interval
+        else:
+            long_run = _has_loops(code)
+        mode = "sampling" if long_run else "tracing"
+    if mode == "sampling":
+        sampler = SamplingCollector(filename, interval)
+        report = _run_collector(compiled, sampler)
+        report.update(mode="sampling", samples=sampler.samples)
+        return report
+    report = _run_collector(compiled, TracingCollector(filename))
+    report.update(mode="tracing", samples=None)
+    return report
+
+
+def line_findings(code: str, context=None) -> Dict[int, List[str]]:
+    """
+    Symbolic findings keyed by line: pattern-rule suggestions where a rule
+    matches, and each function's cyclomatic complexity on its `def` line.
+    """
+    findings: Dict[int, List[str]] = {}
+    patterns = get_patterns()
+    for hit in PatternScanner(patterns).scan(code):
+        messages = findings.setdefault(hit.line, [])
+        if patterns[hit.rule_index][1] not in messages:
+            messages.append(patterns[hit.rule_index][1])
+
+    context = get_context(code, context)
+    try:
+        complexity = analyze_complexity(code, context)
+        tree = context.tree
+    except SyntaxError:
+        return findings
+    seen = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FunctionDef) and node.name in complexity and node.name not in seen:
+            seen.add(node.name)
+            score = complexity[node.name]
+            note = " (above threshold, consider refactoring)" if score > COMPLEXITY_THRESHOLD else ""
+            findings.setdefault(node.lineno, []).append(f"complexity {score}{note}")
+    return findings
+
+
+def annotate_source(code: str, report: Dict, findings: Optional[Dict[int, List[str]]] = None,
+                    bar_width: int = 10) -> str:
+    """
+    The source with a hot-spot column in front of every line: hits, share of
+    time spent on the line itself (and including calls, when different), a
+    bar, and any findings for that line as a trailing comment.
+    """
+    by_line = {entry["line"]: entry for entry in report["lines"]}
+    findings = findings or {}
+    unit = "samples" if report["mode"] == "sampling" else "runs"
+    header = f"{'line':>5} {unit:>8} {'self%':>6} {'total%':>6} {'':<{bar_width}} | source"
+    out = [header, "-" * len(header)]
+    for number, source in enumerate(code.splitlines(), 1):
+        entry = by_line.get(number)
+        if entry:
+            self_pct = entry["self_fraction"] * 100
+            total_pct = entry["total_fraction"] * 100
+            bar = "#" * round(entry["self_fraction"] * bar_width)
+            prefix = f"{number:>5} {entry['hits']:>8} {self_pct:>5.1f}% {total_pct:>5.1f}% {bar:<{bar_width}}"
+        else:
+            prefix = f"{number:>5} {'':>8} {'':>6} {'':>6} {'':<{bar_width}}"
+        notes = findings.get(number)
+        suffix = f"    # <- {'; '.join(notes)}" if notes else ""
+        out.append(f"{prefix} | {source}{suffix}")
+    footer = f"\n{report['mode']} collector, {report['total_time']:.4f}s"
+    if report["mode"] == "sampling":
+        footer += f", {report['samples']} samples"
+        if report["samples"] < MIN_SAMPLES:
+            footer += " (too few for reliable fractions: profile with mode='tracing' for exact counts)"
+    if report["error"]:
+        footer += f"\nRuntime Error during profiling: {report['error']}"
+    return "\n".join(out) + footer
@@ -0,0 +1,121 @@
+# neuro_symbolic_code_mentor/llm_cache.py
+
+import os
+import threading
+from concurrent.futures import Future
+from typing import Dict, Iterator, Optional
+
+from llm_handler import LLMAssistant
+from neuro_symbolic_code_mentor.result_cache import ResultCache, cache_key
+from neuro_symbolic_code_mentor.streaming import stream_explanation
+
+LLM_CACHE_DIR_ENV = "CODE_MENTOR_LLM_CACHE_DIR"
+DEFAULT_LLM_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "neuro_symbolic_code_mentor", "llm")
+DEFAULT_TTL = 7 * 24 * 3600  # completions for an unchanged prompt stay valid for a week
+DEFAULT_MAX_DISK_BYTES = 64 * 1024 * 1024
+
+
+class CachedLLMAssistant:
+    """
+    Wraps an LLMAssistant so identical prompts are answered once:
+      - completions are cached (memory LRU + on-disk store, TTL and size
+        bounded) under a hash of the prompt and the model
+      - concurrent callers asking the same uncached prompt share the one
+        in-flight request instead of each sending their own
+
+    Drop-in replacement: exposes the same generate_explanation(prompt), and
+    stream_explanation(prompt) for streaming.
+    """
+
+    def __init__(self, assistant=None, cache: Optional[ResultCache] = None, model: Optional[str] = None):
+        self.assistant = assistant if assistant is not None else LLMAssistant()
+        self.model = model or getattr(self.assistant, "model", None) or type(self.assistant).__name__
+        self.cache = cache if cache is not None else ResultCache(
+            directory=os.environ.get(LLM_CACHE_DIR_ENV, DEFAULT_LLM_CACHE_DIR),
+            max_disk_bytes=DEFAULT_MAX_DISK_BYTES,
+            ttl=DEFAULT_TTL,
+        )
+        self.requests_sent = 0
+        self.deduplicated = 0
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def generate_explanation(self, prompt: str) -> str:
+        key = cache_key("llm", prompt, self.model)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        with self._lock:
+            # An identical request may have finished (cached, and left
+            # _inflight) since the lookup above: use its answer.
+            cached = self.cache.peek(key)
+            if cached is not None:
+                return cached
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+            else:
+                self.deduplicated += 1
+        if not owner:
+            return future.result()
+
+        try:
+            text = self.assistant.generate_explanation(prompt)
+            with self._lock:
+                self.requests_sent += 1
+            self.cache.set(key, text)
+            future.set_result(text)
+            return text
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._inflight[key]
+
+    def stream_explanation(self, prompt: str) -> Iterator[str]:
+        """
+        Yields the completion as it arrives from the wrapped assistant; a
+        cached completion is yielded whole. The text is cached once the
+        stream has finished (streams are not shared between callers).
+        """
+        key = cache_key("llm", prompt, self.model)
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+        parts = []
+        for chunk in stream_explanation(self.assistant, prompt):
+            parts.append(chunk)
+            yield chunk
+        with self._lock:
+            self.requests_sent += 1
+        self.cache.set(key, "".join(parts))
+
+    def stats(self) -> dict:
+        """
+        Cache counters plus how many requests actually reached the model and
+        how many were served by joining an identical in-flight request.
+        """
+        stats = self.cache.stats()
+        stats["requests_sent"] = self.requests_sent
+        stats["deduplicated"] = self.deduplicated
+        return stats
+
+
+_shared_assistant: Optional[CachedLLMAssistant] = None
+_shared_lock = threading.Lock()
+
+
+def cached_assistant() -> CachedLLMAssistant:
+    """
+    Process-wide CachedLLMAssistant around the default LLMAssistant.
+    """
+    global _shared_assistant
+    with _shared_lock:
+        if _shared_assistant is None:
+            _shared_assistant = CachedLLMAssistant()
+        return _shared_assistant
@@ -1,8 +1,9 @@
 
 # neuro_symbolic_code_mentor/mentor.py
 
-from typing import List
+from typing import Iterator, List, Tuple
 from neuro_symbolic_code_mentor.patterns import get_patterns
+from neuro_symbolic_code_mentor.pattern_scanner import PatternScanner, PatternHit
 from neuro_symbolic_code_mentor.neural import NeuralSuggester
 
 class CodeMentor:
@@ -13,6 +14,7 @@ class CodeMentor:
     
     def __init__(self, use_neural: bool = False, use_rl: bool = False):
         self.patterns = get_patterns()  # List of (compiled_pattern, suggestion)
+        self.scanner = PatternScanner(self.patterns)  # Single-pass matcher over all patterns
         self.use_neural = use_neural
         self.use_rl = use_rl
         
@@ -30,10 +32,31 @@ class CodeMentor:
         (pattern_index, suggestion) for interactive feedback.
         Otherwise, returns a list of suggestion strings.
         """
-        suggestions = []
-        for idx, (pattern, suggestion) in enumerate(self.patterns):
-            if pattern.search(code):
-                suggestions.append((idx, suggestion))
+        suggestions = self._symbolic_suggestions(code, return_raw)
+
+        if self.use_neural:
+            neural_suggestion = self.neural_suggester.generate_suggestions(code)
+            if self.use_rl and return_raw:
+                suggestions.append(("neural", neural_suggestion))
+            else:
+                suggestions.append(f"Neural Suggestion: {neural_suggestion}")
+        
+        return suggestions
+
+    def stream(self, code: str) -> Iterator[Tuple[str, str]]:
+        """
+        Yields ("suggestion", text) for each symbolic suggestion right away,
+        then the neural suggestion as ("token", text) pieces while the model
+        generates it.
+        """
+        for suggestion in self._symbolic_suggestions(code):
+            yield "suggestion", suggestion
+        if self.use_neural:
+            for text in self.neural_suggester.stream_suggestions(code):
+                yield "token", text
+
+    def _symbolic_suggestions(self, code: str, return_raw: bool = False) -> List:
+        suggestions = [(idx, self.patterns[idx][1]) for idx in self.scanner.fired_rules(code)]
                 
         if self.use_rl:
             # Sort suggestions by RL agent weight (highest first)
@@ -46,13 +69,12 @@ class CodeMentor:
                 ]
         else:
             suggestions = [sugg for idx, sugg in suggestions]
-        
-        if self.use_neural:
-            neural_suggestion = self.neural_suggester.generate_suggestions(code)
-            if self.use_rl and return_raw:
-                suggestions.append(("neural", neural_suggestion))
-            else:
-                suggestions.append(f"Neural Suggestion: {neural_suggestion}")
-        
         return suggestions
 
+    def find_hits(self, code: str) -> List[PatternHit]:
+        """
+        Returns every pattern hit in the code as PatternHit tuples
+        (rule_index, start, end, line), ordered by position.
+        """
+        return self.scanner.scan(code)
+
@@ -1,4 +1,5 @@
 from llm_handler import LLMAssistant
+from neuro_symbolic_code_mentor.prompt_builder import matching_lines, slice_code
 
 DESIGN_PATTERNS = {
     "singleton": "Ensures a class has only one instance but can be a hidden dependency.",
@@ -22,11 +23,14 @@ class ModularCodeMentor:
                 found.append(dp)
         return found
 
-    def explain_tradeoffs(self, patterns):
+    def explain_tradeoffs(self, patterns, budget=None):
+        # Only the code around the pattern keywords goes into the prompt
+        # when the whole file does not fit `budget` tokens.
+        code = slice_code(self.code, lines=matching_lines(self.code, patterns, ignore_case=True), budget=budget)
         prompt = f"""
 We found these potential design patterns: {patterns}
 Code:
-{self.code}
+{code}
 
 Explain the trade-offs for each pattern in detail, referencing best practices.
 """
@@ -1,27 +1,229 @@
-from transformers import pipeline
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Iterator, List
+
+from neuro_symbolic_code_mentor.result_cache import ResultCache, cache_key
+
+# Process-wide registries: each model is loaded once and shared by every
+# NeuralSuggester (and every web request) in the process.
+_PIPELINES: Dict[str, object] = {}
+_BATCHERS: Dict[str, "MicroBatcher"] = {}
+_SUGGESTION_CACHES: Dict[str, ResultCache] = {}
+_REGISTRY_LOCK = threading.Lock()
+
+GENERATION_KWARGS = {"max_length": 150, "num_return_sequences": 1}
+
+
+def _load_pipeline(model_name: str):
+    from transformers import pipeline  # heavy import, only when a model is actually needed
+
+    generator = pipeline("text-generation", model=model_name)
+    # Decoder-only models like GPT-2 ship without a pad token; batching needs
+    # one, and left padding keeps each prompt adjacent to its continuation.
+    if generator.tokenizer.pad_token_id is None:
+        generator.tokenizer.pad_token_id = generator.model.config.eos_token_id
+    generator.tokenizer.padding_side = "left"
+    return generator
+
+
+def get_pipeline(model_name: str = "gpt2"):
+    """
+    Returns the shared text-generation pipeline for `model_name`, loading it on first use.
+    """
+    with _REGISTRY_LOCK:
+        if model_name not in _PIPELINES:
+            _PIPELINES[model_name] = _load_pipeline(model_name)
+        return _PIPELINES[model_name]
+
+
+def normalize_code(code: str) -> str:
+    """
+    Canonical form used for cache keys: unified newlines, no trailing
+    whitespace, no leading/trailing blank lines.
+    """
+    lines = [line.rstrip() for line in code.replace("\r\n", "\n").replace("\r", "\n").split("\n")]
+    return "\n".join(lines).strip("\n")
+
+
+class MicroBatcher:
+    """
+    Collects prompts submitted from concurrent callers and runs them through
+    the pipeline together: a batch is flushed when it reaches `max_batch_size`
+    or when the oldest prompt has waited `max_wait` seconds.
+    """
+
+    def __init__(self, generator, max_batch_size: int = 8, max_wait: float = 0.02):
+        self.generator = generator
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.batches_run = 0
+        self._queue: "queue.Queue" = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="neural-batcher", daemon=True)
+        self._worker.start()
+
+    def submit(self, prompt: str) -> Future:
+        future: Future = Future()
+        self._queue.put((prompt, future))
+        return future
+
+    def _collect(self) -> List:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._collect()
+            prompts = [prompt for prompt, _future in batch]
+            try:
+                outputs = self.generator(prompts, batch_size=len(prompts), **GENERATION_KWARGS)
+            except Exception as e:  # hand the failure to every waiting caller
+                for _prompt, future in batch:
+                    future.set_exception(e)
+                continue
+            self.batches_run += 1
+            for (_prompt, future), output in zip(batch, outputs):
+                # Pipelines return one list of sequences per prompt.
+                sequence = output[0] if isinstance(output, list) else output
+                future.set_result(sequence["generated_text"])
+
+
+def get_batcher(model_name: str = "gpt2", max_batch_size: int = 8, max_wait: float = 0.02) -> MicroBatcher:
+    """
+    Returns the shared MicroBatcher for `model_name` (batching settings apply
+    when it is first created).
+    """
+    generator = get_pipeline(model_name)
+    with _REGISTRY_LOCK:
+        if model_name not in _BATCHERS:
+            _BATCHERS[model_name] = MicroBatcher(generator, max_batch_size, max_wait)
+        return _BATCHERS[model_name]
+
+
+def _suggestion_cache(model_name: str, cache_size: int) -> ResultCache:
+    with _REGISTRY_LOCK:
+        if model_name not in _SUGGESTION_CACHES:
+            _SUGGESTION_CACHES[model_name] = ResultCache(max_entries=cache_size)
+        return _SUGGESTION_CACHES[model_name]
+
 
 class NeuralSuggester:
     """
     A neural component that uses a transformer model to generate adaptive suggestions.
+
+    The model is loaded once per process and shared; concurrent requests are
+    micro-batched into one forward pass, and suggestions are cached by a hash
+    of the normalized code. stream_suggestions yields the text as it is
+    generated instead.
     """
 
-    def __init__(self, model_name: str = "gpt2"):
+    def __init__(self, model_name: str = "gpt2", max_batch_size: int = 8,
+                 max_wait: float = 0.02, cache_size: int = 256):
         # Note: For a production system, consider using a model fine-tuned on code.
-        self.generator = pipeline("text-generation", model=model_name)
+        self.model_name = model_name
+        self.batcher = get_batcher(model_name, max_batch_size, max_wait)
+        self.cache = _suggestion_cache(model_name, cache_size)
 
-    def generate_suggestions(self, code: str) -> str:
-        """
-        Generates suggestions based on the given code using a neural text-generation model.
-        """
-        prompt = (
+    @property
+    def generator(self):
+        return self.batcher.generator
+
+    @staticmethod
+    def build_prompt(code: str) -> str:
+        return (
             "Analyze the following Python code and provide detailed suggestions to improve it:\n\n"
             f"{code}\n\nSuggestions:"
         )
-        result = self.generator(prompt, max_length=150, num_return_sequences=1)
-        generated_text = result[0]["generated_text"]
+
+    @staticmethod
+    def extract_suggestion(generated_text: str) -> str:
         # Extract text after "Suggestions:" if present.
         if "Suggestions:" in generated_text:
-            suggestion = generated_text.split("Suggestions:")[-1].strip()
-        else:
-            suggestion = generated_text.strip()
-        return suggestion
+            return generated_text.split("Suggestions:")[-1].strip()
+        return generated_text.strip()
+
+    def generate_suggestions(self, code: str) -> str:
+        """
+        Generates suggestions based on the given code using a neural text-generation model.
+        """
+        return self.generate_suggestions_batch([code])[0]
+
+    def stream_suggestions(self, code: str) -> Iterator[str]:
+        """
+        Yields the suggestion for `code` piece by piece as the model decodes
+        it (a cached suggestion is yielded whole). Streamed requests run on
+        their own, outside the micro-batches.
+        """
+        normalized = normalize_code(code)
+        key = cache_key("neural", normalized, self.model_name)
+        cached = self.cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+        from transformers import TextIteratorStreamer  # heavy import, only when streaming
+
+        generator = self.generator
+        tokenizer = generator.tokenizer
+        inputs = tokenizer(self.build_prompt(normalized), return_tensors="pt")
+        streamer = TextIteratorStreamer(tokenizer, skip_prompt=True, skip_special_tokens=True)
+        errors = []
+
+        def generate():
+            try:
+                generator.model.generate(**inputs, streamer=streamer, max_length=GENERATION_KWARGS["max_length"],
+                                         pad_token_id=tokenizer.pad_token_id)
+            except BaseException as e:  # e.g. a prompt longer than the model's context, or OOM
+                errors.append(e)
+                streamer.end()  # otherwise the loop below waits for text forever
+
+        worker = threading.Thread(target=generate, name="neural-stream", daemon=True)
+        worker.start()
+        parts = []
+        for text in streamer:
+            if not parts:
+                text = text.lstrip()  # match extract_suggestion's stripped output
+                if not text:
+                    continue
+            parts.append(text)
+            yield text
+        worker.join()
+        if errors:
+            raise errors[0]
+        # The prompt ends with "Suggestions:", so the continuation is the suggestion.
+        self.cache.set(key, self.extract_suggestion("".join(parts)))
+
+    def generate_suggestions_batch(self, codes: List[str]) -> List[str]:
+        """
+        Generates suggestions for several snippets at once; uncached snippets
+        are submitted together so they share forward passes.
+        """
+        results: List = [None] * len(codes)
+        pending = {}  # {cache_key: (future, [indices])}
+        for i, code in enumerate(codes):
+            normalized = normalize_code(code)
+            key = cache_key("neural", normalized, self.model_name)
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[i] = cached
+            elif key in pending:
+                pending[key][1].append(i)
+            else:
+                pending[key] = (self.batcher.submit(self.build_prompt(normalized)), [i])
+
+        for key, (future, indices) in pending.items():
+            suggestion = self.extract_suggestion(future.result())
+            self.cache.set(key, suggestion)
+            for i in indices:
+                results[i] = suggestion
+        return results
@@ -1,23 +1,135 @@
-import ast
 from llm_handler import LLMAssistant
+from neuro_symbolic_code_mentor.analysis_context import AnalysisContext
+from neuro_symbolic_code_mentor.code_units import split_units, split_units_exact
+from neuro_symbolic_code_mentor.complexity import ComplexityChecker
+from neuro_symbolic_code_mentor.result_cache import ResultCache
+from neuro_symbolic_code_mentor.static_bug_predictor import BugChecker
+
+def line_delta(old_code, new_code):
+    """
+    Compact delta between two snapshots: (start, end, new_lines) meaning
+    "replace old lines [start:end) with new_lines". Found by trimming the
+    common prefix and suffix, so its size follows the edit, not the file.
+    """
+    old = old_code.splitlines(keepends=True)
+    new = new_code.splitlines(keepends=True)
+    prefix = 0
+    limit = min(len(old), len(new))
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and old[-1 - suffix] == new[-1 - suffix]:
+        suffix += 1
+    return (prefix, len(old) - suffix, new[prefix:len(new) - suffix])
+
+def apply_delta(code, delta):
+    start, end, new_lines = delta
+    lines = code.splitlines(keepends=True)
+    return "".join(lines[:start] + list(new_lines) + lines[end:])
 
 class PairProgrammingAssistant:
     """
-    Day 19: Interactive tool that listens to code changes 
+    Day 19: Interactive tool that listens to code changes
     (simulated) and offers neuro-symbolic feedback in real-time.
+
+    In incremental mode (the default) each snapshot is diffed against the
+    previous one: only top-level functions/classes whose text changed are
+    re-parsed, re-analyzed and sent to the LLM, per-definition results are
+    cached by content hash, and history is kept as compact line deltas.
     """
-    def __init__(self):
+    def __init__(self, incremental=True, cache_size=1024):
         self.assistant = LLMAssistant()
-        self.history = []
+        self.incremental = incremental
+        self.history = []  # deltas in incremental mode, full snapshots otherwise
+        self.current_code = ""
+        self.unit_results = ResultCache(max_entries=cache_size)  # {unit digest: symbolic findings}
+        self.units = []
+        self.last_changed = []
 
     def on_code_change(self, new_code):
-        self.history.append(new_code)
-        # Provide immediate suggestions
-        prompt = f"""
+        if not self.incremental:
+            self.history.append(new_code)
+            # Provide immediate suggestions
+            prompt = f"""
 We are pair-programming. The user just updated code to:
 {new_code}
 
 Provide immediate feedback or improvements using symbolic reasoning + LLM insights.
+"""
+            return self.assistant.generate_explanation(prompt)
+        return self._incremental_feedback(new_code)
+
+    def snapshot(self, index=-1):
+        """
+        Rebuilds the code as it was after the given update (incremental mode).
+        """
+        if index < 0:
+            index += len(self.history)
+        code = ""
+        for delta in self.history[:index + 1]:
+            code = apply_delta(code, delta)
+        return code
+
+    def analyze_unit(self, unit):
+        """
+        Symbolic findings for one definition, cached by its content hash.
+        """
+        cached = self.unit_results.get(unit.digest)
+        if cached is not None:
+            return cached
+        context = AnalysisContext(unit.source, filename=unit.name)
+        try:
+            # Both checkers share a single traversal of the definition's tree.
+            findings = context.run({"complexity": ComplexityChecker(), "bugs": BugChecker()})
+            findings["bugs"] = [message for _lineno, message in findings["bugs"]]
+        except SyntaxError as e:
+            findings = {"syntax_error": f"line {unit.start + (e.lineno or 1) - 1}: {e.msg}"}
+        self.unit_results.set(unit.digest, findings)
+        return findings
+
+    def _changed_units(self, new_code, previous_digests):
+        units = split_units(new_code)
+        changed = [u for u in units if u.digest not in previous_digests]
+        if any("syntax_error" in self.analyze_unit(u) for u in changed):
+            # The text splitter can be fooled (e.g. unindented continuation
+            # lines); if the whole file is valid, use exact AST boundaries.
+            try:
+                units = split_units_exact(new_code)
+            except SyntaxError:
+                return units, changed
+            changed = [u for u in units if u.digest not in previous_digests]
+        return units, changed
+
+    def _incremental_feedback(self, new_code):
+        self.history.append(line_delta(self.current_code, new_code))
+        self.current_code = new_code
+
+        previous = {u.digest: u for u in self.units}
+        units, changed = self._changed_units(new_code, previous)
+        current_names = {u.name for u in units}
+        removed = [u.name for u in previous.values() if u.name not in current_names]
+        self.units = units
+        self.last_changed = [u.name for u in changed]
+
+        if not changed and not removed:
+            return "No definitions changed since the last update."
+
+        sections = []
+        for unit in changed:
+            findings = self.analyze_unit(unit)
+            sections.append(
+                f"# {unit.kind} {unit.name} (lines {unit.start}-{unit.end})\n"
+                f"{unit.source}\n"
+                f"Symbolic findings: {findings}\n"
+            )
+        unchanged = [u.name for u in units if u.digest in previous]
+        prompt = f"""
+We are pair-programming. The user just changed these top-level definitions:
+{"".join(sections)}
+Removed definitions: {removed or "none"}
+Unchanged definitions (for context only): {unchanged or "none"}
+
+Provide immediate feedback or improvements on the changed code using symbolic reasoning + LLM insights.
 """
         return self.assistant.generate_explanation(prompt)
 
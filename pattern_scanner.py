@@ -0,0 +1,300 @@
+# neuro_symbolic_code_mentor/pattern_scanner.py
+
+import re
+from collections import namedtuple
+from typing import Dict, Iterator, List, Optional, Tuple
+
+PatternHit = namedtuple("PatternHit", ["rule_index", "start", "end", "line"])
+
+_ZERO_WIDTH_ESCAPES = "bB"
+_CLASS_ESCAPES = "dDsSwWAZ0123456789"
+_LITERAL_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "f": "\f", "v": "\v"}
+
+
+def _skip_group(pattern: str, pos: int) -> int:
+    """
+    Returns the index just past the group opening at pattern[pos] == '('.
+    """
+    depth = 0
+    in_class = False
+    while pos < len(pattern):
+        char = pattern[pos]
+        if char == "\\":
+            pos += 2
+            continue
+        if in_class:
+            if char == "]":
+                in_class = False
+        elif char == "[":
+            in_class = True
+            if pattern[pos + 1:pos + 2] == "]":
+                pos += 1
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                return pos + 1
+        pos += 1
+    return pos
+
+
+def _skip_class(pattern: str, pos: int) -> int:
+    """
+    Returns the index just past the character class opening at pattern[pos] == '['.
+    """
+    pos += 1
+    if pattern[pos:pos + 1] == "^":
+        pos += 1
+    if pattern[pos:pos + 1] == "]":
+        pos += 1
+    while pos < len(pattern):
+        if pattern[pos] == "\\":
+            pos += 2
+            continue
+        if pattern[pos] == "]":
+            return pos + 1
+        pos += 1
+    return pos
+
+
+def _read_quantifier(pattern: str, pos: int) -> Tuple[Optional[int], int]:
+    """
+    Reads an optional quantifier at pattern[pos].
+    Returns (min_repeat, new_pos); min_repeat is None when there is no quantifier.
+    """
+    if pos >= len(pattern):
+        return None, pos
+    char = pattern[pos]
+    if char in "*?":
+        min_repeat, pos = 0, pos + 1
+    elif char == "+":
+        min_repeat, pos = 1, pos + 1
+    elif char == "{":
+        match = re.match(r"\{(\d*)(,\d*)?\}", pattern[pos:])
+        if not match:
+            return None, pos
+        min_repeat = int(match.group(1) or 0)
+        pos += match.end()
+    else:
+        return None, pos
+    # Lazy or possessive modifiers do not change the minimum repeat count.
+    if pos < len(pattern) and pattern[pos] in "?+":
+        pos += 1
+    return min_repeat, pos
+
+
+def split_atoms(pattern: str) -> Optional[List[Tuple[str, str, Optional[int]]]]:
+    """
+    Splits a regex into top-level atoms of (kind, literal_text, min_repeat) where
+    kind is 'literal', 'zero' (zero-width assertion) or 'other'.
+
+    Returns None when the pattern cannot be reasoned about symbolically
+    (top-level alternation or inline flags).
+    """
+    atoms = []
+    pos = 0
+    while pos < len(pattern):
+        char = pattern[pos]
+        if char == "|":
+            return None
+        if char == "\\":
+            escaped = pattern[pos + 1:pos + 2]
+            pos += 2
+            if escaped in _ZERO_WIDTH_ESCAPES:
+                kind, text = "zero", char + escaped
+            elif escaped in _LITERAL_ESCAPES:
+                kind, text = "literal", _LITERAL_ESCAPES[escaped]
+            elif escaped.isalnum() or escaped in _CLASS_ESCAPES:
+                kind, text = "other", ""
+            else:
+                kind, text = "literal", escaped
+        elif char == "(":
+            if pattern.startswith("(?", pos) and re.match(r"\(\?[aiLmsux-]+[):]", pattern[pos:]):
+                return None
+            pos = _skip_group(pattern, pos)
+            kind, text = "other", ""
+        elif char == "[":
+            pos = _skip_class(pattern, pos)
+            kind, text = "other", ""
+        elif char in "^$":
+            pos += 1
+            kind, text = "zero", char
+        elif char == ".":
+            pos += 1
+            kind, text = "other", ""
+        else:
+            pos += 1
+            kind, text = "literal", char
+        min_repeat, pos = _read_quantifier(pattern, pos)
+        atoms.append((kind, text, min_repeat))
+    return atoms
+
+
+def literal_prefix(pattern: re.Pattern) -> str:
+    """
+    Returns the literal text every match of `pattern` must start with,
+    or an empty string if no such prefix can be derived.
+    """
+    if pattern.flags & (re.IGNORECASE | re.VERBOSE) or not isinstance(pattern.pattern, str):
+        return ""
+    atoms = split_atoms(pattern.pattern)
+    if not atoms:
+        return ""
+    prefix = ""
+    for kind, text, min_repeat in atoms:
+        if kind == "zero":
+            if prefix:
+                break
+            # Line anchors would not hold at an arbitrary match position; word
+            # boundaries are safe because `match(code, pos)` sees the full string.
+            if text in ("^", "$"):
+                return ""
+            continue
+        if kind != "literal" or min_repeat == 0:
+            break
+        prefix += text
+        if min_repeat is not None:
+            break
+    return prefix
+
+
+def required_literal(pattern: re.Pattern) -> str:
+    """
+    Returns the longest literal run every match of `pattern` must contain
+    somewhere, or an empty string if none can be derived. Unlike
+    `literal_prefix` the run need not start the match, so `^\\s*def \\w+` yields
+    "def " and a cheap substring test can rule out lines before the regex runs.
+    """
+    if pattern.flags & (re.IGNORECASE | re.VERBOSE) or not isinstance(pattern.pattern, str):
+        return ""
+    atoms = split_atoms(pattern.pattern)
+    if not atoms:
+        return ""
+    best = run = ""
+    for kind, text, min_repeat in atoms:
+        if kind == "zero":
+            continue
+        if kind != "literal" or min_repeat == 0:
+            run = ""
+            continue
+        run += text
+        if len(run) > len(best):
+            best = run
+        if min_repeat is not None:
+            # Only the last copy of a repeated atom is adjacent to what follows:
+            # `xa+b` requires "xa" and "ab", not "xab".
+            run = text
+    return best
+
+
+def _trie_regex(words: List[str]) -> str:
+    """
+    Compiles a list of literals into a prefix-trie shaped regex so the engine
+    walks each candidate position once instead of trying every literal.
+    """
+    trie: Dict = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = True
+
+    def render(node: Dict) -> str:
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return "(?:" + body + ")?"
+        return body
+
+    return render(trie)
+
+
+class PatternScanner:
+    """
+    Combines every rule from `get_patterns()` into one matching engine.
+
+    Rules with a literal prefix are located together in a single left-to-right
+    pass over the source using a trie-shaped regex over those prefixes; each
+    prefix hit is then confirmed by matching only the rules that share it.
+    Rules without a usable prefix fall back to their own search.
+    """
+
+    def __init__(self, patterns: List[Tuple[re.Pattern, str]]):
+        self.patterns = patterns
+        self.fallback_rules = []  # rule indices that need their own scan
+        rules_by_prefix: Dict[str, List[int]] = {}
+        for idx, (pattern, _suggestion) in enumerate(patterns):
+            prefix = literal_prefix(pattern)
+            if prefix:
+                rules_by_prefix.setdefault(prefix, []).append(idx)
+            else:
+                self.fallback_rules.append(idx)
+
+        # A trie hit yields the longest prefix at a position; every shorter
+        # prefix along the same path also occurs there, so fold those rules in.
+        self.candidates: Dict[str, List[int]] = {}
+        for prefix in rules_by_prefix:
+            rules = []
+            for other, other_rules in rules_by_prefix.items():
+                if prefix.startswith(other):
+                    rules.extend(other_rules)
+            self.candidates[prefix] = sorted(rules)
+
+        self.prefix_rule_count = len(patterns) - len(self.fallback_rules)
+        if rules_by_prefix:
+            self.prefix_regex = re.compile("(?=(" + _trie_regex(list(rules_by_prefix)) + "))")
+        else:
+            self.prefix_regex = None
+
+    def _prefix_matches(self, code: str, first_only: bool) -> Iterator[Tuple[int, re.Match]]:
+        if self.prefix_regex is None:
+            return
+        fired = set()
+        ends: Dict[int, int] = {}  # {rule index: end of its previous match}
+        for prefix_match in self.prefix_regex.finditer(code):
+            if first_only and len(fired) == self.prefix_rule_count:
+                return
+            position = prefix_match.start()
+            for idx in self.candidates[prefix_match.group(1)]:
+                if first_only and idx in fired:
+                    continue
+                if position < ends.get(idx, 0):
+                    continue  # inside this rule's previous match; finditer would not report it
+                match = self.patterns[idx][0].match(code, position)
+                if match:
+                    fired.add(idx)
+                    ends[idx] = match.end()
+                    yield idx, match
+
+    def scan(self, code: str) -> List[PatternHit]:
+        """
+        Returns every rule hit, ordered by position, as PatternHit tuples
+        (rule_index, start, end, line) with 1-based line numbers.
+        """
+        hits = [(idx, match.start(), match.end()) for idx, match in self._prefix_matches(code, first_only=False)]
+        for idx in self.fallback_rules:
+            pattern = self.patterns[idx][0]
+            hits.extend((idx, match.start(), match.end()) for match in pattern.finditer(code))
+        hits.sort(key=lambda hit: (hit[1], hit[0]))
+
+        result = []
+        line, line_start = 1, 0
+        for idx, start, end in hits:
+            line += code.count("\n", line_start, start)
+            line_start = start
+            result.append(PatternHit(idx, start, end, line))
+        return result
+
+    def fired_rules(self, code: str) -> List[int]:
+        """
+        Returns the sorted indices of rules that match anywhere in `code`,
+        equivalent to calling `pattern.search(code)` for every rule.
+        """
+        fired = {idx for idx, _match in self._prefix_matches(code, first_only=True)}
+        for idx in self.fallback_rules:
+            if self.patterns[idx][0].search(code):
+                fired.add(idx)
+        return sorted(fired)
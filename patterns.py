@@ -1,3 +1,4 @@
+import hashlib
 import re
 from typing import List, Tuple
 
@@ -18,3 +19,13 @@ def get_patterns() -> List[Tuple[re.Pattern, str]]:
         (re.compile(r'#\s*TODO'), "Reminder: Make sure to address any TODO comments before production deployment."),
     ]
     return patterns
+
+def ruleset_version() -> str:
+    """
+    Returns a short fingerprint of the current rule set (patterns, flags and
+    suggestions), so cached results are invalidated whenever a rule changes.
+    """
+    digest = hashlib.sha256()
+    for pattern, suggestion in get_patterns():
+        digest.update(f"{pattern.pattern}\0{pattern.flags}\0{suggestion}\0".encode("utf-8"))
+    return digest.hexdigest()[:16]
@@ -0,0 +1,330 @@
+# neuro_symbolic_code_mentor/prompt_builder.py
+
+import ast
+import os
+import re
+from collections import namedtuple
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Sequence
+
+try:
+    import tiktoken  # exact counts for OpenAI models; the regex estimate is used without it
+except ImportError:  # pragma: no cover
+    tiktoken = None
+
+DEFAULT_TOKEN_BUDGET = 3000  # tokens of code per prompt, unless configured
+PROMPT_BUDGET_ENV = "CODE_MENTOR_PROMPT_TOKENS"
+DEFAULT_ENCODING = "cl100k_base"
+WINDOW_LINES = (2, 8)  # lines kept around a flagged line when its function does not fit
+
+_TOKEN = re.compile(r"\w+|[^\w\s]")
+_DEFINITIONS = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+_FUNCTIONS = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+# A candidate piece of the prompt: source lines start..end (1-based,
+# inclusive), rendered as `text` when given (an outline) or as the lines
+# themselves. Lower priorities are packed first.
+Slice = namedtuple("Slice", ["start", "end", "priority", "text"])
+FLAGGED, CONTEXT, REFERENCED, OUTLINE = 0, 1, 2, 3
+
+
+def default_budget() -> int:
+    """
+    The code token budget: CODE_MENTOR_PROMPT_TOKENS, or DEFAULT_TOKEN_BUDGET.
+    """
+    value = os.environ.get(PROMPT_BUDGET_ENV)
+    return int(value) if value else DEFAULT_TOKEN_BUDGET
+
+
+@lru_cache(maxsize=None)
+def _encoding(model: Optional[str]):
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding(DEFAULT_ENCODING)
+    except KeyError:  # model tiktoken does not know
+        return tiktoken.get_encoding(DEFAULT_ENCODING)
+    except Exception:  # encoding files not cached and no network
+        return None
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    """
+    Tokens in `text` for `model`: exact with tiktoken installed, otherwise
+    estimated as one token per word or punctuation character.
+    """
+    encoding = _encoding(model)
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(_TOKEN.findall(text))
+
+
+def truncate_to_budget(text: str, budget: int, model: Optional[str] = None) -> str:
+    """
+    The leading lines of `text` that fit `budget` tokens, with a marker
+    when anything was cut.
+    """
+    if count_tokens(text, model) <= budget:
+        return text
+    marker = "# ... (truncated)"
+    kept, used = [], count_tokens(marker, model)
+    for line in text.splitlines():
+        used += count_tokens(line, model) + 1
+        if used > budget:
+            break
+        kept.append(line)
+    return "\n".join(kept + [marker])
+
+
+def _start(node: ast.AST) -> int:
+    return min([node.lineno] + [d.lineno for d in getattr(node, "decorator_list", [])])
+
+
+def _outline(node: ast.AST, lines: List[str]) -> str:
+    """
+    A definition reduced to its header(s): the signature (and decorators)
+    of a function, or a class header with the outlines of its methods.
+    """
+    body = node.body
+    first = body[0]
+    if isinstance(first, ast.Expr) and isinstance(getattr(first, "value", None), ast.Constant) \
+            and isinstance(first.value.value, str) and first.end_lineno - first.lineno < 3 and len(body) > 1:
+        first = body[1]  # keep a short docstring
+    if first.lineno > node.lineno:
+        header = lines[_start(node) - 1:first.lineno - 1]
+    else:  # one-line definition
+        header = lines[_start(node) - 1:node.lineno]
+    indent = " " * body[0].col_offset if body[0].lineno > node.lineno else " " * (node.col_offset + 4)
+    parts = ["\n".join(header)]
+    if isinstance(node, ast.ClassDef):
+        parts += [_outline(child, lines) for child in body if isinstance(child, _DEFINITIONS)]
+    parts.append(f"{indent}...")
+    return "\n".join(parts)
+
+
+class _Slicer:
+    """
+    Turns a parsed module plus what to focus on (flagged lines, definition
+    names) into Slice candidates.
+    """
+
+    def __init__(self, tree: ast.Module, lines: List[str]):
+        self.tree = tree
+        self.lines = lines
+        self.definitions = []  # [(node, enclosing class or None, qualified name)]
+        stack = [(node, None, "") for node in tree.body]
+        while stack:
+            node, owner, prefix = stack.pop()
+            if isinstance(node, _DEFINITIONS):
+                self.definitions.append((node, owner, prefix + node.name))
+                child_owner = node if isinstance(node, ast.ClassDef) else owner
+                stack.extend((child, child_owner, f"{prefix}{node.name}.") for child in node.body)
+        self.module_names = {}  # {name bound at module level: statement}
+        for node in tree.body:
+            if isinstance(node, _DEFINITIONS):
+                self.module_names[node.name] = node
+            elif isinstance(node, (ast.Import, ast.ImportFrom)):
+                for alias in node.names:
+                    self.module_names[(alias.asname or alias.name).split(".")[0]] = node
+            elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                for target in targets:
+                    for name in ast.walk(target):
+                        if isinstance(name, ast.Name):
+                            self.module_names[name.id] = node
+
+    def _full(self, node: ast.AST, priority: int) -> Slice:
+        return Slice(_start(node), node.end_lineno, priority, None)
+
+    def _enclosing(self, line: int):
+        """
+        Innermost function containing `line`, else the innermost class, else
+        the top-level statement; with the class owning a method.
+        """
+        best = None
+        for node, owner, _name in self.definitions:
+            if _start(node) <= line <= node.end_lineno:
+                if best is None or (isinstance(node, _FUNCTIONS), _start(node)) > \
+                        (isinstance(best[0], _FUNCTIONS), _start(best[0])):
+                    best = (node, owner)
+        if best is not None:
+            return best
+        for node in self.tree.body:
+            if node.lineno <= line <= node.end_lineno:
+                return node, None
+        return None, None
+
+    def focus(self, lines: Iterable[int], names: Iterable[str]) -> List[Slice]:
+        focused = []  # [(node, owner, flagged line or None)]
+        loose = []  # flagged lines outside every statement (comments, blank lines)
+        for line in sorted(set(lines)):
+            node, owner = self._enclosing(line)
+            if node is not None:
+                focused.append((node, owner, line))
+            elif 1 <= line <= len(self.lines):
+                loose.append(line)
+        wanted = set(names)
+        for node, owner, qualname in self.definitions:
+            if qualname in wanted or node.name in wanted:
+                focused.append((node, owner, None))
+
+        # Every flagged line gets a tight window first, so one long function
+        # cannot crowd out the others; whole functions and wider windows follow.
+        tight, whole, wide, context, referenced = [], [], [], [], []
+        seen = {id(node) for node, _owner, _line in focused}
+        indirect = []  # [(referenced definition, its owner)], whose own references come last
+        for node, owner, line in focused:
+            whole.append(self._full(node, FLAGGED))
+            if line is None:
+                if isinstance(node, _DEFINITIONS):
+                    wide.append(Slice(_start(node), node.end_lineno, FLAGGED, _outline(node, self.lines)))
+            else:
+                narrow, broad = min(WINDOW_LINES), max(WINDOW_LINES)
+                tight.append(Slice(max(_start(node), line - narrow), min(node.end_lineno, line + narrow),
+                                   FLAGGED, None))
+                wide.append(Slice(max(_start(node), line - broad), min(node.end_lineno, line + broad),
+                                  FLAGGED, None))
+            if owner is not None:
+                context.append(Slice(_start(owner), owner.lineno, CONTEXT, None))  # the class header
+            referenced += self._referenced(node, owner, seen, indirect)
+        for node, owner in indirect:  # one level further
+            referenced += self._referenced(node, owner, seen, [])
+        for line in loose:  # a raw window of source lines around it
+            narrow, broad = min(WINDOW_LINES), max(WINDOW_LINES)
+            tight.append(Slice(max(1, line - narrow), min(len(self.lines), line + narrow), FLAGGED, None))
+            wide.append(Slice(max(1, line - broad), min(len(self.lines), line + broad), FLAGGED, None))
+        return tight + whole + wide + context + referenced
+
+    def _referenced(self, node: ast.AST, owner: Optional[ast.ClassDef], seen: set, found: List) -> List[Slice]:
+        slices = []
+        for name in self._references(node, owner):
+            target = self.module_names.get(name) if isinstance(name, str) else name
+            if target is None or id(target) in seen:
+                continue
+            seen.add(id(target))
+            slices.append(self._full(target, REFERENCED))
+            if isinstance(target, _DEFINITIONS):
+                slices.append(Slice(_start(target), target.end_lineno, OUTLINE, _outline(target, self.lines)))
+                found.append((target, owner if isinstance(name, ast.AST) else None))
+        return slices
+
+    def _references(self, node: ast.AST, owner: Optional[ast.ClassDef]) -> List:
+        """
+        Module-level names used in `node`, plus the methods of `owner` it
+        calls through self.
+        """
+        methods = {child.name: child for child in owner.body if isinstance(child, _FUNCTIONS)} if owner else {}
+        found = []
+        for child in ast.walk(node):
+            if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Load):
+                found.append(child.id)
+            elif isinstance(child, ast.Attribute) and isinstance(child.value, ast.Name) \
+                    and child.value.id == "self" and child.attr in methods:
+                found.append(methods[child.attr])
+        unique, keys = [], set()
+        for item in found:
+            key = item if isinstance(item, str) else id(item)
+            if key not in keys:
+                keys.add(key)
+                unique.append(item)
+        return unique
+
+    def outline(self) -> List[Slice]:
+        """
+        No focus: every top-level definition as an outline first, then in
+        full as far as the budget goes; other statements as they are.
+        """
+        outlines, full, statements = [], [], []
+        for node in self.tree.body:
+            if isinstance(node, _DEFINITIONS):
+                outlines.append(Slice(_start(node), node.end_lineno, OUTLINE, _outline(node, self.lines)))
+                full.append(self._full(node, OUTLINE))
+            else:
+                statements.append(self._full(node, CONTEXT))
+        return statements + outlines + full
+
+
+def _pack(slices: Sequence[Slice], lines: List[str], budget: int, model: Optional[str]) -> str:
+    chosen: Dict[int, Slice] = {}  # {start: slice}
+    costs: Dict[int, int] = {}
+    used = 0
+    for candidate in sorted(slices, key=lambda s: s.priority):  # stable: keeps the order within a priority
+        covering = [s for s in chosen.values() if s.start <= candidate.start and candidate.end <= s.end]
+        if any(s.text is None or candidate.text is not None for s in covering):
+            continue  # already shown, in full or as an outline at least as detailed
+        contained = [s for s in chosen.values() if candidate.start <= s.start and s.end <= candidate.end]
+        text = candidate.text if candidate.text is not None else "\n".join(lines[candidate.start - 1:candidate.end])
+        cost = count_tokens(text, model) + 8  # + the "# lines a-b" header
+        freed = sum(costs[s.start] for s in contained)
+        if used + cost - freed > budget:
+            continue
+        for s in contained:
+            del chosen[s.start], costs[s.start]
+        chosen[candidate.start] = candidate
+        costs[candidate.start] = cost
+        used += cost - freed
+
+    # Adjacent full slices are shown as one chunk.
+    merged: List[Slice] = []
+    for start in sorted(chosen):
+        piece = chosen[start]
+        last = merged[-1] if merged else None
+        if last is not None and last.text is None and piece.text is None and piece.start <= last.end + 1:
+            merged[-1] = last._replace(end=max(last.end, piece.end))
+        else:
+            merged.append(piece)
+    parts = []
+    for piece in merged:
+        text = piece.text if piece.text is not None else "\n".join(lines[piece.start - 1:piece.end])
+        label = f"# lines {piece.start}-{piece.end}" + (" (outline)" if piece.text is not None else "")
+        parts.append(f"{label}\n{text}")
+    return "\n\n".join(parts)
+
+
+def slice_code(code: str, lines: Iterable[int] = (), names: Iterable[str] = (), budget: Optional[int] = None,
+               tree: Optional[ast.Module] = None, model: Optional[str] = None, context=None) -> str:
+    """
+    The code to put in a prompt, within `budget` tokens (default:
+    default_budget()). Code that fits is returned unchanged. Otherwise the
+    AST picks the slices worth sending:
+      - with `lines` (flagged line numbers) or `names` (functions/classes),
+        their enclosing functions (or a window around the line when a
+        function is too long), the class header of methods, and the
+        module-level definitions, imports and constants they reference
+        (as outlines when the full text does not fit); a flagged line outside
+        every statement (e.g. a comment) gets a window of the lines around it
+      - with neither, or when nothing they name is found, an outline of the module, filled in with full
+        definitions as far as the budget allows
+    Each slice is labelled with its line numbers. The tree of `context` (an
+    AnalysisContext) is reused when given. Code that does not parse is cut
+    to the budget.
+    """
+    budget = budget if budget is not None else default_budget()
+    if count_tokens(code, model) <= budget:
+        return code
+    try:
+        if tree is None:
+            tree = context.tree if context is not None else ast.parse(code)
+    except SyntaxError:
+        return truncate_to_budget(code, budget, model)
+    source_lines = code.splitlines()
+    slicer = _Slicer(tree, source_lines)
+    lines, names = list(lines), list(names)
+    slices = slicer.focus(lines, names) if (lines or names) else []
+    if not slices:  # no focus, or nothing it names is in the code
+        slices = slicer.outline()
+    return _pack(slices, source_lines, budget, model)
+
+
+def matching_lines(code: str, needles: Iterable[str], ignore_case: bool = False) -> List[int]:
+    """
+    Line numbers of the lines containing any of `needles` (for text-based
+    findings that have no AST node).
+    """
+    needles = [n.lower() for n in needles] if ignore_case else list(needles)
+    found = []
+    for number, line in enumerate(code.splitlines(), 1):
+        text = line.lower() if ignore_case else line
+        if any(needle in text for needle in needles):
+            found.append(number)
+    return found
@@ -71,11 +71,12 @@ class RefactorTransformer(ast.NodeTransformer):
 
         return node
 
-def symbolic_refactor(code: str) -> str:
+def symbolic_refactor(code: str, context=None) -> str:
     """
     Applies AST-based symbolic transformations to code and returns the refactored source.
+    If an AnalysisContext is given, its already-parsed tree is transformed in place.
     """
-    tree = ast.parse(code)
+    tree = context.take_tree() if context is not None else ast.parse(code)
     transformer = RefactorTransformer()
     new_tree = transformer.visit(tree)
     ast.fix_missing_locations(new_tree)
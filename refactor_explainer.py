@@ -1,6 +1,6 @@
 import ast
 import astor
-from llm_handler import LLMAssistant
+from neuro_symbolic_code_mentor.llm_cache import cached_assistant
 
 class RefactorTransformer(ast.NodeTransformer):
     """
@@ -39,7 +39,8 @@ def symbolic_refactor_with_tracking(code):
 
 class RefactorExplainer:
     def __init__(self):
-        self.assistant = LLMAssistant()
+        # Shared prompt cache: explaining the same refactor twice costs one completion.
+        self.assistant = cached_assistant()
 
     def explain_refactor(self, original_code, refactored_code, changes):
         """
@@ -0,0 +1,265 @@
+# neuro_symbolic_code_mentor/result_cache.py
+
+import copy
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+try:
+    import fcntl  # POSIX only; used to let a single process evict at a time
+except ImportError:  # pragma: no cover
+    fcntl = None
+
+# Bump whenever analyzer output changes so stale cached results are ignored.
+ANALYZER_VERSION = "2"
+
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_DISK_BYTES = 256 * 1024 * 1024
+CACHE_DIR_ENV = "CODE_MENTOR_CACHE_DIR"
+
+
+def cache_key(namespace: str, source: str, *versions: str) -> str:
+    """
+    Content-addressed key: a hash of the source text plus every version string
+    that influences the result (rule set, analyzer, thresholds...).
+    """
+    digest = hashlib.sha256()
+    for part in (namespace, *versions, source):
+        data = part.encode("utf-8", "surrogatepass")
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class ResultCache:
+    """
+    Two-level cache for analysis results:
+      - an in-memory LRU of up to `max_entries` results
+      - an optional on-disk store under `directory`, shared safely between
+        processes (atomic renames for writes, size-based eviction of the
+        least recently used files)
+
+    Values must be JSON-serializable. With `ttl` (seconds), entries older
+    than that are treated as misses. `stats()` reports hit and miss counts.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, directory: Optional[str] = None,
+                 max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl = ttl
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes_since_check = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.expired = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    # -- public API --
+
+    def get(self, key: str):
+        """
+        Returns a copy of the cached value for `key`, or None on a miss.
+        """
+        with self._lock:
+            if key in self._memory:
+                created, value = self._memory[key]
+                if not self._is_expired(created):
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    return copy.deepcopy(value)
+                del self._memory[key]
+                self.expired += 1
+
+        entry = self._read_disk(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            created, value = entry
+            self.disk_hits += 1
+            self._remember(key, created, value)
+        return copy.deepcopy(value)
+
+    def peek(self, key: str):
+        """
+        Like get, but only looks in memory and is not counted in the stats:
+        for re-checking a key that was just looked up.
+        """
+        with self._lock:
+            if key in self._memory:
+                created, value = self._memory[key]
+                if not self._is_expired(created):
+                    return copy.deepcopy(value)
+        return None
+
+    def set(self, key: str, value) -> None:
+        created = time.time()
+        with self._lock:
+            self._remember(key, created, copy.deepcopy(value))
+        if self.directory:
+            self._write_disk(key, created, value)
+
+    def get_or_compute(self, key: str, compute: Callable[[], object]):
+        """
+        Returns the cached value for `key`, computing and storing it on a miss.
+        """
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.set(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+        if self.directory:
+            for path, _size, _mtime in self._disk_entries():
+                _remove_quietly(path)
+
+    def stats(self) -> dict:
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "hits": hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "hit_rate": hits / lookups if lookups else 0.0,
+            "entries": len(self._memory),
+        }
+
+    # -- memory layer --
+
+    def _is_expired(self, created: float) -> bool:
+        return self.ttl is not None and time.time() - created > self.ttl
+
+    def _remember(self, key, created, value):
+        if self.max_entries <= 0:
+            return
+        self._memory[key] = (created, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    # -- disk layer --
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".json")
+
+    def _read_disk(self, key: str):
+        if not self.directory:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            created, value = entry["created"], entry["value"]
+            if self._is_expired(created):
+                self.expired += 1
+                _remove_quietly(path)
+                return None
+            os.utime(path)  # mark as recently used for eviction
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        return created, value
+
+    def _write_disk(self, key: str, created: float, value) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write to a private temp file, then rename: readers in other processes
+        # only ever see complete files.
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"created": created, "value": value}, f)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except OSError:
+            _remove_quietly(tmp_path)
+            return
+        self._bytes_since_check += size
+        if self._bytes_since_check >= self.max_disk_bytes // 10:
+            self._bytes_since_check = 0
+            self.evict()
+
+    def _disk_entries(self):
+        entries = []
+        for shard in os.scandir(self.directory):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if not entry.name.endswith(".json"):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def evict(self) -> None:
+        """
+        Deletes the least recently used files until the on-disk store is at
+        90% of `max_disk_bytes`. Only one process evicts at a time; the others
+        skip the round.
+        """
+        if not self.directory:
+            return
+        with open(os.path.join(self.directory, ".evict.lock"), "a") as lock_file:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except OSError:
+                    return
+            entries = self._disk_entries()
+            total = sum(size for _path, size, _mtime in entries)
+            if total <= self.max_disk_bytes:
+                return
+            target = int(self.max_disk_bytes * 0.9)
+            for path, size, _mtime in sorted(entries, key=lambda e: e[2]):
+                if total <= target:
+                    break
+                _remove_quietly(path)
+                total -= size
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+_default_cache: Optional[ResultCache] = None
+
+
+def default_cache() -> ResultCache:
+    """
+    Process-wide cache used by review_code and complexity_report. It is
+    memory-only unless CODE_MENTOR_CACHE_DIR is set or configure_default_cache
+    is called with a directory.
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = ResultCache(directory=os.environ.get(CACHE_DIR_ENV) or None)
+    return _default_cache
+
+
+def configure_default_cache(**kwargs) -> ResultCache:
+    """
+    Replaces the process-wide cache, e.g. configure_default_cache(directory=".mentor-cache").
+    """
+    global _default_cache
+    _default_cache = ResultCache(**kwargs)
+    return _default_cache
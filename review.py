@@ -4,6 +4,9 @@ from typing import List, Dict
 from neuro_symbolic_code_mentor.mentor import CodeMentor
 from neuro_symbolic_code_mentor.complexity import analyze_complexity, COMPLEXITY_THRESHOLD
 from neuro_symbolic_code_mentor.refactor import symbolic_refactor
+from neuro_symbolic_code_mentor.analysis_context import get_context
+from neuro_symbolic_code_mentor.patterns import ruleset_version
+from neuro_symbolic_code_mentor.result_cache import ANALYZER_VERSION, cache_key, default_cache
 import difflib
 
 def generate_refactor_diff(original_code: str, refactored_code: str) -> str:
@@ -15,18 +18,23 @@ def generate_refactor_diff(original_code: str, refactored_code: str) -> str:
     refactored_lines = refactored_code.splitlines(keepends=True)
     diff = difflib.unified_diff(
         original_lines, refactored_lines,
-        fromfile="original", tofile="refactored",
-        lineterm=""
+        fromfile="original", tofile="refactored"
     )
     return "".join(diff)
 
-def review_code(code: str) -> Dict[str, str]:
+def review_code(code: str, context=None, cache=None) -> Dict[str, str]:
     """
     Orchestrates an automated code review across multiple dimensions:
       1. Symbolic pattern checks
       2. Cyclomatic complexity
       3. Potential refactor suggestions
 
+    The source is parsed once through a shared AnalysisContext (pass one in to
+    reuse it across other analyzers); all AST checkers run in a single pass.
+    Results are cached by a hash of the source, the rule-set version and the
+    analyzer version, so an unchanged file is not re-analyzed. Pass a
+    ResultCache to use a specific cache instead of the process-wide default.
+
     Returns a dictionary of string sections:
       {
         'patterns': "...",
@@ -34,6 +42,12 @@ def review_code(code: str) -> Dict[str, str]:
         'refactor': "..."
       }
     """
+    cache = cache if cache is not None else default_cache()
+    key = cache_key("review_code", code, ruleset_version(), ANALYZER_VERSION, str(COMPLEXITY_THRESHOLD))
+    return cache.get_or_compute(key, lambda: _run_review(code, context))
+
+def _run_review(code: str, context=None) -> Dict[str, str]:
+    context = get_context(code, context)
 
     # -- 1. Symbolic Pattern Checks (Day 1 & 2 logic) --
     mentor = CodeMentor(use_neural=False, use_rl=False)
@@ -46,7 +60,7 @@ def review_code(code: str) -> Dict[str, str]:
         pattern_report = "No pattern-based issues were found."
 
     # -- 2. Complexity Analysis (Day 4) --
-    complexities = analyze_complexity(code)
+    complexities = analyze_complexity(code, context)
     if complexities:
         complexity_report = "Function Complexity:\n"
         for func_name, score in complexities.items():
@@ -62,7 +76,8 @@ def review_code(code: str) -> Dict[str, str]:
 
     # -- 3. Refactor Suggestions (Day 5) --
     # We'll get a diff showing how 'symbolic_refactor' would transform the code
-    refactored = symbolic_refactor(code)
+    # (runs last: it transforms the context's tree in place)
+    refactored = symbolic_refactor(code, context)
     if refactored.strip() == code.strip():
         refactor_report = "No symbolic refactor changes suggested."
     else:
@@ -0,0 +1,345 @@
+# neuro_symbolic_code_mentor/sandbox.py
+
+import atexit
+import io
+import math
+import multiprocessing
+import os
+import queue
+import signal
+import sys
+import threading
+import time
+import traceback
+from contextlib import redirect_stderr, redirect_stdout
+from typing import Dict, Optional
+
+try:
+    import resource  # POSIX only; without it just the wall-clock limit applies
+except ImportError:  # pragma: no cover
+    resource = None
+
+DEFAULT_WORKERS = 2
+DEFAULT_CPU_TIME = 5.0  # seconds of CPU per run
+DEFAULT_WALL_TIME = 10.0  # seconds of real time per run
+DEFAULT_MEMORY_MB = 512  # address space a run may add on top of the idle worker
+DEFAULT_MAX_TASKS_PER_WORKER = 100
+DEFAULT_MAX_OUTPUT = 64 * 1024  # characters of captured stdout/stderr kept per run
+
+SNIPPET_FILENAME = "<string>"
+
+
+class CPUTimeExceeded(BaseException):
+    """
+    Raised inside a worker when a run uses up its CPU-time budget (SIGPROF).
+    A BaseException so a bare `except Exception` in user code does not swallow it.
+    """
+
+
+# -- worker side --
+
+def _on_cpu_budget_spent(signum, frame):
+    raise CPUTimeExceeded()
+
+
+def _address_space_in_use() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _cpu_seconds_used() -> float:
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    return usage.ru_utime + usage.ru_stime
+
+
+def _user_traceback(e: BaseException) -> str:
+    # Hide the worker's own frames: start at the first frame of the snippet.
+    tb = e.__traceback__
+    while tb is not None and tb.tb_frame.f_code.co_filename != SNIPPET_FILENAME:
+        tb = tb.tb_next
+    if tb is None:
+        return "".join(traceback.format_exception_only(type(e), e))
+    return "".join(traceback.format_exception(type(e), e, tb))
+
+
+def _run_exec(code: str) -> Dict:
+    exec(compile(code, SNIPPET_FILENAME, "exec"), {})
+    return {}
+
+
+def _run_profile(code: str) -> Dict:
+    from neuro_symbolic_code_mentor.call_profiler import profile_code
+    return {"profile": profile_code(code, filename=SNIPPET_FILENAME)}
+
+
+def _run_memory(code: str) -> Dict:
+    from neuro_symbolic_code_mentor.memory_tracker import track_memory
+    return {"memory": track_memory(code, filename=SNIPPET_FILENAME)}
+
+
+def _run_lines(code: str, mode: str = "auto", interval: Optional[float] = None,
+               expected_time: Optional[float] = None) -> Dict:
+    from neuro_symbolic_code_mentor.hotspots import DEFAULT_INTERVAL, profile_lines
+    interval = DEFAULT_INTERVAL if interval is None else interval
+    return {"lines": profile_lines(code, mode=mode, interval=interval, filename=SNIPPET_FILENAME,
+                                   expected_time=expected_time)}
+
+
+def _run_scaling(code: str, function_name: str, make_input: Optional[str] = None, estimate: Optional[Dict] = None) -> Dict:
+    from neuro_symbolic_code_mentor.complexity_estimator import estimate_complexity
+    namespace = {}
+    exec(compile(code, SNIPPET_FILENAME, "exec"), namespace)
+    func = namespace.get(function_name)
+    if not callable(func):
+        raise NameError(f"No function named {function_name!r} in the code")
+    return {"scaling": estimate_complexity(func, make_input, **(estimate or {}))}
+
+
+def _run_benchmark(code: str, **options) -> Dict:
+    from neuro_symbolic_code_mentor.benchmark_harness import benchmark, module_runner
+    return {"benchmark": benchmark(module_runner(code, SNIPPET_FILENAME), **options)}
+
+
+def _run_compare(code: str, optimized_code: str, **options) -> Dict:
+    from neuro_symbolic_code_mentor.benchmark_harness import compare, module_runner
+    return {"comparison": compare(module_runner(code, SNIPPET_FILENAME),
+                                  module_runner(optimized_code, SNIPPET_FILENAME), **options)}
+
+
+# Job kinds a worker accepts; each returns extra fields for the result.
+JOBS = {"exec": _run_exec, "profile": _run_profile, "memory": _run_memory, "lines": _run_lines,
+        "scaling": _run_scaling, "benchmark": _run_benchmark, "compare": _run_compare}
+
+
+def _run_job(kind: str, code: str, options: Dict, cpu_time: float, max_output: int) -> Dict:
+    result = {"ok": True, "error_type": None, "error_message": None, "traceback": None,
+              "timed_out": False, "cpu_exceeded": False, "memory_exceeded": False, "crashed": False}
+    if resource is not None:
+        # The profiling timer stops the run precisely once it has used
+        # `cpu_time` of CPU. Python only handles signals between bytecodes, so
+        # RLIMIT_CPU (whole seconds, counted over the worker's lifetime) backs
+        # it up by killing the worker if a C call never returns.
+        signal.setitimer(signal.ITIMER_PROF, cpu_time)
+        hard = resource.getrlimit(resource.RLIMIT_CPU)[1]
+        soft = math.ceil(_cpu_seconds_used() + cpu_time) + 1
+        resource.setrlimit(resource.RLIMIT_CPU, (soft if hard == resource.RLIM_INFINITY else min(soft, hard), hard))
+    output = io.StringIO()
+    start = time.perf_counter()
+    cpu_start = time.process_time()
+    try:
+        with redirect_stdout(output), redirect_stderr(output):
+            result.update(JOBS[kind](code, **options))
+    except CPUTimeExceeded:
+        result.update(ok=False, error_type="CPUTimeExceeded", cpu_exceeded=True,
+                      error_message=f"CPU time limit of {cpu_time:g}s exceeded")
+    except BaseException as e:  # SystemExit / KeyboardInterrupt from the snippet included
+        result.update(ok=False, error_type=type(e).__name__, error_message=str(e),
+                      traceback=_user_traceback(e), memory_exceeded=isinstance(e, MemoryError))
+    finally:
+        if resource is not None:
+            signal.setitimer(signal.ITIMER_PROF, 0)
+            resource.setrlimit(resource.RLIMIT_CPU, (hard, hard))
+    result["elapsed"] = time.perf_counter() - start
+    result["cpu_time"] = time.process_time() - cpu_start
+    result["output"] = output.getvalue()[:max_output]
+    return result
+
+
+def _worker_main(conn, memory_bytes: Optional[int]) -> None:
+    """
+    Entry point of a worker process: applies the limits, then serves jobs
+    from `conn` until the pipe closes.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    sys.stdin = open(os.devnull)  # input() fails fast instead of blocking
+    if resource is not None:
+        signal.signal(signal.SIGPROF, _on_cpu_budget_spent)
+        resource.setrlimit(resource.RLIMIT_CORE, (0, 0))
+        if memory_bytes:
+            limit = _address_space_in_use() + memory_bytes
+            resource.setrlimit(resource.RLIMIT_AS, (limit, resource.getrlimit(resource.RLIMIT_AS)[1]))
+    conn.send("ready")
+    while True:
+        try:
+            kind, code, options, cpu_time, max_output = conn.recv()
+        except (EOFError, OSError):
+            return
+        conn.send(_run_job(kind, code, options, cpu_time, max_output))
+
+
+# -- parent side --
+
+class _Worker:
+    def __init__(self, context, memory_bytes: Optional[int]):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(target=_worker_main, args=(child_conn, memory_bytes), daemon=True)
+        self.process.start()
+        child_conn.close()
+        self.ready = False
+        self.tasks = 0
+
+    def wait_ready(self, timeout: float) -> bool:
+        if not self.ready and self.conn.poll(timeout):
+            try:
+                self.ready = self.conn.recv() == "ready"
+            except (EOFError, OSError):
+                return False
+        return self.ready
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+def _failed_result(message: str, elapsed: float, **flags) -> Dict:
+    result = {"ok": False, "error_type": None, "error_message": message, "traceback": None,
+              "timed_out": False, "cpu_exceeded": False, "memory_exceeded": False, "crashed": False,
+              "elapsed": elapsed, "cpu_time": None, "output": ""}
+    result.update(flags)
+    return result
+
+
+class SandboxPool:
+    """
+    Pool of warm worker processes that run untrusted snippets under limits:
+      - CPU time (a profiling timer per run, RLIMIT_CPU as a backstop) and wall-clock time (the parent kills
+        the worker when a run overstays)
+      - address space (RLIMIT_AS), so a huge allocation raises MemoryError
+        in the worker instead of exhausting the host
+
+    Workers are started up front and reused between runs; one that is killed,
+    crashes or has served `max_tasks_per_worker` runs is replaced. Results are
+    dicts with "ok", "error_type", "error_message", "traceback", "elapsed",
+    "cpu_time", "output" (captured stdout/stderr) and the flags "timed_out",
+    "cpu_exceeded", "memory_exceeded" and "crashed".
+
+    This contains runaway snippets; it is not a security boundary (no
+    filesystem or network isolation).
+    """
+
+    def __init__(self, workers: int = DEFAULT_WORKERS, cpu_time: float = DEFAULT_CPU_TIME,
+                 wall_time: float = DEFAULT_WALL_TIME, memory_mb: Optional[int] = DEFAULT_MEMORY_MB,
+                 max_tasks_per_worker: int = DEFAULT_MAX_TASKS_PER_WORKER,
+                 max_output: int = DEFAULT_MAX_OUTPUT, start_method: Optional[str] = None):
+        if start_method is None:
+            # forkserver forks from a clean single-threaded process, which is
+            # both fast and safe to use from a threaded web server.
+            methods = multiprocessing.get_all_start_methods()
+            start_method = "forkserver" if "forkserver" in methods else "spawn"
+        self._context = multiprocessing.get_context(start_method)
+        self.cpu_time = cpu_time
+        self.wall_time = wall_time
+        self.memory_bytes = memory_mb * 1024 * 1024 if memory_mb else None
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.max_output = max_output
+        self.respawned = 0
+        self._closed = False
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        for _ in range(workers):
+            self._idle.put(self._spawn())
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self._context, self.memory_bytes)
+
+    def run(self, code: str, kind: str = "exec", cpu_time: Optional[float] = None,
+            wall_time: Optional[float] = None, options: Optional[Dict] = None) -> Dict:
+        """
+        Runs `code` in a worker and returns the result dict. `kind` is "exec"
+        (run the snippet), "profile" (run it under call_profiler and add a
+        "profile" report), "memory" (run it under memory_tracker and add a
+        "memory" report) or "lines" (run it under hotspots.profile_lines and
+        add a "lines" report; `options` may set its "mode", "interval" and
+        "expected_time")
+        or "scaling" (run it, then add a complexity_estimator estimate of
+        `options["function_name"]` as "scaling"; `options` may set the
+        "make_input" kind name and the "estimate" keyword arguments),
+        "benchmark" (time it with benchmark_harness.benchmark, `options` as
+        its keyword arguments, and add the summary as "benchmark") or
+        "compare" (benchmark_harness.compare it against
+        `options["optimized_code"]` and add the result as "comparison").
+        Blocks while every worker is busy.
+        """
+        if self._closed:
+            raise RuntimeError("SandboxPool is closed")
+        if kind not in JOBS:
+            raise ValueError(f"Unknown job kind: {kind!r}")
+        cpu_time = self.cpu_time if cpu_time is None else cpu_time
+        wall_time = self.wall_time if wall_time is None else wall_time
+
+        worker = self._idle.get()
+        healthy = False
+        start = time.perf_counter()
+        try:
+            if not worker.wait_ready(wall_time):
+                return _failed_result("Sandbox worker failed to start", time.perf_counter() - start,
+                                      error_type="WorkerCrashed", crashed=True)
+            worker.conn.send((kind, code, options or {}, cpu_time, self.max_output))
+            worker.tasks += 1
+            if not worker.conn.poll(wall_time):
+                return _failed_result(f"Wall-clock limit of {wall_time:g}s exceeded",
+                                      time.perf_counter() - start, error_type="TimeoutError", timed_out=True)
+            try:
+                result = worker.conn.recv()
+            except (EOFError, OSError):
+                worker.process.join(1)
+                elapsed = time.perf_counter() - start
+                if resource is not None and worker.process.exitcode == -signal.SIGXCPU:
+                    return _failed_result(f"CPU time limit of {cpu_time:g}s exceeded", elapsed,
+                                          error_type="CPUTimeExceeded", cpu_exceeded=True)
+                return _failed_result(f"Sandbox worker died (exit code {worker.process.exitcode})",
+                                      elapsed, error_type="WorkerCrashed", crashed=True)
+            healthy = True
+            return result
+        finally:
+            if not healthy or worker.tasks >= self.max_tasks_per_worker or self._closed:
+                worker.kill()
+                if not self._closed:
+                    worker = self._spawn()
+                    self.respawned += 1
+            if not self._closed:
+                self._idle.put(worker)
+
+    def close(self) -> None:
+        self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().kill()
+            except queue.Empty:
+                return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+_default_pool: Optional[SandboxPool] = None
+_default_lock = threading.Lock()
+
+
+def default_pool() -> SandboxPool:
+    """
+    Process-wide SandboxPool with the default limits, started on first use.
+    """
+    global _default_pool
+    with _default_lock:
+        if _default_pool is None:
+            _default_pool = SandboxPool()
+            atexit.register(_default_pool.close)
+        return _default_pool
+
+
+def resolve_pool(sandbox) -> Optional[SandboxPool]:
+    """
+    Maps a `sandbox=` argument to a pool: a SandboxPool is used as is, True
+    means the default pool, and None/False means run in-process.
+    """
+    if isinstance(sandbox, SandboxPool):
+        return sandbox
+    return default_pool() if sandbox else None
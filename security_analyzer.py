@@ -1,55 +1,93 @@
 import ast
-from llm_handler import LLMAssistant
+import sys
+from neuro_symbolic_code_mentor.llm_cache import cached_assistant
+from neuro_symbolic_code_mentor.analysis_context import Checker, get_context, register_checker
+from neuro_symbolic_code_mentor.prompt_builder import matching_lines, slice_code
+from neuro_symbolic_code_mentor.streaming import echo, explain
+
+CREDENTIAL_PATTERNS = ("password=", "api_key=")
+
+@register_checker("security")
+class SecurityChecker(Checker):
+    """
+    AST part of the security analysis, run in the shared AnalysisContext pass.
+    Collects (lineno, message) findings.
+    """
+    def __init__(self):
+        self.findings = []
+
+    def visit_Call(self, node: ast.Call):
+        # detect usage of 'exec'
+        if isinstance(node.func, ast.Name) and node.func.id == 'exec':
+            self.findings.append((node.lineno, "Use of 'exec' can lead to code injection vulnerabilities."))
+
+    def result(self):
+        return self.findings
 
 class SecurityAnalyzer:
     """
     Day 13: Identify security vulnerabilities in code and explain them symbolically.
     E.g., usage of 'exec', or insecure random, or hardcoded credentials.
     """
-    def __init__(self, code):
+    def __init__(self, code, context=None):
         self.code = code
+        self.context = get_context(code, context)
         self.vulnerabilities = []
-        self.llm = LLMAssistant()
+        self.flagged_lines = []  # where the findings are, for the prompt slices
+        self._llm = None
+
+    @property
+    def llm(self):
+        # Created on first use so batch runs that only need the symbolic
+        # checks never construct an LLM client. Re-running on unchanged code
+        # is answered from the shared prompt cache.
+        if self._llm is None:
+            self._llm = cached_assistant()
+        return self._llm
 
     def analyze_security(self):
         try:
-            tree = ast.parse(self.code)
+            findings = self.context.result("security")
         except SyntaxError as e:
             self.vulnerabilities.append(f"SyntaxError: {str(e)}")
             return
 
-        # 1. detect usage of 'exec'
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == 'exec':
-                self.vulnerabilities.append("Use of 'exec' can lead to code injection vulnerabilities.")
+        # 1. detect usage of 'exec' (see SecurityChecker)
+        self.vulnerabilities.extend(message for _lineno, message in findings)
+        self.flagged_lines.extend(lineno for lineno, _message in findings)
 
         # 2. check for suspicious string patterns (like 'password=' or 'api_key=')
-        if "password=" in self.code or "api_key=" in self.code:
+        credential_lines = matching_lines(self.code, CREDENTIAL_PATTERNS)
+        if credential_lines:
             self.vulnerabilities.append("Hardcoded credentials found. This is a security risk.")
+            self.flagged_lines.extend(credential_lines)
 
         # 3. detect usage of random without seed in certain contexts
         # (just an example, real checks would be more complex)
 
-    def explain_vulnerabilities(self):
+    def explain_vulnerabilities(self, budget=None, stream=None):
         """
         Uses LLM to produce a short explanation for each vulnerability.
+        Only the flagged code and what it references is sent, within `budget`
+        tokens (see prompt_builder.slice_code). With `stream` (a file), the
+        explanation is written there as it is generated.
         """
         if not self.vulnerabilities:
-            return "No critical security vulnerabilities detected by symbolic analysis."
+            return echo("No critical security vulnerabilities detected by symbolic analysis.", stream)
 
         prompt = f"""
 We detected these possible security vulnerabilities:
 {self.vulnerabilities}
 
 Code:
-{self.code}
+{slice_code(self.code, lines=self.flagged_lines, budget=budget, context=self.context)}
 
 Explain each vulnerability briefly, referencing best security practices.
 """
-        return self.llm.generate_explanation(prompt)
+        return explain(self.llm, prompt, stream, label="explain_vulnerabilities")
 
-def run_security_analysis(code):
-    analyzer = SecurityAnalyzer(code)
+def run_security_analysis(code, context=None):
+    analyzer = SecurityAnalyzer(code, context)
     analyzer.analyze_security()
-    explanation = analyzer.explain_vulnerabilities()
-    print("\n=== Security Analysis ===\n", explanation)
+    print("\n=== Security Analysis ===\n")
+    analyzer.explain_vulnerabilities(stream=sys.stdout)
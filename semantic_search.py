@@ -1,46 +1,72 @@
 import ast
 from llm_handler import LLMAssistant
+from neuro_symbolic_code_mentor.analysis_context import Checker, get_context, register_checker
+from neuro_symbolic_code_mentor.symbol_index import SymbolIndex, format_hit
+
+@register_checker("symbols")
+class SymbolChecker(Checker):
+    """
+    Collects "Function: name" / "Class: name" summaries during the shared pass.
+    """
+    def __init__(self):
+        self.summaries = []
+
+    def visit_FunctionDef(self, node):
+        self.summaries.append(f"Function: {node.name}")
+
+    def visit_ClassDef(self, node):
+        self.summaries.append(f"Class: {node.name}")
+
+    def result(self):
+        return self.summaries
 
 class SemanticSearchEngine:
     """
     Day 16: Indexes code at an AST/semantic level, then uses LLM to interpret queries.
+
+    Queries are answered from a symbol_index.SymbolIndex ranked with BM25
+    (backend "keyword"), or from an embedding_search.EmbeddingIndex ranked by
+    cosine similarity (backend "vector"). It is built once from the code, or
+    pass `index` to search a persistent repository-wide index instead.
     """
-    def __init__(self, code):
+    def __init__(self, code, context=None, index=None, backend="keyword"):
         self.code = code
+        self.context = get_context(code, context)
         self.index = []
+        self.symbols = index
+        self.backend = backend
         self.assistant = LLMAssistant()
 
     def build_index(self):
         """
         Symbolically parse code, store function/class info. 
         """
-        tree = ast.parse(self.code)
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                summary = f"Function: {node.name}"
-                self.index.append(summary)
-            if isinstance(node, ast.ClassDef):
-                summary = f"Class: {node.name}"
-                self.index.append(summary)
-
-    def query_code(self, query):
+        self.index.extend(self.context.result("symbols"))
+        if self.symbols is None:
+            if self.backend == "vector":
+                from neuro_symbolic_code_mentor.embedding_search import EmbeddingIndex  # needs numpy
+                self.symbols = EmbeddingIndex()
+            else:
+                self.symbols = SymbolIndex()
+            self.symbols.add_source(self.code, "<input>", tree=self.context.tree)
+
+    def query_code(self, query, limit=10):
         """
-        Use an LLM to interpret the query, then do a simple match in self.index.
+        Use an LLM to interpret the query, then rank the indexed symbols
+        against the original and refined query.
         """
+        if self.symbols is None:
+            self.build_index()
+
         # Step 1: LLM helps refine query
         prompt = f"Refine this user query for code searching:\n{query}"
         refined = self.assistant.generate_explanation(prompt)
 
-        # Step 2: match refined text in index (naive approach)
-        results = []
-        for entry in self.index:
-            # simplistic partial match
-            if any(word.lower() in entry.lower() for word in refined.split()):
-                results.append(entry)
-        return results
+        # Step 2: ranked lookup in the index
+        return [format_hit(hit) for hit in self.symbols.search(f"{query} {refined}", limit)]
 
-def run_semantic_search(code, user_query):
-    engine = SemanticSearchEngine(code)
+def run_semantic_search(code, user_query, context=None, index=None, backend="keyword"):
+    engine = SemanticSearchEngine(code, context, index, backend)
     engine.build_index()
     results = engine.query_code(user_query)
     print("\n=== Semantic Search (Day 16) ===\n")
@@ -1,15 +1,58 @@
 import ast
-from llm_handler import LLMAssistant
+import sys
+from neuro_symbolic_code_mentor.llm_cache import cached_assistant
+from neuro_symbolic_code_mentor.analysis_context import Checker, get_context, register_checker
+from neuro_symbolic_code_mentor.prompt_builder import slice_code
+from neuro_symbolic_code_mentor.streaming import echo, explain
+
+BUILTIN_NAMES = {"print", "len", "range"}  # Expand as needed
+
+@register_checker("bugs")
+class BugChecker(Checker):
+    """
+    Symbolic bug rules, evaluated together in the shared AnalysisContext pass.
+    Collects (lineno, message) issues.
+    """
+    def __init__(self):
+        self.eval_calls = []
+        self.redefinitions = []
+
+    def visit_Call(self, node: ast.Call):
+        # 1. Check for 'eval'
+        if isinstance(node.func, ast.Name) and node.func.id == 'eval':
+            self.eval_calls.append((node.lineno, "Suspicious usage of 'eval' detected."))
+
+    def visit_FunctionDef(self, node: ast.FunctionDef):
+        # 2. Check for redefined built-ins
+        if node.name in BUILTIN_NAMES:
+            self.redefinitions.append((node.lineno, f"Redefining built-in function '{node.name}' can cause bugs."))
+
+    def result(self):
+        return self.eval_calls + self.redefinitions
+
+    def parts(self):
+        return [self.eval_calls, self.redefinitions]
 
 class StaticBugPredictor:
     """
     Day 12: Uses advanced symbolic rules + an LLM to highlight potential bugs
     before runtime.
     """
-    def __init__(self, code):
+    def __init__(self, code, context=None):
         self.code = code
+        self.context = get_context(code, context)
         self.issues = []
-        self.llm = LLMAssistant()
+        self.flagged_lines = []  # where the issues are, for the prompt slices
+        self._llm = None
+
+    @property
+    def llm(self):
+        # Created on first use so batch runs that only need the symbolic
+        # checks never construct an LLM client. Re-running on unchanged code
+        # is answered from the shared prompt cache.
+        if self._llm is None:
+            self._llm = cached_assistant()
+        return self._llm
 
     def analyze(self):
         """
@@ -19,30 +62,24 @@ class StaticBugPredictor:
         - detect unreachable code, etc.
         """
         try:
-            tree = ast.parse(self.code)
+            found = self.context.result("bugs")
         except SyntaxError as e:
             self.issues.append(f"SyntaxError: {str(e)}")
             return
 
-        # 1. Check for 'eval'
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == 'eval':
-                self.issues.append("Suspicious usage of 'eval' detected.")
-
-        # 2. Check for redefined built-ins
-        builtins = {"print", "len", "range"}  # Expand as needed
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef) and node.name in builtins:
-                self.issues.append(f"Redefining built-in function '{node.name}' can cause bugs.")
-
-        # More rules can be added here...
+        # All rules run in one traversal (see BugChecker); more rules can be added there...
+        self.issues.extend(message for _lineno, message in found)
+        self.flagged_lines.extend(lineno for lineno, _message in found)
 
-    def predict_buggy_sections(self):
+    def predict_buggy_sections(self, budget=None, stream=None):
         """
         Day 12 twist: pass the flagged issues to the LLM for further commentary or ranking.
+        The prompt carries only the flagged code and what it references,
+        within `budget` tokens (see prompt_builder.slice_code). With `stream`
+        (a file), the reply is written there as it is generated.
         """
         if not self.issues:
-            return "No potential bugs found via symbolic analysis."
+            return echo("No potential bugs found via symbolic analysis.", stream)
 
         prompt = f"""
 We found these symbolic code issues in the user's code:
@@ -50,12 +87,12 @@ We found these symbolic code issues in the user's code:
 
 Please rank them by severity and provide potential solutions.
 Code:
-{self.code}
+{slice_code(self.code, lines=self.flagged_lines, budget=budget, context=self.context)}
 """
-        return self.llm.generate_explanation(prompt)
+        return explain(self.llm, prompt, stream, label="predict_buggy_sections")
 
-def run_bug_prediction(code):
-    predictor = StaticBugPredictor(code)
+def run_bug_prediction(code, context=None):
+    predictor = StaticBugPredictor(code, context)
     predictor.analyze()
-    results = predictor.predict_buggy_sections()
-    print("\n=== Predicted Buggy Sections ===\n", results)
+    print("\n=== Predicted Buggy Sections ===\n")
+    predictor.predict_buggy_sections(stream=sys.stdout)
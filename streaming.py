@@ -0,0 +1,172 @@
+# neuro_symbolic_code_mentor/streaming.py
+
+import asyncio
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from collections import deque, namedtuple
+from typing import Dict, Iterable, Iterator, List, Optional
+
+# Latency of one streamed completion, in seconds: until the first chunk
+# (what the user waits for before anything appears) and until the last.
+StreamTiming = namedtuple("StreamTiming", ["label", "first_token", "total", "chunks", "chars"])
+
+# Timings of the latest streams run in this process, for reporting (see cli --timings).
+STREAM_TIMINGS: "deque[StreamTiming]" = deque(maxlen=1000)
+_DONE = object()
+
+# Set to 1 to stream replies of assistants that cannot stream themselves
+# (e.g. LLMAssistant) through AsyncLLMClient. That sends the prompt to the
+# OpenAI-compatible endpoint configured by OPENAI_API_KEY / OPENAI_BASE_URL /
+# OPENAI_MODEL instead of through the assistant, so it is off by default.
+STREAM_HTTP_ENV = "CODE_MENTOR_STREAM_HTTP"
+
+_CLIENTS: Dict[Optional[str], object] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def _streaming_client(model: Optional[str]):
+    """
+    Shared AsyncLLMClient used to stream for assistants that cannot, when
+    STREAM_HTTP_ENV is set (configured from the environment).
+    """
+    from neuro_symbolic_code_mentor.async_llm import AsyncLLMClient  # only needed to stream over HTTP
+
+    with _CLIENTS_LOCK:
+        if model not in _CLIENTS:
+            _CLIENTS[model] = AsyncLLMClient(model=model)
+        return _CLIENTS[model]
+
+
+def _iterate_async(agen) -> Iterator[str]:
+    """
+    Drives an async generator from a worker thread (with its own event
+    loop) and yields its items here as they arrive.
+    """
+    items: "queue.Queue" = queue.Queue()
+
+    async def pump():
+        try:
+            async for item in agen:
+                items.put(item)
+        except BaseException as e:  # re-raised in the consuming thread
+            items.put(e)
+        items.put(_DONE)
+
+    worker = threading.Thread(target=asyncio.run, args=(pump(),), name="llm-stream", daemon=True)
+    worker.start()
+    while True:
+        item = items.get()
+        if item is _DONE:
+            break
+        if isinstance(item, BaseException):
+            raise item
+        yield item
+    worker.join()
+
+
+def stream_explanation(assistant, prompt: str) -> Iterator[str]:
+    """
+    The completion for `prompt` as chunks of text, yielded as they arrive.
+    Works with any assistant: a stream_explanation method is used when the
+    assistant has one (an async generator for AsyncLLMClient). Otherwise
+    the whole generate_explanation result is one chunk, unless
+    STREAM_HTTP_ENV opts in to streaming the request through AsyncLLMClient
+    (with the assistant's model, when it names one).
+    """
+    stream = getattr(assistant, "stream_explanation", None)
+    if stream is None:
+        if os.environ.get(STREAM_HTTP_ENV, "0") in ("", "0"):
+            yield assistant.generate_explanation(prompt)
+            return
+        model = getattr(assistant, "model", None)
+        stream = _streaming_client(model if isinstance(model, str) else None).stream_explanation
+    chunks = stream(prompt)
+    if hasattr(chunks, "__anext__"):
+        yield from _iterate_async(chunks)
+    else:
+        yield from chunks
+
+
+class TimedStream:
+    """
+    Wraps a chunk iterator and measures it: time to the first non-empty
+    chunk and to the end, from when the wrapper was created (i.e. when the
+    request was made). The timing is appended to STREAM_TIMINGS once the
+    stream is exhausted.
+    """
+
+    def __init__(self, chunks: Iterable[str], label: str = "llm"):
+        self.chunks = iter(chunks)
+        self.label = label
+        self.started = time.perf_counter()
+        self.first_token: Optional[float] = None
+        self.total: Optional[float] = None
+        self.parts: List[str] = []
+
+    def __iter__(self) -> Iterator[str]:
+        for chunk in self.chunks:
+            if chunk and self.first_token is None:
+                self.first_token = time.perf_counter() - self.started
+            self.parts.append(chunk)
+            yield chunk
+        self.total = time.perf_counter() - self.started
+        STREAM_TIMINGS.append(self.timing())
+
+    @property
+    def text(self) -> str:
+        return "".join(self.parts)
+
+    def timing(self) -> StreamTiming:
+        return StreamTiming(self.label, self.first_token, self.total, len(self.parts), len(self.text))
+
+
+def explain(assistant, prompt: str, stream=None, label: str = "llm") -> str:
+    """
+    generate_explanation with optional streaming: when `stream` is a file
+    (e.g. sys.stdout) the chunks are written and flushed as they arrive.
+    Returns the full text either way.
+    """
+    if stream is None:
+        return assistant.generate_explanation(prompt)
+    timed = TimedStream(stream_explanation(assistant, prompt), label)
+    for chunk in timed:
+        stream.write(chunk)
+        stream.flush()
+    stream.write("\n")
+    return timed.text
+
+
+def echo(text: str, stream=None) -> str:
+    """
+    Returns `text`, also writing it to `stream` when given: for the fixed
+    replies of methods that otherwise stream through explain().
+    """
+    if stream is not None:
+        stream.write(text + "\n")
+        stream.flush()
+    return text
+
+
+def sse_event(data, event: Optional[str] = None) -> str:
+    """
+    One server-sent event; `data` is sent as JSON.
+    """
+    head = f"event: {event}\n" if event else ""
+    return f"{head}data: {json.dumps(data)}\n\n"
+
+
+def report_stream_timings(file=sys.stderr) -> None:
+    """
+    Prints the time to first token and total time of every stream so far.
+    """
+    if not STREAM_TIMINGS:
+        return
+    print("\n=== Streaming latency ===", file=file)
+    for timing in STREAM_TIMINGS:
+        first = f"{timing.first_token * 1000:8.1f} ms" if timing.first_token is not None else "       - ms"
+        print(f"  {timing.label:<32} first token {first}   total {timing.total * 1000:8.1f} ms"
+              f"   ({timing.chunks} chunks, {timing.chars} chars)", file=file)
@@ -1,27 +1,67 @@
 import re
+import tokenize
 from llm_handler import LLMAssistant
+from neuro_symbolic_code_mentor.pattern_scanner import required_literal
 
 STYLE_RULES = {
     r"^\s*def [a-zA-Z0-9_]+\(.*\):\s*#.*": "Avoid inline comments on function definition lines",
     # Add more PEP-8 or custom style rules...
 }
 
+def compile_rules(rules=None):
+    """
+    Precompiles a {pattern: note} table into (regex, note, required_literal)
+    entries. The literal is a substring every match must contain; lines
+    without it are skipped without running the regex.
+    """
+    table = []
+    for pattern, note in (STYLE_RULES if rules is None else rules).items():
+        regex = re.compile(pattern)
+        table.append((regex, note, required_literal(regex)))
+    return table
+
+COMPILED_RULES = compile_rules()
+
+def iter_violations(lines, rules=None):
+    """
+    Yields (line_no, stripped_line, note) for every rule hit, one line at a
+    time. `lines` can be any iterable of lines, e.g. an open file, so memory
+    use does not grow with the size of the input.
+    """
+    table = COMPILED_RULES if rules is None else rules
+    for number, line in enumerate(lines, 1):
+        line = line.rstrip("\r\n")
+        for regex, note, literal in table:
+            if literal and literal not in line:
+                continue
+            if regex.search(line):
+                yield (number, line.strip(), note)
+
+def check_file(path, rules=None):
+    """
+    Streams the violations of a source file without loading it into memory.
+    The encoding is detected the same way Python does (PEP 263 cookie / BOM).
+    """
+    with tokenize.open(path) as f:
+        yield from iter_violations(f, rules)
+
 class StyleEnforcer:
     """
-    Day 17: Checks code style with regex or symbolic rules, 
+    Day 17: Checks code style with regex or symbolic rules,
     then calls LLM for an explanation of each violation.
+
+    `code` is either a string or an iterable of lines (such as an open file);
+    an iterable is consumed on the first check.
     """
     def __init__(self, code):
-        self.code = code.splitlines()
+        self.code = code.splitlines() if isinstance(code, str) else code
         self.assistant = LLMAssistant()
 
+    def iter_violations(self):
+        return iter_violations(self.code)
+
     def check_style(self):
-        violations = []
-        for i, line in enumerate(self.code):
-            for pattern, note in STYLE_RULES.items():
-                if re.search(pattern, line):
-                    violations.append((i+1, line.strip(), note))
-        return violations
+        return list(self.iter_violations())
 
     def explain_violations(self, violations):
         if not violations:
@@ -0,0 +1,535 @@
+# neuro_symbolic_code_mentor/symbol_index.py
+
+import ast
+import hashlib
+import heapq
+import json
+import math
+import os
+import re
+import sqlite3
+import tempfile
+from array import array
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Iterator, List, Optional, Tuple
+
+INDEX_VERSION = 2
+DEFAULT_INDEX_DIR = os.path.join(os.path.expanduser("~"), ".cache", "neuro_symbolic_code_mentor", "index")
+
+# BM25 parameters (the usual defaults) and how many times a symbol's own name
+# counts compared with the words in its body and docstring.
+K1 = 1.2
+B = 0.75
+NAME_WEIGHT = 3
+
+_WORD = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+_IDENTIFIER_PART = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "if", "in", "is", "it", "of", "on",
+    "or", "the", "this", "that", "to", "with", "self", "cls", "none", "true", "false", "return", "returns",
+}
+
+_DEFINITIONS = (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
+
+
+@lru_cache(maxsize=1 << 16)
+def split_identifier(name: str) -> Tuple[str, ...]:
+    """
+    Lowercase search terms for an identifier: its camelCase / snake_case
+    parts plus, when it has several parts, the whole name.
+    "parseHTTPResponse" -> ("parse", "http", "response", "parsehttpresponse").
+    """
+    parts = [part.lower() for part in _IDENTIFIER_PART.findall(name)]
+    terms = [part for part in parts if len(part) > 1 and part not in STOP_WORDS]
+    whole = name.strip("_").lower()
+    if len(parts) > 1 and whole not in terms:
+        terms.append(whole)
+    return tuple(terms)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Search terms for free text (docstrings, queries).
+    """
+    return [term for word in _WORD.findall(text) for term in split_identifier(word)]
+
+
+def _module_name(path: str) -> str:
+    if path.startswith("<"):
+        return path
+    name = os.path.splitext(path)[0].replace(os.sep, ".").replace("/", ".")
+    return name[:-len(".__init__")] if name.endswith(".__init__") else name
+
+
+class _SymbolCollector:
+    """
+    Turns a module into one record per module, class, function and method.
+    Each record gets the terms of its own body only: nested definitions
+    become records of their own.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.records = []
+
+    def collect(self, tree: ast.Module, end_line: int) -> List[Dict]:
+        self._add(tree, "module", _module_name(self.path), 1, end_line)
+        return self.records
+
+    def _add(self, node, kind: str, name: str, line: int, end_line: int) -> None:
+        terms = Counter()
+        short_name = name.rsplit(".", 1)[-1]
+        for term in split_identifier(short_name):
+            terms[term] += NAME_WEIGHT
+        docstring = ast.get_docstring(node, clean=False)
+        if docstring:
+            terms.update(tokenize(docstring))
+        names = Counter()  # identifiers used in the body, split into terms once each
+        calls = []
+        record = {"path": self.path, "kind": kind, "name": name, "line": line, "end_line": end_line}
+        self.records.append(record)
+
+        stack = list(ast.iter_child_nodes(node))
+        while stack:
+            child = stack.pop()
+            if isinstance(child, _DEFINITIONS):
+                child_kind = "class" if isinstance(child, ast.ClassDef) else \
+                    ("method" if kind == "class" else "function")
+                qualname = child.name if kind == "module" else f"{name}.{child.name}"
+                start = min([child.lineno] + [d.lineno for d in child.decorator_list])
+                self._add(child, child_kind, qualname, start, child.end_lineno)
+                continue
+            if isinstance(child, ast.Name):
+                names[child.id] += 1
+            elif isinstance(child, ast.Attribute):
+                names[child.attr] += 1
+            elif isinstance(child, ast.arg):
+                names[child.arg] += 1
+            elif isinstance(child, ast.Call):
+                func = child.func
+                callee = func.id if isinstance(func, ast.Name) else getattr(func, "attr", None)
+                if callee:
+                    calls.append((callee, child.lineno))
+            stack.extend(ast.iter_child_nodes(child))
+
+        for identifier, count in names.items():
+            for term in split_identifier(identifier):
+                terms[term] += count
+        record["terms"] = dict(terms)
+        record["calls"] = sorted(calls, key=lambda call: call[1])
+
+
+class _StoredTable:
+    """
+    {key: list of ints} mapping kept in one table of the index database and
+    read one key at a time on first access, so opening an index does not
+    load all of it. A value is `parts` equally long lists (0: one list of
+    any length). Changed keys are written by SymbolIndex.save.
+    """
+
+    def __init__(self, name: str, parts: int = 0, values: Optional[Dict] = None):
+        self.name = name
+        self.parts = parts
+        self.loaded = values if values is not None else {}  # read or set so far; None: not stored
+        self.changed = set()
+        self.connection = None  # None: `loaded` is the whole table, not saved yet
+        self.stored = 0
+        self.added = 0
+
+    def attach(self, connection: sqlite3.Connection) -> None:
+        """
+        Marks the table as saved in (or loaded from) `connection`.
+        """
+        self.connection = connection
+        self.stored = connection.execute(f"SELECT COUNT(*) FROM {self.name}").fetchone()[0]
+        self.changed.clear()
+        self.added = 0
+
+    def get(self, key: str, default=None):
+        if key not in self.loaded:
+            row = None
+            if self.connection is not None:
+                row = self.connection.execute(f"SELECT value FROM {self.name} WHERE key = ?", (key,)).fetchone()
+            self.loaded[key] = self._decode(row[0]) if row else None
+        value = self.loaded[key]
+        return default if value is None else value
+
+    def setdefault(self, key: str, default):
+        """
+        dict.setdefault; the value is assumed to be modified afterwards.
+        """
+        value = self.get(key)
+        if value is None:
+            value = self.loaded[key] = default
+            self.added += 1
+        self.changed.add(key)
+        return value
+
+    def items(self) -> List[Tuple[str, List]]:
+        if self.connection is not None:
+            for key, blob in self.connection.execute(f"SELECT key, value FROM {self.name}"):
+                if key not in self.loaded:
+                    self.loaded[key] = self._decode(blob)
+        return [(key, value) for key, value in self.loaded.items() if value is not None]
+
+    def __len__(self) -> int:
+        if self.connection is None:
+            return sum(value is not None for value in self.loaded.values())
+        return self.stored + self.added
+
+    def rows(self, keys) -> Iterator[Tuple[str, bytes]]:
+        for key in keys:
+            value = self.loaded[key]
+            flat = [number for part in value for number in part] if self.parts else value
+            yield key, array("I", flat).tobytes()
+
+    def _decode(self, blob: bytes) -> List:
+        flat = array("I")
+        flat.frombytes(blob)
+        flat = flat.tolist()
+        if not self.parts:
+            return flat
+        size = len(flat) // self.parts
+        return [flat[i * size:(i + 1) * size] for i in range(self.parts)]
+
+
+class SymbolIndex:
+    """
+    Inverted index over the modules, classes, functions and methods of a
+    code base, ranked with BM25. Each symbol is indexed by its name (split on
+    camelCase and snake_case), its docstring, the identifiers in its body and
+    the functions it calls; call sites are kept separately for `callers`.
+
+    With `path`, the index is kept in that SQLite file, and `update(root)`
+    only re-parses files whose modification time and content hash changed,
+    so searches never parse anything. Opening it reads the file records and
+    the symbol list; postings and call sites are read a term at a time when
+    a search needs them, and save() writes only the terms that changed.
+
+    Symbols of removed or re-indexed files are only marked deleted (skipped
+    by searches) until they make up COMPACT_RATIO of the index, when the
+    postings are rewritten without them.
+    """
+
+    COMPACT_RATIO = 0.2
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.files = {}       # {path: {"mtime_ns", "size", "digest", "docs": [doc ids], "error"}}
+        self.docs = []        # doc id -> [path, kind, name, line, end_line], or None once deleted
+        self.lengths = []     # doc id -> weighted number of terms (0 once deleted)
+        self.postings = _StoredTable("postings", 2)  # {term: [[doc ids, ascending], [weighted term frequencies]]}
+        self.call_sites = _StoredTable("call_sites")  # {callee name: [doc id, line, doc id, line, ...]}
+        self.deleted = 0
+        self.call_site_count = 0  # call sites stored, deleted symbols' included until compact()
+        self._norms = None    # per-doc BM25 length normalization, rebuilt after changes
+        self._dirty = False
+        self._connection = None
+        if path and os.path.exists(path):
+            self._load()
+
+    # -- building --
+
+    def add_source(self, source: str, path: str, tree: Optional[ast.Module] = None) -> int:
+        """
+        Indexes (or re-indexes) one module's source under `path`. Pass an
+        already parsed `tree` to skip parsing. Returns the number of symbols.
+        Raises SyntaxError for invalid code.
+        """
+        tree = tree if tree is not None else ast.parse(source, filename=path)
+        self.remove_file(path)
+        records = _SymbolCollector(path).collect(tree, max(1, source.count("\n") + 1))
+        ids = [self._add_doc(record) for record in records]
+        self.files[path] = {"mtime_ns": None, "size": None, "digest": _digest(source), "docs": ids, "error": None}
+        return len(ids)
+
+    def _add_doc(self, record: Dict) -> int:
+        doc_id = len(self.docs)
+        terms = record["terms"]
+        self.docs.append([record["path"], record["kind"], record["name"], record["line"], record["end_line"]])
+        self.lengths.append(sum(terms.values()))
+        for term, frequency in terms.items():
+            postings = self.postings.setdefault(term, [[], []])
+            postings[0].append(doc_id)
+            postings[1].append(frequency)
+        for callee, line in record["calls"]:
+            self.call_sites.setdefault(callee, []).extend((doc_id, line))
+        self.call_site_count += len(record["calls"])
+        self._changed()
+        return doc_id
+
+    def remove_file(self, path: str) -> None:
+        entry = self.files.pop(path, None)
+        if entry is None:
+            return
+        for doc_id in entry["docs"]:
+            self.docs[doc_id] = None
+            self.lengths[doc_id] = 0
+        self.deleted += len(entry["docs"])
+        self._changed()
+        if self.deleted > self.COMPACT_RATIO * len(self.docs):
+            self.compact()
+
+    def compact(self) -> None:
+        """
+        Drops deleted symbols from the postings and call sites and renumbers
+        the remaining ones.
+        """
+        new_ids = {}
+        docs, lengths = [], []
+        for doc_id, doc in enumerate(self.docs):
+            if doc is not None:
+                new_ids[doc_id] = len(docs)
+                docs.append(doc)
+                lengths.append(self.lengths[doc_id])
+        postings = {}
+        for term, (ids, frequencies) in self.postings.items():
+            kept = [(new_ids[doc_id], f) for doc_id, f in zip(ids, frequencies) if doc_id in new_ids]
+            if kept:
+                postings[term] = [[doc_id for doc_id, _f in kept], [f for _doc_id, f in kept]]
+        call_sites = {}
+        for callee, sites in self.call_sites.items():
+            kept = [value for i in range(0, len(sites), 2) if sites[i] in new_ids
+                    for value in (new_ids[sites[i]], sites[i + 1])]
+            if kept:
+                call_sites[callee] = kept
+        for entry in self.files.values():
+            entry["docs"] = [new_ids[doc_id] for doc_id in entry["docs"]]
+        self.docs, self.lengths = docs, lengths
+        self.postings = _StoredTable("postings", 2, postings)
+        self.call_sites = _StoredTable("call_sites", 0, call_sites)
+        self.call_site_count = sum(len(sites) for sites in call_sites.values()) // 2
+        self.deleted = 0
+        self._changed()
+
+    def _changed(self) -> None:
+        self._norms = None
+        self._dirty = True
+
+    def update(self, root: str, save: bool = True) -> Dict[str, int]:
+        """
+        Brings the index up to date with every .py file under `root` (paths
+        are stored relative to it): new and edited files are parsed, deleted
+        ones dropped. A file is only read when its mtime or size changed and
+        only re-parsed when its content hash changed too. Saves the index
+        afterwards when it has a path. Returns counts per outcome.
+        """
+        counts = {"added": 0, "updated": 0, "unchanged": 0, "removed": 0, "errors": 0}
+        seen = set()
+        for path, source, digest, stat in scan_sources(root, self.files, counts, seen):
+            if source is not None:
+                try:
+                    self.add_source(source, path)
+                except (SyntaxError, ValueError) as e:
+                    counts["errors"] += 1
+                    self.remove_file(path)
+                    self.files[path] = {"docs": [], "error": f"{type(e).__name__}: {e}"}
+            self.files[path].update(mtime_ns=stat.st_mtime_ns, size=stat.st_size, digest=digest)
+            self._dirty = True
+        for path in [path for path in self.files if path not in seen]:
+            self.remove_file(path)
+            counts["removed"] += 1
+        if save and self.path:
+            self.save()
+        return counts
+
+    # -- querying --
+
+    def _norm_table(self) -> List[Optional[float]]:
+        if self._norms is None:
+            live = len(self.docs) - self.deleted
+            average_length = (sum(self.lengths) / live) if live else 1.0
+            self._norms = [K1 * (1 - B + B * length / average_length) if doc is not None else None
+                           for doc, length in zip(self.docs, self.lengths)]
+        return self._norms
+
+    def search(self, query: str, limit: int = 10, kinds: Optional[List[str]] = None) -> List[Dict]:
+        """
+        The `limit` best symbols for `query` by BM25 score:
+        [{"name", "kind", "path", "line", "end_line", "score"}], best first.
+        `kinds` restricts results, e.g. ["function", "method"].
+        """
+        terms = set(tokenize(query))
+        count = len(self.docs) - self.deleted
+        if not terms or not count:
+            return []
+        norms = self._norm_table()
+        scores = {}
+        for term in terms:
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            ids, frequencies = postings
+            # Document frequency still counts deleted symbols until compact().
+            df = min(len(ids), count)
+            weight = math.log(1 + (count - df + 0.5) / (df + 0.5)) * (K1 + 1)
+            get = scores.get
+            for doc_id, frequency in zip(ids, frequencies):
+                norm = norms[doc_id]
+                if norm is not None:
+                    scores[doc_id] = get(doc_id, 0.0) + weight * frequency / (frequency + norm)
+        if kinds:
+            scores = {doc_id: score for doc_id, score in scores.items() if self.docs[doc_id][1] in kinds}
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [self._hit(doc_id, score) for doc_id, score in best]
+
+    def callers(self, name: str) -> List[Dict]:
+        """
+        Call sites of functions or methods called `name`:
+        [{"path", "line", "caller"}] in index order.
+        """
+        sites = self.call_sites.get(name, [])
+        return [{"path": self.docs[doc_id][0], "line": line, "caller": self.docs[doc_id][2]}
+                for doc_id, line in zip(sites[::2], sites[1::2]) if self.docs[doc_id] is not None]
+
+    def _hit(self, doc_id: int, score: float) -> Dict:
+        path, kind, name, line, end_line = self.docs[doc_id]
+        return {"name": name, "kind": kind, "path": path, "line": line, "end_line": end_line,
+                "score": round(score, 4)}
+
+    def stats(self) -> Dict[str, int]:
+        return {"files": len(self.files), "symbols": len(self.docs) - self.deleted, "terms": len(self.postings),
+                "call_sites": self.call_site_count}
+
+    # -- persistence --
+
+    def save(self) -> None:
+        """
+        Writes the changes to `path` in one transaction (skipped when nothing
+        changed). A new index file is written whole and moved into place.
+        """
+        if not self.path or not self._dirty:
+            return
+        state = json.dumps({"version": INDEX_VERSION, "files": self.files, "docs": self.docs,
+                            "lengths": self.lengths, "deleted": self.deleted,
+                            "call_sites": self.call_site_count}, separators=(",", ":"))
+        tables = (self.postings, self.call_sites)
+        if self._connection is None:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+            os.close(fd)
+            try:
+                connection = sqlite3.connect(tmp_path)
+                try:
+                    connection.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+                    for table in tables:
+                        connection.execute(f"CREATE TABLE {table.name} (key TEXT PRIMARY KEY, value BLOB) WITHOUT ROWID")
+                    self._write(connection, state, tables)
+                finally:
+                    connection.close()
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                _remove_quietly(tmp_path)
+                raise
+            self._connection = sqlite3.connect(self.path)
+        else:
+            self._write(self._connection, state, tables)
+        for table in tables:
+            table.attach(self._connection)
+        self._dirty = False
+
+    @staticmethod
+    def _write(connection: sqlite3.Connection, state: str, tables) -> None:
+        with connection:  # one transaction
+            connection.execute("INSERT OR REPLACE INTO meta VALUES ('state', ?)", (state,))
+            for table in tables:
+                if table.connection is None:  # new or compacted: rewrite it whole
+                    connection.execute(f"DELETE FROM {table.name}")
+                    keys = [key for key, _value in table.items()]
+                else:
+                    keys = [key for key in table.changed if table.loaded[key] is not None]
+                connection.executemany(f"INSERT OR REPLACE INTO {table.name} VALUES (?, ?)", table.rows(keys))
+
+    def _load(self) -> None:
+        connection = sqlite3.connect(self.path)
+        try:
+            state = json.loads(connection.execute("SELECT value FROM meta WHERE key = 'state'").fetchone()[0])
+            if state["version"] != INDEX_VERSION:
+                connection.close()
+                return
+            loaded = (state["files"], state["docs"], state["lengths"], state["deleted"], state["call_sites"])
+            for table in (self.postings, self.call_sites):
+                table.attach(connection)
+        except (sqlite3.Error, ValueError, KeyError, TypeError):
+            connection.close()
+            self.postings, self.call_sites = _StoredTable("postings", 2), _StoredTable("call_sites")
+            return  # unreadable or outdated index: start over, the next save replaces it
+        self.files, self.docs, self.lengths, self.deleted, self.call_site_count = loaded
+        self._connection = connection
+
+
+def scan_sources(root: str, files: Dict[str, Dict], counts: Dict[str, int],
+                 seen: set) -> Iterator[Tuple[str, Optional[str], str, os.stat_result]]:
+    """
+    Compares the .py files under `root` with an index's `files` records
+    ({path relative to root: {"mtime_ns", "size", "digest", ...}}) and yields
+    (path, source, digest, stat) for every new or edited file, with source
+    None when only the mtime changed. A file is only read when its mtime or
+    size changed. Tallies "added", "updated", "unchanged" and "errors" in
+    `counts` and adds every path found to `seen`.
+    """
+    # Imported here: the review modules it lives with are not needed to search.
+    from neuro_symbolic_code_mentor.repo_review import iter_python_files
+
+    for full_path in iter_python_files(root):
+        path = os.path.relpath(full_path, root) if os.path.isdir(root) else os.path.basename(full_path)
+        seen.add(path)
+        entry = files.get(path)
+        try:
+            stat = os.stat(full_path)
+            if entry and entry.get("mtime_ns") == stat.st_mtime_ns and entry.get("size") == stat.st_size:
+                counts["unchanged"] += 1
+                continue
+            with open(full_path, "rb") as f:
+                source = f.read().decode("utf-8", "surrogateescape")
+        except OSError:
+            counts["errors"] += 1
+            continue
+        digest = _digest(source)
+        if entry and entry.get("digest") == digest:
+            counts["unchanged"] += 1
+            yield path, None, digest, stat
+        else:
+            counts["updated" if entry else "added"] += 1
+            yield path, source, digest, stat
+
+
+def _digest(source: str) -> str:
+    return hashlib.sha256(source.encode("utf-8", "surrogateescape")).hexdigest()
+
+
+def _remove_quietly(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def default_index_path(root: str) -> str:
+    """
+    Where the index of `root` is kept unless told otherwise: one file per
+    repository under ~/.cache/neuro_symbolic_code_mentor/index.
+    """
+    root = os.path.abspath(root)
+    name = hashlib.sha256(root.encode("utf-8", "surrogateescape")).hexdigest()[:16]
+    return os.path.join(DEFAULT_INDEX_DIR, f"{os.path.basename(root) or 'root'}-{name}.sqlite")
+
+
+def format_hit(hit: Dict) -> str:
+    return f"{hit['kind'].capitalize()}: {hit['name']} ({hit['path']}:{hit['line']}, score {hit['score']:.2f})"
+
+
+def run_symbol_search(root: str, query: str, index_path: Optional[str] = None, limit: int = 10) -> None:
+    index = SymbolIndex(index_path or default_index_path(root))
+    counts = index.update(root)
+    print("\n=== Symbol Search ===\n")
+    print(f"Index: {index.stats()['symbols']} symbols in {len(index.files)} files "
+          f"({counts['added'] + counts['updated']} files re-indexed)")
+    hits = index.search(query, limit)
+    if hits:
+        for hit in hits:
+            print(" -", format_hit(hit))
+    else:
+        print("No matches found.")
@@ -0,0 +1,56 @@
+import ast
+import pytest
+from neuro_symbolic_code_mentor.analysis_context import AnalysisContext, Checker
+from neuro_symbolic_code_mentor.complexity import analyze_complexity
+
+CODE = """
+def outer(x):
+    if x:
+        return 1
+    for i in range(x):
+        pass
+
+class Foo:
+    def method(self):
+        while True:
+            break
+"""
+
+def test_parses_once_and_runs_one_pass():
+    ctx = AnalysisContext(CODE)
+    assert analyze_complexity(CODE, ctx) == {"outer": 3, "method": 2}
+    assert ctx.result("function_names") == ["outer", "method"]
+    assert ctx.parse_count == 1
+    assert ctx.pass_count == 1
+
+def test_enter_and_leave_hooks_in_source_order():
+    class Recorder(Checker):
+        def __init__(self):
+            self.events = []
+        def visit_FunctionDef(self, node):
+            self.events.append(("enter", node.name))
+        def leave_FunctionDef(self, node):
+            self.events.append(("leave", node.name))
+        def result(self):
+            return self.events
+
+    ctx = AnalysisContext(CODE)
+    results = ctx.run({"recorder": Recorder()})
+    assert results["recorder"] == [
+        ("enter", "outer"), ("leave", "outer"),
+        ("enter", "method"), ("leave", "method"),
+    ]
+
+def test_syntax_error_is_cached():
+    ctx = AnalysisContext("def broken(:\n")
+    for _ in range(2):
+        with pytest.raises(SyntaxError):
+            ctx.result("complexity")
+    assert ctx.parse_count == 1
+
+def test_take_tree_reparses_on_next_read():
+    ctx = AnalysisContext(CODE)
+    taken = ctx.take_tree()
+    assert isinstance(taken, ast.Module)
+    assert ctx.tree is not taken
+    assert ctx.parse_count == 2
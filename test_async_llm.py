@@ -0,0 +1,113 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from neuro_symbolic_code_mentor.async_llm import AsyncLLMClient, LLMRequestError, explain_many
+from neuro_symbolic_code_mentor.streaming import stream_explanation
+
+class StubCompletions(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_POST(self):
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            fail = server.failures > 0
+            server.failures -= 1 if fail else 0
+        time.sleep(0.02)
+        with server.lock:
+            server.in_flight -= 1
+        if not fail and body.get("stream"):
+            return self.stream_reply(body["messages"][0]["content"])
+        if fail:
+            payload, status = b"{}", 503
+        else:
+            prompt = body["messages"][0]["content"]
+            payload = json.dumps({"choices": [{"message": {"content": f"echo: {prompt}"}}]}).encode()
+            status = 200
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def stream_reply(self, prompt):
+        # Server-sent events, one chunk per word, in a chunked response
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        events = [{"choices": [{"delta": {"content": word}}]} for word in ["echo:", " ", prompt]]
+        for data in [json.dumps(e) for e in events] + ["[DONE]"]:
+            event = f"data: {data}\n\n".encode()
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(event), event))
+            self.wfile.flush()
+            time.sleep(0.01)
+        self.wfile.write(b"0\r\n\r\n")
+
+    def log_message(self, *args):
+        pass
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubCompletions)
+    server.lock = threading.Lock()
+    server.requests = server.in_flight = server.max_in_flight = server.failures = 0
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+
+def make_client(server, **kwargs):
+    return AsyncLLMClient(base_url=f"http://127.0.0.1:{server.server_port}/v1", api_key="test", **kwargs)
+
+def test_fan_out_respects_concurrency_and_reuses_connections(stub_server):
+    client = make_client(stub_server, max_concurrency=3)
+    prompts = [f"p{i}" for i in range(12)]
+    assert explain_many(client, prompts) == [f"echo: p{i}" for i in range(12)]
+    assert stub_server.max_in_flight <= 3
+    assert client.pool.created <= 3
+
+def test_retries_with_backoff(stub_server):
+    stub_server.failures = 2
+    client = make_client(stub_server, max_retries=3, backoff=0.01)
+    assert explain_many(client, ["hello"]) == ["echo: hello"]
+    assert stub_server.requests == 3
+
+def test_gives_up_after_max_retries(stub_server):
+    stub_server.failures = 10
+    client = make_client(stub_server, max_retries=1, backoff=0.01)
+    with pytest.raises(LLMRequestError):
+        explain_many(client, ["hello"])
+
+def test_fan_out_over_sync_assistant():
+    class SyncAssistant:
+        def generate_explanation(self, prompt):
+            time.sleep(0.05)
+            return prompt.upper()
+
+    start = time.perf_counter()
+    assert explain_many(SyncAssistant(), ["a", "b", "c", "d"]) == ["A", "B", "C", "D"]
+    assert time.perf_counter() - start < 0.15
+
+def test_stream_explanation_over_sse(stub_server):
+    stub_server.failures = 1
+    client = make_client(stub_server, backoff=0.01)
+    assert list(stream_explanation(client, "hi")) == ["echo:", " ", "hi"]
+    assert list(stream_explanation(client, "again")) == ["echo:", " ", "again"]
+    assert client.pool.created == 1  # the drained stream's connection was reused
+
+def test_fan_out_inside_a_running_loop():
+    class SyncAssistant:
+        def generate_explanation(self, prompt):
+            return prompt.upper()
+
+    async def handler():
+        return explain_many(SyncAssistant(), ["a", "b"])
+
+    assert asyncio.run(handler()) == ["A", "B"]
@@ -0,0 +1,30 @@
+import pytest
+from neuro_symbolic_code_mentor.benchmark_harness import (
+    benchmark, compare, format_comparison, mann_whitney_u, module_runner, summarize,
+)
+
+def test_summarize_is_robust_to_outliers():
+    summary = summarize([1.0, 1.1, 0.9, 1.0, 50.0])
+    assert summary["median"] == 1.0
+    assert summary["iqr"] == pytest.approx(0.1)
+    assert summary["ci_low"] <= summary["median"] <= summary["ci_high"]
+
+def test_mann_whitney():
+    _u, p_separated = mann_whitney_u([1, 2, 3, 4, 5, 6], [7, 8, 9, 10, 11, 12])
+    _u, p_mixed = mann_whitney_u([1, 3, 5, 7, 9, 11], [2, 4, 6, 8, 10, 12])
+    assert p_separated < 0.01
+    assert p_mixed > 0.5
+
+def test_benchmark_calibrates_loop_count():
+    result = benchmark("sum(range(100))", repeat=5, warmup=1, sample_time=0.002)
+    assert result["number"] > 1
+    assert result["samples"] == 5
+    assert 0 < result["median"] < 0.002
+
+def test_compare_detects_real_speedup():
+    slow = module_runner("s = 0\nfor i in range(3000):\n    s += i")
+    fast = module_runner("s = sum(range(3000))")
+    result = compare(slow, fast, repeat=10, warmup=1, sample_time=0.002)
+    assert result["significant"]
+    assert result["speedup"] > 1
+    assert "faster" in format_comparison(result)
@@ -0,0 +1,40 @@
+import json
+import pytest
+from neuro_symbolic_code_mentor.call_profiler import format_profile, profile_code
+
+CODE = """
+def fib(n):
+    return n if n < 2 else fib(n - 1) + fib(n - 2)
+
+def work():
+    return [fib(12) for _ in range(5)]
+
+work()
+"""
+
+def test_per_function_stats():
+    report = profile_code(CODE)
+    assert report["error"] is None
+    by_name = {f["function"]: f for f in report["functions"]}
+    fib = by_name["fib (line 2)"]
+    assert fib["primitive_calls"] == 5
+    assert fib["calls"] > fib["primitive_calls"]  # recursive calls
+    assert by_name["work (line 5)"]["cumulative_time"] >= fib["cumulative_time"] - 1e-6
+    json.dumps(report)
+
+def test_hot_path_leads_to_hot_function():
+    report = profile_code(CODE)
+    path = report["hot_paths"][0]["path"]
+    assert path[0] == "<module> (line 1)"
+    assert path[-1] == "fib (line 2)"
+    assert "work (line 5)" in path
+
+def test_runtime_error_is_reported():
+    report = profile_code("x = 1\nraise ValueError('boom')")
+    assert report["error"] == "ValueError: boom"
+    assert "Runtime Error during profiling: ValueError: boom" in format_profile(report)
+
+def test_syntax_error_is_reported():
+    report = profile_code("def f(:\n  pass")
+    assert report["error"].startswith("SyntaxError: invalid syntax")
+    assert report["functions"] == [] and report["hot_paths"] == []
@@ -0,0 +1,40 @@
+import os
+import subprocess
+import sys
+import pytest
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+def run_cli(*flags, stdin=""):
+    script = (
+        "import sys, cli\n"
+        "cli.main(sys.argv[1:])\n"
+        "print('LOADED', ' '.join(sorted(sys.modules)))\n"
+    )
+    return subprocess.run([sys.executable, "-c", script, *flags], input=stdin, capture_output=True,
+                          text=True, cwd=HERE, env=os.environ.copy(), check=True)
+
+def test_complexity_imports_only_what_it_needs():
+    result = run_cli("--complexity", "--timings", stdin="def f(x):\n    return x\nEND\n")
+    assert "COMPLEXITY=1" in result.stdout
+    loaded = result.stdout.split("LOADED", 1)[1].split()
+    for heavy in ("llm_handler", "transformers", "astor", "dotenv", "mentor", "refactor"):
+        assert heavy not in loaded
+    assert "import complexity" in result.stderr
+
+def test_every_flag_is_registered():
+    import cli
+    flags = {action.option_strings[0] for action in cli.build_parser()._actions if action.option_strings}
+    assert {cmd.flag for cmd in cli.COMMANDS} <= flags
+    assert len({cmd.flag for cmd in cli.COMMANDS}) == len(cli.COMMANDS)
+
+def test_debug_runs_the_code_in_the_sandbox():
+    result = run_cli("--debug", stdin="import os\nos._exit(3)\nEND\n")
+    assert "WorkerCrashed" in result.stdout and "LOADED" in result.stdout
+    result = run_cli("--debug", "--no-sandbox", stdin="d = {}\nd['missing']\nEND\n")
+    assert "KeyError" in result.stdout
+
+def test_vectorize_reports_rewrites():
+    result = run_cli("--vectorize", stdin="total = 0\nfor x in xs:\n    total += 1 / x\nEND\n")
+    assert "Loop at line 2 (reduction) can be vectorized" in result.stdout
+    assert "UNSAFE: divides by xs_array" in result.stdout
@@ -6,3 +6,45 @@ def test_optimize_loops():
     opt = CodeOptimizer(code)
     loops = opt.analyze_loops()
     assert loops == 1, "Expected to find exactly 1 loop."
+
+def test_loop_performance_findings():
+    code = """
+def dedupe(items):
+    seen = []
+    out = ""
+    for x in items:
+        if x not in seen:
+            seen.append(x)
+        out += str(x)
+    return out
+
+def pairs(a):
+    for i in range(len(a)):
+        for j in range(i + 1, len(a)):
+            b = sorted(a)
+    squares = []
+    for x in a:
+        squares.append(a.index(x))
+    return squares
+"""
+    report = CodeOptimizer(code).analyze_performance()
+    depths = {entry["function"]: entry["max_loop_depth"] for entry in report["functions"]}
+    assert depths == {"dedupe": 1, "pairs": 2}
+    found = {(finding["line"], finding["kind"]): finding["cost"] for finding in report["findings"]}
+    assert found == {
+        (6, "list_membership"): "O(n^2)",
+        (8, "string_concat"): "O(n^2)",
+        (13, "loop_header"): "O(n)",
+        (14, "sort_in_loop"): "O(n^3 log n)",
+        (16, "append_loop"): "O(n)",
+        (17, "list_index"): "O(n^2)",
+    }
+
+def test_loop_iterable_runs_once():
+    report = CodeOptimizer("for x in sorted(data):\n    print(x)").analyze_performance()
+    assert report["findings"] == []
+
+def test_vectorize_loops():
+    found = CodeOptimizer("out = []\nfor x in xs:\n    out.append(x + 0.5)\n").vectorize_loops()
+    assert [(entry["line"], entry["kind"]) for entry in found] == [(2, "map")]
+    assert found[0]["safety"]["safe"]
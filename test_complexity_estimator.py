@@ -0,0 +1,38 @@
+import pytest
+from neuro_symbolic_code_mentor.complexity_estimator import classify, estimate_complexity, format_estimate
+
+def test_classify_synthetic_timings():
+    sizes = [2 ** k for k in range(3, 14)]
+    assert classify(sizes, [1e-6 * n for n in sizes])["complexity"] == "O(n)"
+    assert classify(sizes, [1e-9 * n * n + 1e-6 for n in sizes])["complexity"] == "O(n^2)"
+    assert classify(sizes, [2e-6 for n in sizes])["complexity"] == "O(1)"
+    small = list(range(4, 20, 2))
+    assert classify(small, [1e-7 * 1.6 ** n for n in small])["complexity"] == "O(2^n)"
+
+def test_estimates_linear_function():
+    result = estimate_complexity(sum, max_size=2 ** 14)
+    assert result["complexity"] in ("O(n)", "O(n log n)")
+    assert result["r2"] > 0.9
+    assert "Measured scaling" in format_estimate(result)
+
+def test_estimates_in_place_quadratic_function():
+    def selection_sort(a):
+        for i in range(len(a)):
+            for j in range(i + 1, len(a)):
+                if a[j] < a[i]:
+                    a[i], a[j] = a[j], a[i]
+    assert estimate_complexity(selection_sort, time_limit=0.02)["complexity"] == "O(n^2)"
+
+def test_reports_failures():
+    result = estimate_complexity(lambda a: a[100], max_size=64)
+    assert result["complexity"] is None and "IndexError" in result["error"]
+    with pytest.raises(ValueError):
+        estimate_complexity(len, "matrix")
+
+def test_call_that_does_not_return_stops_the_estimate():
+    def spin(a):
+        while len(a) > 16:
+            pass
+    result = estimate_complexity(spin, call_timeout=0.2)
+    assert result["complexity"] is None and "CallTimeout at n=32" in result["error"]
+    assert [point["n"] for point in result["measurements"]] == [8, 16]
@@ -0,0 +1,62 @@
+import pytest
+import code_optimizer  # registers the "data_structures" checker
+from neuro_symbolic_code_mentor.analysis_context import AnalysisContext
+from neuro_symbolic_code_mentor.data_structure_advisor import benchmark_code, measure, recommend
+
+CODE = """
+def bfs(graph, start):
+    queue = [start]
+    visited = []
+    while queue:
+        node = queue.pop(0)
+        if node in visited:
+            continue
+        visited.append(node)
+        for nxt in graph[node]:
+            queue.append(nxt)
+    return visited
+
+def ranks(items):
+    ordered = []
+    for x in items:
+        ordered.append(x)
+        ordered.sort()
+    return [ordered.index(x) for x in items]
+
+def halves(n):
+    samples = []
+    for i in range(n):
+        samples.append(i / 2)
+    return samples
+"""
+
+def usage():
+    return AnalysisContext(CODE).result("data_structures")
+
+def test_usage_records():
+    records = {record["name"]: record for record in usage()}
+    assert records["queue"]["ops_in_loop"] == {"pop_front": 1, "append": 1}
+    assert records["visited"]["ops_in_loop"] == {"membership": 1, "append": 1}
+    assert records["visited"]["ops"]["escape"] == 1  # returned, in BFS order
+    assert records["samples"]["numeric"] and not records["queue"]["numeric"]
+
+def test_recommendations():
+    found = {(rec["name"], rec["replacement"]) for rec in recommend(usage())}
+    assert found == {("queue", "collections.deque"), ("visited", "set"), ("ordered", "dict"),
+                     ("ordered", "bisect"), ("samples", "array.array")}
+
+def test_order_dependent_uses_keep_the_list():
+    code = ("def f(g):\n    order = []\n    for n in g:\n        if n not in order:\n            order.append(n)\n"
+            "    return order\n\n"
+            "def h(g):\n    seen = []\n    for n in g:\n        if n not in seen:\n            seen.append(n)\n"
+            "    return len(seen)\n")
+    patterns = {rec["name"]: rec["pattern"] for rec in recommend(AnalysisContext(code).result("data_structures"))}
+    assert patterns == {"order": "set_alongside", "seen": "set_dedupe"}
+
+def test_micro_benchmark_shows_speedup():
+    rec = next(rec for rec in recommend(usage()) if rec["name"] == "visited")
+    assert rec["pattern"] == "set_alongside"
+    code = benchmark_code(rec, size=500)
+    assert "seen.add(v)" in code["after"] and "range(500)" in code["setup"]
+    result = measure(rec, size=500, repeat=5)
+    assert result["significant"] and result["speedup"] > 2
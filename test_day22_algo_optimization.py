@@ -1,5 +1,6 @@
 import pytest
 from day22_algo_optimization import AlgorithmOptimizer
+from neuro_symbolic_code_mentor.sandbox import SandboxPool
 
 def test_analyze_algorithms():
     code = """
@@ -12,3 +13,23 @@ def bubble_sort(arr):
     ao = AlgorithmOptimizer(code)
     pattern = ao.analyze_algorithms()
     assert "bubble sort" in pattern.lower()
+    assert "O(n^2)" in pattern
+    assert ao.function_name == "bubble_sort"
+
+def test_no_function_to_measure():
+    ao = AlgorithmOptimizer("x = [3, 1, 2]\nx.sort()")
+    assert ao.analyze_algorithms() == "No recognized algorithm pattern"
+
+def test_measure_failures_are_reported():
+    ao = AlgorithmOptimizer("def f(a):\n    while True:\n        pass")
+    assert "No function named 'g'" in ao.measure_scaling("g")["error"]
+    assert "CallTimeout" in ao.measure_scaling(call_timeout=0.2)["error"]
+    assert "Could not measure f" in ao.analyze_algorithms("f", "matrix")
+
+def test_measure_in_sandbox():
+    with SandboxPool(workers=1) as pool:
+        ao = AlgorithmOptimizer("def total(a):\n    return sum(a)", sandbox=pool)
+        assert ao.measure_scaling(max_size=2 ** 12)["complexity"] in ("O(n)", "O(n log n)")
+        assert "NameError" in ao.measure_scaling("missing")["error"]
+        ao = AlgorithmOptimizer("def f(a):\n    while True:\n        pass", sandbox=pool)
+        assert "CallTimeout" in ao.measure_scaling(call_timeout=0.2)["error"]
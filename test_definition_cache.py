@@ -0,0 +1,71 @@
+from neuro_symbolic_code_mentor.analysis_context import AnalysisContext
+from neuro_symbolic_code_mentor import definition_cache
+from neuro_symbolic_code_mentor.definition_cache import analyze_definitions, incremental_context
+from neuro_symbolic_code_mentor.result_cache import ResultCache
+from neuro_symbolic_code_mentor.security_analyzer import SecurityAnalyzer
+
+CODE = """import os
+
+def f(x):
+    if x:
+        exec(x)
+    return x
+
+class C:
+    def m(self):
+        for i in range(3):
+            eval(i)
+
+def print():
+    pass
+"""
+
+def whole_module(code):
+    context = AnalysisContext(code)
+    return {name: context.result(name) for name in ("complexity", "bugs", "security")}
+
+def test_matches_whole_module_analysis():
+    analysis = analyze_definitions(CODE, ResultCache())
+    assert analysis["results"] == whole_module(CODE)
+    assert analysis["reanalyzed"] == ["<module:1>", "f", "C", "print"]
+    # Whole-module order: every eval() finding, then every redefinition.
+    code = "def print():\n    pass\n\ndef g():\n    eval('1')\n"
+    assert analyze_definitions(code, ResultCache())["results"] == whole_module(code)
+
+def test_only_changed_definitions_are_reanalyzed():
+    cache = ResultCache()
+    analyze_definitions(CODE, cache)
+    assert analyze_definitions(CODE, cache)["reanalyzed"] == []
+
+    edited = CODE.replace("    return x\n", "    while x:\n        x -= 1\n    return x\n")
+    analysis = analyze_definitions(edited, cache)
+    assert analysis["reanalyzed"] == ["f"]
+    # C and print() moved down two lines; their cached findings follow them.
+    assert analysis["results"] == whole_module(edited)
+
+def test_falls_back_to_exact_split():
+    code = "def g():\n    return max(\n1, 2)\n\ndef h():\n    eval('1')\n"
+    assert analyze_definitions(code, ResultCache())["results"] == whole_module(code)
+
+def test_incremental_context_feeds_analyzers():
+    cache = ResultCache()
+    context = incremental_context(CODE, cache)
+    analyzer = SecurityAnalyzer(CODE, context)
+    analyzer.analyze_security()
+    assert analyzer.vulnerabilities == ["Use of 'exec' can lead to code injection vulnerabilities."]
+    assert context.parse_count == 0
+
+    broken = incremental_context("def g(:\n", cache)
+    analyzer = SecurityAnalyzer("def g(:\n", broken)
+    analyzer.analyze_security()
+    assert analyzer.vulnerabilities[0].startswith("SyntaxError")
+
+def test_large_file_stays_cached_in_the_default_cache(monkeypatch):
+    # More definitions than the general cache's 512-entry LRU; the
+    # definition cache starts that small here too, and grows to fit.
+    monkeypatch.setattr(definition_cache, "_definition_cache", None)
+    monkeypatch.setattr(definition_cache, "DEFINITION_CACHE_ENTRIES", 512)
+    code = "".join(f"def f{i}(x):\n    return x + {i}\n\n" for i in range(600))
+    analyze_definitions(code)
+    edited = code.replace("return x + 300\n", "return x - 300\n")
+    assert analyze_definitions(edited)["reanalyzed"] == ["f300"]
@@ -0,0 +1,106 @@
+import json
+from documentation_gen import DocumentationGenerator
+
+CODE = '''import math
+
+def area(r):
+    return math.pi * r ** 2
+
+class Shape:
+    def scale(self, factor):
+        """Old docstring."""
+        self.size *= factor
+
+async def fetch(url) -> bytes:
+    return await get(url)
+'''
+
+class JSONAssistant:
+    """
+    Answers batch prompts with a JSON object naming every function in the
+    prompt, except those listed in `skip`.
+    """
+    def __init__(self, skip=()):
+        self.prompts = []
+        self.skip = set(skip)
+
+    def generate_explanation(self, prompt):
+        self.prompts.append(prompt)
+        names = [line[4:] for line in prompt.splitlines() if line.startswith("### ")]
+        if len(names) > 1:
+            names = [name for name in names if name not in self.skip]
+        return "```json\n" + json.dumps({name: f"Docs for {name}.\n\nMore." for name in names}) + "\n```"
+
+def test_extract_function_sources():
+    functions = DocumentationGenerator(CODE, assistant=JSONAssistant()).extract_function_sources()
+    assert [f["name"] for f in functions] == ["area", "Shape.scale", "fetch"]
+    assert functions[0]["source"] == "def area(r):\n    return math.pi * r ** 2"
+    assert functions[2]["signature"] == "async def fetch(url) -> bytes"
+    assert functions[1]["docstring"] == "Old docstring."
+
+def test_batched_documentation_uses_one_prompt():
+    assistant = JSONAssistant()
+    generator = DocumentationGenerator(CODE, assistant=assistant)
+    docs = generator.generate_batched_documentation()
+    assert docs == {name: f"Docs for {name}.\n\nMore." for name in ["area", "Shape.scale", "fetch"]}
+    assert len(assistant.prompts) == 1 and "import math" not in assistant.prompts[0]
+
+def test_budget_splits_batches_and_missing_are_retried():
+    assistant = JSONAssistant(skip={"fetch"})
+    generator = DocumentationGenerator(CODE, assistant=assistant)
+    functions = generator.extract_function_sources()
+    assert len(generator.pack_batches(functions, token_budget=10 ** 6)) == 1
+    assert [len(b) for b in generator.pack_batches(functions, token_budget=120)] == [1, 1, 1]
+
+    docs = generator.generate_batched_documentation()
+    assert docs["fetch"] == "Docs for fetch.\n\nMore."
+    assert generator.requests_sent == 2
+
+def test_truncates_oversized_functions():
+    code = "def big():\n" + "".join(f"    x{i} = {i}\n" for i in range(500))
+    generator = DocumentationGenerator(code, assistant=JSONAssistant())
+    (batch,) = generator.pack_batches(generator.extract_function_sources(), token_budget=200)
+    assert batch[0]["source"].startswith("def big():")
+    assert batch[0]["source"].endswith("# ... (truncated)")
+
+def test_parse_batch_reply():
+    parse = DocumentationGenerator.parse_batch_reply
+    assert parse('Sure! {"f": "\\"\\"\\"Adds.\\"\\"\\"", "g": 3}', ["f", "g"]) == {"f": "Adds."}
+    assert parse("not json", ["f"]) == {}
+
+def test_apply_docstrings():
+    generator = DocumentationGenerator(CODE, assistant=JSONAssistant())
+    source = generator.apply_docstrings({"area": "Circle area.\n\nArgs: r", "Shape.scale": "New."})
+    assert '    """\n    Circle area.\n\n    Args: r\n    """' in source
+    assert "Old docstring." in source and "New." not in source
+    source = generator.apply_docstrings({"Shape.scale": "New."}, overwrite=True)
+    assert '        """\n        New.\n        """' in source and "Old docstring." not in source
+
+def test_functions_in_blocks_and_repeated_names():
+    code = """import os
+
+if os.name == "posix":
+    def posix_only():
+        return 1
+else:
+    def posix_only():
+        return 2
+
+class C:
+    @property
+    def x(self):
+        return self._x
+
+    @x.setter
+    def x(self, value):
+        self._x = value
+"""
+    generator = DocumentationGenerator(code, assistant=JSONAssistant())
+    names = [function["name"] for function in generator.extract_function_sources()]
+    assert names == ["posix_only@4", "posix_only@7", "C.x@12", "C.x@16"]
+    docs = generator.generate_batched_documentation()
+    assert list(docs) == names and docs["C.x@16"] == "Docs for C.x@16.\n\nMore."
+    source = generator.apply_docstrings(docs)
+    assert '        """\n        Docs for posix_only@4.' in source
+    order = ["Docs for C.x@12.", "return self._x", "Docs for C.x@16.", "self._x = value"]
+    assert [source.index(text) for text in order] == sorted(source.index(text) for text in order)
@@ -0,0 +1,71 @@
+import numpy as np
+from neuro_symbolic_code_mentor.embedding_search import (
+    EmbeddingIndex, HashingEmbedder, LSHIndex, iter_definitions,
+)
+
+CODE = '''import json
+
+class ConfigLoader:
+    @staticmethod
+    def load_json_config(path):
+        with open(path) as f:
+            return json.load(f)
+
+def send_email(recipient, subject, body):
+    """Deliver a message over SMTP."""
+    smtp_connection().sendmail(recipient, subject, body)
+'''
+
+def test_iter_definitions():
+    definitions = iter_definitions(CODE, "config.py")
+    assert [(d["kind"], d["name"], d["line"], d["end_line"]) for d in definitions] == [
+        ("class", "ConfigLoader", 3, 7),
+        ("method", "ConfigLoader.load_json_config", 4, 7),
+        ("function", "send_email", 9, 11),
+    ]
+    assert definitions[1]["text"].startswith("    @staticmethod")
+
+def test_hashing_embedder_is_normalized_and_stable():
+    vectors = HashingEmbedder(64).embed(["parse json config", "config, JSON parse", ""])
+    assert vectors.shape == (3, 64) and vectors.dtype == np.float32
+    assert np.allclose(np.linalg.norm(vectors[:2], axis=1), 1)
+    assert np.allclose(vectors[0], vectors[1])
+    assert not vectors[2].any()
+
+def test_search_and_batch():
+    index = EmbeddingIndex()
+    index.add_source(CODE, "config.py")
+    assert index.search("read json configuration file")[0]["name"] == "ConfigLoader.load_json_config"
+    by_query = index.search_batch(["smtp email", "json"], limit=1, kinds=["function"])
+    assert [hits[0]["name"] for hits in by_query] == ["send_email", "send_email"]
+    assert index.search("json", approximate=True)[0]["name"] in ("ConfigLoader", "ConfigLoader.load_json_config")
+
+def test_reindex_only_embeds_changed_definitions(tmp_path):
+    root = tmp_path / "repo"
+    root.mkdir()
+    (root / "config.py").write_text(CODE)
+    directory = str(tmp_path / "vectors")
+
+    index = EmbeddingIndex(directory)
+    assert index.update(str(root))["embedded"] == 3
+    assert isinstance(index.vectors, np.memmap)
+
+    (root / "config.py").write_text(CODE.replace("SMTP", "SMTP with TLS"))
+    index = EmbeddingIndex(directory)
+    assert len(index.rows) == 3
+    counts = index.update(str(root))
+    assert (counts["updated"], counts["embedded"]) == (1, 1)
+    assert index.search("tls smtp")[0]["name"] == "send_email"
+
+    (root / "config.py").unlink()
+    assert EmbeddingIndex(directory).update(str(root))["removed"] == 1
+
+def test_lsh_candidates_include_near_duplicates():
+    rng = np.random.default_rng(1)
+    vectors = rng.standard_normal((4000, 32)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    lsh = LSHIndex(vectors)
+    query = vectors[123] + 0.05 * rng.standard_normal(32).astype(np.float32)
+    candidates = lsh.candidates(query / np.linalg.norm(query))
+    assert 123 in candidates
+    assert len(candidates) < len(vectors)
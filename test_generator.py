@@ -1,31 +1,26 @@
 import ast
 from llm_handler import LLMAssistant
+from neuro_symbolic_code_mentor.analysis_context import get_context
+from neuro_symbolic_code_mentor.async_llm import explain_many
 
 class UnitTestGenerator:
     """
     Day 9: Scans code for function definitions,
     generates skeleton tests, and adds explanations from LLM.
     """
-    def __init__(self, code):
+    def __init__(self, code, context=None, assistant=None):
         self.code = code
-        self.assistant = LLMAssistant()
+        self.context = get_context(code, context)
+        self.assistant = assistant or LLMAssistant()
 
     def extract_functions(self):
         """
         Return a list of function names found in the code.
         """
-        tree = ast.parse(self.code)
-        funcs = []
-        for node in ast.walk(tree):
-            if isinstance(node, ast.FunctionDef):
-                funcs.append(node.name)
-        return funcs
+        return list(self.context.result("function_names"))
 
-    def generate_test_for_function(self, func_name):
-        """
-        Produce a minimal test code snippet + LLM-based explanation.
-        """
-        test_code = f"""
+    def build_test_stub(self, func_name):
+        return f"""
 import pytest
 # from user_code import {func_name}
 
@@ -34,20 +29,34 @@ def test_{func_name}():
     result = {func_name}()
     assert result is not None
 """
-        prompt = f"Explain a good testing approach for function '{func_name}' in this code:\n{self.code}"
-        explanation = self.assistant.generate_explanation(prompt)
-        return test_code, explanation
 
-def generate_explainable_tests(code):
+    def build_prompt(self, func_name):
+        return f"Explain a good testing approach for function '{func_name}' in this code:\n{self.code}"
+
+    def generate_test_for_function(self, func_name):
+        """
+        Produce a minimal test code snippet + LLM-based explanation.
+        """
+        explanation = self.assistant.generate_explanation(self.build_prompt(func_name))
+        return self.build_test_stub(func_name), explanation
+
+    def generate_tests(self, func_names):
+        """
+        Like generate_test_for_function for every name, with the LLM
+        explanations requested concurrently. Returns [(stub, explanation)].
+        """
+        explanations = explain_many(self.assistant, [self.build_prompt(fn) for fn in func_names])
+        return [(self.build_test_stub(fn), text) for fn, text in zip(func_names, explanations)]
+
+def generate_explainable_tests(code, context=None, assistant=None):
     """
     Main Day 9 function: iterates over all functions, prints test stubs + LLM explanations.
     """
-    gen = UnitTestGenerator(code)
+    gen = UnitTestGenerator(code, context, assistant)
     funcs = gen.extract_functions()
     if not funcs:
         print("No functions found to generate tests for.")
         return
 
-    for fn in funcs:
-        stub, explanation = gen.generate_test_for_function(fn)
+    for fn, (stub, explanation) in zip(funcs, gen.generate_tests(funcs)):
         print(f"\n=== Test Stub for '{fn}' ===\n{stub}\nExplanation:\n{explanation}")
@@ -0,0 +1,59 @@
+import json
+from neuro_symbolic_code_mentor.hotspots import annotate_source, line_findings, profile_lines
+
+CODE = """
+def work(n):
+    total = 0
+    for i in range(n):
+        total += i * i
+    return total
+
+for _ in range(3):
+    work(1000)
+"""
+
+def test_tracing_counts_every_line():
+    report = profile_lines(CODE, mode="tracing")
+    assert report["mode"] == "tracing" and report["error"] is None
+    lines = {entry["line"]: entry for entry in report["lines"]}
+    assert lines[5]["hits"] == 3000
+    assert lines[9]["hits"] == 3
+    # The call line is credited with the time spent inside work().
+    assert lines[9]["self_fraction"] < 0.5 < lines[9]["total_fraction"]
+    json.dumps(report)
+
+def test_sampling_finds_hot_loop():
+    code = "def spin():\n    x = 0\n    for i in range(3000000):\n        x += i\n\nspin()\n"
+    report = profile_lines(code, mode="sampling", interval=0.001)
+    assert report["mode"] == "sampling" and report["samples"] > 0
+    hottest = max(report["lines"], key=lambda entry: entry["self_fraction"])
+    assert hottest["line"] in (3, 4)
+    assert {entry["line"]: entry for entry in report["lines"]}[6]["total_fraction"] == 1.0
+
+def test_auto_runs_the_code_once(capsys):
+    assert profile_lines("print('side effect')")["mode"] == "tracing"
+    report = profile_lines("print('side effect')\nfor i in range(3):\n    pass")
+    assert report["mode"] == "sampling"
+    assert capsys.readouterr().out.count("side effect") == 2
+    assert "too few for reliable fractions" in annotate_source("for i in range(3):\n    pass", report)
+
+def test_auto_picks_the_mode_from_the_expected_time():
+    code = "t = 0\nfor i in range(100):\n    t += i\n"
+    report = profile_lines(code, expected_time=0.0003)
+    assert report["mode"] == "tracing"
+    assert {entry["line"]: entry["hits"] for entry in report["lines"]}[3] == 100
+    assert profile_lines(code, expected_time=5.0)["mode"] == "sampling"
+
+def test_annotation_merges_findings():
+    code = CODE + "if _ == None:\n    print(_)\n"
+    findings = line_findings(code)
+    assert findings[2] == ["complexity 2"]
+    assert any("is None" in note for note in findings[10])
+    text = annotate_source(code, profile_lines(code, mode="tracing"), findings)
+    assert "    # <- complexity 2" in text
+    assert any(line.startswith("    5     3000") for line in text.splitlines())
+
+def test_syntax_error_is_reported():
+    report = profile_lines("def f(:\n    pass")
+    assert report["error"].startswith("SyntaxError") and report["lines"] == []
+    assert "Runtime Error during profiling: SyntaxError" in annotate_source("def f(:\n    pass", report)
@@ -0,0 +1,80 @@
+import threading
+import time
+import pytest
+from neuro_symbolic_code_mentor.llm_cache import CachedLLMAssistant
+from neuro_symbolic_code_mentor.result_cache import ResultCache, cache_key
+
+class CountingAssistant:
+    model = "fake-model"
+
+    def __init__(self, delay=0.0):
+        self.calls = 0
+        self.delay = delay
+
+    def generate_explanation(self, prompt):
+        self.calls += 1
+        time.sleep(self.delay)
+        return f"answer to {prompt}"
+
+def test_repeated_prompt_hits_cache(tmp_path):
+    backend = CountingAssistant()
+    first = CachedLLMAssistant(backend, cache=ResultCache(directory=str(tmp_path), ttl=60))
+    assert first.generate_explanation("why?") == "answer to why?"
+    assert first.generate_explanation("why?") == "answer to why?"
+    # Persistent: a fresh process-like instance reads from disk
+    second = CachedLLMAssistant(backend, cache=ResultCache(directory=str(tmp_path), ttl=60))
+    assert second.generate_explanation("why?") == "answer to why?"
+    assert backend.calls == 1
+    assert first.stats()["hit_rate"] == 0.5
+
+def test_request_finished_after_the_first_lookup_is_not_repeated():
+    class LateCache(ResultCache):
+        # The lookup misses, as if the identical request in flight stored
+        # its answer just after it.
+        def get(self, key):
+            self.misses += 1
+            return None
+
+    backend = CountingAssistant()
+    cached = CachedLLMAssistant(backend, cache=LateCache())
+    cached.cache.set(cache_key("llm", "q", backend.model), "answer to q")
+    assert cached.generate_explanation("q") == "answer to q"
+    assert backend.calls == 0
+
+def test_ttl_expiry():
+    backend = CountingAssistant()
+    cached = CachedLLMAssistant(backend, cache=ResultCache(ttl=0.05))
+    cached.generate_explanation("q")
+    time.sleep(0.1)
+    cached.generate_explanation("q")
+    assert backend.calls == 2
+    assert cached.stats()["expired"] == 1
+
+def test_concurrent_identical_prompts_share_one_request():
+    backend = CountingAssistant(delay=0.1)
+    cached = CachedLLMAssistant(backend, cache=ResultCache())
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cached.generate_explanation("same"))) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == ["answer to same"] * 5
+    assert backend.calls == 1
+    assert cached.stats()["deduplicated"] == 4
+
+def test_stream_is_cached_once_finished(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+
+    class StreamingAssistant(CountingAssistant):
+        def stream_explanation(self, prompt):
+            self.calls += 1
+            yield "answer "
+            yield f"to {prompt}"
+
+    backend = StreamingAssistant()
+    cached = CachedLLMAssistant(backend, cache=ResultCache())
+    assert list(cached.stream_explanation("q")) == ["answer ", "to q"]
+    assert list(cached.stream_explanation("q")) == ["answer to q"]
+    assert cached.generate_explanation("q") == "answer to q"
+    assert backend.calls == 1
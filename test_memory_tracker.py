@@ -0,0 +1,39 @@
+import json
+import pytest
+from neuro_symbolic_code_mentor.memory_tracker import format_memory, track_memory
+
+CODE = """
+def churn(n):
+    for i in range(n):
+        tmp = [0] * 10000
+    return n
+
+keep = [0] * 50000
+churn(20)
+"""
+
+def test_allocation_sites_include_temporaries():
+    report = track_memory(CODE)
+    assert report["error"] is None
+    sites = {site["line"]: site for site in report["allocation_sites"]}
+    # Each temporary list is ~80 KB and dropped within the same line.
+    assert sites[4]["allocated"] >= 20 * 70000
+    assert sites[4]["hits"] == 20
+    assert sites[7]["allocated"] >= 400000
+    json.dumps(report)
+
+def test_snapshot_diff_shows_retained_memory():
+    report = track_memory(CODE)
+    top = report["retained_sites"][0]
+    assert top["line"] == 7 and top["size"] >= 400000
+    assert report["peak"] >= report["retained"] >= 400000
+    assert "keep = [0] * 50000" in format_memory(report)
+
+def test_error_is_reported():
+    report = track_memory("x = [1] * 10\nraise KeyError('k')")
+    assert report["error"] == "KeyError: 'k'"
+
+def test_syntax_error_is_reported():
+    report = track_memory("def f(:\n    pass")
+    assert report["error"].startswith("SyntaxError") and report["allocation_sites"] == []
+    assert "SyntaxError" in format_memory(report)
@@ -0,0 +1,74 @@
+import queue
+import sys
+import types
+import threading
+import pytest
+from neuro_symbolic_code_mentor import neural
+from neuro_symbolic_code_mentor.neural import NeuralSuggester, normalize_code
+
+class FakePipeline:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, prompts, **kwargs):
+        self.calls.append(list(prompts))
+        return [[{"generated_text": p + " use a helper"}] for p in prompts]
+
+@pytest.fixture
+def fake(monkeypatch):
+    pipe = FakePipeline()
+    monkeypatch.setattr(neural, "_load_pipeline", lambda model_name: pipe)
+    return pipe
+
+def test_model_loaded_once_and_cached(fake):
+    first = NeuralSuggester(model_name="fake-cache")
+    second = NeuralSuggester(model_name="fake-cache")
+    assert first.generator is second.generator
+    assert first.generate_suggestions("x = 1\n") == "use a helper"
+    # Same code modulo trailing whitespace hits the cache
+    assert second.generate_suggestions("x = 1   \r\n\n") == "use a helper"
+    assert len(fake.calls) == 1
+
+def test_concurrent_prompts_share_a_batch(fake):
+    suggester = NeuralSuggester(model_name="fake-batch", max_batch_size=8, max_wait=0.2)
+    threads = [threading.Thread(target=suggester.generate_suggestions, args=(f"y = {i}",)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert sum(len(c) for c in fake.calls) == 4
+    assert len(fake.calls) < 4
+
+def test_normalize_code():
+    assert normalize_code("\n\na = 1  \r\nb = 2\t\n\n") == "a = 1\nb = 2"
+
+def test_stream_uses_cached_suggestion(fake):
+    suggester = NeuralSuggester(model_name="fake-stream")
+    suggester.generate_suggestions("z = 3")
+    assert list(suggester.stream_suggestions("z = 3\n")) == ["use a helper"]
+    assert len(fake.calls) == 1
+
+def test_stream_raises_when_generation_fails(fake, monkeypatch):
+    class Streamer:
+        # Same protocol as transformers.TextIteratorStreamer: iterate until end().
+        def __init__(self, tokenizer, **kwargs):
+            self.items = queue.Queue()
+
+        def end(self):
+            self.items.put(None)
+
+        def __iter__(self):
+            while (item := self.items.get(timeout=5)) is not None:
+                yield item
+
+    class Model:
+        def generate(self, **kwargs):
+            raise RuntimeError("input longer than the model's context")
+
+    fake.tokenizer = lambda text, return_tensors: {"input_ids": [[0]]}
+    fake.tokenizer.pad_token_id = 0
+    fake.model = Model()
+    monkeypatch.setitem(sys.modules, "transformers", types.SimpleNamespace(TextIteratorStreamer=Streamer))
+    suggester = NeuralSuggester(model_name="fake-stream-error")
+    with pytest.raises(RuntimeError, match="context"):
+        list(suggester.stream_suggestions("w = 4"))
@@ -0,0 +1,60 @@
+import pytest
+from pair_programming import PairProgrammingAssistant, apply_delta, line_delta
+
+BASE = """import os
+
+def alpha(x):
+    return x + 1
+
+def beta(y):
+    if y:
+        return eval(y)
+"""
+
+class RecordingAssistant:
+    def __init__(self):
+        self.prompts = []
+
+    def generate_explanation(self, prompt):
+        self.prompts.append(prompt)
+        return "feedback"
+
+def make_assistant():
+    ppa = PairProgrammingAssistant()
+    ppa.assistant = RecordingAssistant()
+    return ppa
+
+def test_only_changed_definitions_are_sent():
+    ppa = make_assistant()
+    ppa.on_code_change(BASE)
+    edited = BASE.replace("x + 1", "x + 2")
+    ppa.on_code_change(edited)
+    assert ppa.last_changed == ["alpha"]
+    prompt = ppa.assistant.prompts[-1]
+    assert "x + 2" in prompt and "eval" not in prompt
+
+def test_unchanged_snapshot_skips_llm():
+    ppa = make_assistant()
+    ppa.on_code_change(BASE)
+    assert ppa.on_code_change(BASE) == "No definitions changed since the last update."
+    assert len(ppa.assistant.prompts) == 1
+
+def test_findings_cached_per_definition():
+    ppa = make_assistant()
+    ppa.on_code_change(BASE)
+    beta = next(u for u in ppa.units if u.name == "beta")
+    findings = ppa.analyze_unit(beta)
+    assert findings["complexity"] == {"beta": 2}
+    assert any("eval" in issue for issue in findings["bugs"])
+    assert ppa.unit_results.stats()["hits"] >= 1
+
+def test_history_is_stored_as_deltas():
+    ppa = make_assistant()
+    versions = [BASE, BASE.replace("x + 1", "x + 2"), BASE + "\ndef gamma():\n    pass\n"]
+    for code in versions:
+        ppa.on_code_change(code)
+    assert all(isinstance(d, tuple) for d in ppa.history)
+    assert [ppa.snapshot(i) for i in range(3)] == versions
+    start, end, lines = line_delta(versions[0], versions[1])
+    assert (end - start, len(lines)) == (1, 1)
+    assert apply_delta(versions[0], (start, end, lines)) == versions[1]
@@ -0,0 +1,59 @@
+import re
+import pytest
+from neuro_symbolic_code_mentor.patterns import get_patterns
+from neuro_symbolic_code_mentor.pattern_scanner import PatternScanner, literal_prefix, required_literal
+
+SAMPLE = """
+def process_list(my_list):
+    for i in range(len(my_list)):
+        if my_list[i] == None:
+            print(my_list[i])
+    if done == True:
+        pass
+    # TODO: Handle empty list scenario
+"""
+
+def test_matches_per_pattern_search():
+    patterns = get_patterns()
+    scanner = PatternScanner(patterns)
+    for code in [SAMPLE, "", "x = 1\n", "reprint(x)\nflag == False"]:
+        expected = [idx for idx, (p, _s) in enumerate(patterns) if p.search(code)]
+        assert scanner.fired_rules(code) == expected
+
+def test_scan_reports_rule_and_line():
+    scanner = PatternScanner(get_patterns())
+    hits = scanner.scan(SAMPLE)
+    none_hits = [h for h in hits if h.rule_index == 0]
+    assert len(none_hits) == 1
+    assert none_hits[0].line == 4
+    assert SAMPLE[none_hits[0].start:none_hits[0].end].startswith("==")
+
+def test_scan_matches_per_pattern_finditer():
+    patterns = get_patterns() + [(re.compile(r"aa"), "overlapping"), (re.compile(r"==\s*=*"), "runs")]
+    scanner = PatternScanner(patterns)
+    for code in [SAMPLE, "aaaaa", "x === y ==== z"]:
+        expected = sorted((idx, m.start(), m.end()) for idx, (p, _s) in enumerate(patterns) for m in p.finditer(code))
+        assert sorted(hit[:3] for hit in scanner.scan(code)) == expected
+
+def test_literal_prefix():
+    assert literal_prefix(re.compile(r"\bprint\s*\(")) == "print"
+    assert literal_prefix(re.compile(r"#\s*TODO")) == "#"
+    assert literal_prefix(re.compile(r"ab*c")) == "a"
+    assert literal_prefix(re.compile(r"^def")) == ""
+    assert literal_prefix(re.compile(r"foo|bar")) == ""
+
+def test_nested_prefixes_and_fallback_rules():
+    patterns = [
+        (re.compile(r"for\b"), "for"),
+        (re.compile(r"format\("), "format"),
+        (re.compile(r"[0-9]+px"), "fallback"),
+    ]
+    scanner = PatternScanner(patterns)
+    assert scanner.fallback_rules == [2]
+    assert scanner.fired_rules("x.format(1)") == [1]
+    assert scanner.fired_rules("for x in y: w = '10px'") == [0, 2]
+
+def test_required_literal():
+    assert required_literal(re.compile(r"^\s*def \w+\(")) == "def "
+    assert required_literal(re.compile(r"xa+b")) == "xa"
+    assert required_literal(re.compile(r"a|b")) == ""
@@ -1,8 +1,31 @@
 import pytest
-from day14_performance_profiler import PerformanceProfiler
+from day14_performance_profiler import PerformanceProfiler, run_performance_profiler
 
 def test_run_profile():
     code = "x = 0\nfor i in range(1000): x += i"
     profiler = PerformanceProfiler(code)
     timing = profiler.run_profile()
     assert "Execution Time:" in timing
+
+def test_syntax_error_is_reported(capsys):
+    run_performance_profiler("def f(:\n  pass")
+    assert "Runtime Error during profiling: SyntaxError: invalid syntax" in capsys.readouterr().out
+
+def test_code_runs_once_by_default(capsys):
+    run_performance_profiler("print('side effect')")
+    assert capsys.readouterr().out.count("side effect") == 1
+
+def test_short_snippet_lines_are_traced(capsys):
+    run_performance_profiler("t = 0\nfor i in range(100):\n    t += i\n", lines=True)
+    out = capsys.readouterr().out
+    assert "tracing collector" in out and "too few" not in out
+
+def test_benchmark_runs_in_the_sandbox():
+    from neuro_symbolic_code_mentor.sandbox import SandboxPool
+    options = {"repeat": 3, "warmup": 0, "sample_time": 0.001}
+    with SandboxPool(workers=1, cpu_time=5, wall_time=10) as pool:
+        profiler = PerformanceProfiler("x = sum(range(100))", sandbox=pool)
+        assert profiler.benchmark(**options)["samples"] == 3
+        assert profiler.compare_with("x = 4950", **options)["verdict"]
+        with pytest.raises(RuntimeError, match="ValueError: boom"):
+            PerformanceProfiler("raise ValueError('boom')", sandbox=pool).benchmark(**options)
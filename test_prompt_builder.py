@@ -0,0 +1,73 @@
+import pytest
+from neuro_symbolic_code_mentor import prompt_builder
+from neuro_symbolic_code_mentor.prompt_builder import (
+    count_tokens, default_budget, matching_lines, slice_code, truncate_to_budget,
+)
+
+FILLER = "\n".join(
+    f"def helper_{i}(values):\n    total = 0\n    for value in values:\n        total += value * {i}\n    return total\n"
+    for i in range(40)
+)
+
+CODE = f'''import os
+
+SECRET_NAME = "API_TOKEN"
+
+def read_secret():
+    return os.environ[SECRET_NAME]
+
+{FILLER}
+class Runner:
+    def run(self, command):
+        token = read_secret()
+        exec(command)
+        return token
+'''
+
+def _line(code, needle):
+    return matching_lines(code, [needle])[0]
+
+def test_count_tokens_fallback(monkeypatch):
+    monkeypatch.setattr(prompt_builder, "tiktoken", None)
+    prompt_builder._encoding.cache_clear()
+    assert count_tokens("total += value * 2") == 6
+    prompt_builder._encoding.cache_clear()
+
+def test_default_budget_from_environment(monkeypatch):
+    monkeypatch.setenv("CODE_MENTOR_PROMPT_TOKENS", "1234")
+    assert default_budget() == 1234
+
+def test_small_code_is_unchanged():
+    assert slice_code("x = 1\n", lines=[1], budget=100) == "x = 1\n"
+
+def test_focus_keeps_flagged_code_and_references():
+    budget = 200
+    assert count_tokens(CODE) > budget
+    sliced = slice_code(CODE, lines=[_line(CODE, "exec(")], budget=budget)
+    assert count_tokens(sliced) <= budget
+    assert "exec(command)" in sliced
+    assert "class Runner:" in sliced
+    assert "def read_secret():" in sliced and "SECRET_NAME = " in sliced
+    assert "helper_7" not in sliced
+
+def test_outline_mode():
+    sliced = slice_code(CODE, budget=800)
+    assert count_tokens(sliced) <= 800
+    assert "import os" in sliced
+    assert "def helper_39(values):" in sliced
+    assert "(outline)" in sliced
+
+def test_unparsable_code_is_truncated():
+    code = "def broken(:\n" + "x = 1\n" * 200
+    sliced = slice_code(code, budget=50)
+    assert sliced.startswith("def broken(:") and sliced.endswith("# ... (truncated)")
+    assert count_tokens(sliced) <= 50
+    assert truncate_to_budget("short", 50) == "short"
+
+def test_flagged_comment_outside_statements_gets_a_window():
+    code = CODE + "\n# password=hunter2 (left over from testing)\n"
+    line = _line(code, "password=")
+    sliced = slice_code(code, lines=[line], budget=200)
+    assert sliced.startswith("# lines ") and f"-{line}\n" in sliced and "password=hunter2" in sliced
+    assert count_tokens(sliced) <= 200
+    assert "def helper_0(values):" in slice_code(CODE, names=["missing"], budget=200)
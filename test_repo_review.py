@@ -0,0 +1,41 @@
+import pytest
+from neuro_symbolic_code_mentor import repo_review
+from neuro_symbolic_code_mentor.repo_review import iter_python_files, review_file, review_repository
+
+@pytest.fixture
+def repo(tmp_path):
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "__pycache__").mkdir()
+    (tmp_path / "a.py").write_text("def f(x):\n    if x == None:\n        exec(x)\n")
+    (tmp_path / "pkg" / "b.py").write_text("def g(:\n")
+    (tmp_path / "__pycache__" / "skip.py").write_text("x = 1\n")
+    (tmp_path / "notes.txt").write_text("not python")
+    return tmp_path
+
+def test_iter_python_files_skips_caches(repo):
+    names = [p.rsplit("/", 1)[-1] for p in iter_python_files(str(repo))]
+    assert names == ["a.py", "b.py"]
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_review_repository_records(repo, workers):
+    records = {r["path"].rsplit("/", 1)[-1]: r for r in review_repository(str(repo), workers=workers)}
+    assert set(records) == {"a.py", "b.py"}
+    assert records["a.py"]["complexity"] == {"f": 2}
+    assert any("exec" in v for v in records["a.py"]["security"])
+    assert "is None" in records["a.py"]["review"]["patterns"]
+    assert records["b.py"]["error"].startswith("SyntaxError")
+
+def test_review_repository_incremental(repo):
+    plain = {r["path"]: r for r in review_repository(str(repo), workers=1)}
+    for record in review_repository(str(repo), workers=1, incremental=True):
+        expected = plain[record["path"]]
+        assert {k: v for k, v in record.items() if k != "elapsed"} == \
+            {k: v for k, v in expected.items() if k != "elapsed"}
+
+def test_analyzer_failure_is_recorded(repo, monkeypatch):
+    def broken(code, context):
+        raise RecursionError("maximum recursion depth exceeded")
+    monkeypatch.setattr(repo_review, "review_code", broken)
+    record = review_file(str(repo / "a.py"))
+    assert record["error"] == "RecursionError: maximum recursion depth exceeded"
+    assert record["complexity"] == {"f": 2}
@@ -0,0 +1,38 @@
+import pytest
+from neuro_symbolic_code_mentor.result_cache import ResultCache, cache_key
+
+def test_key_depends_on_source_and_versions():
+    base = cache_key("review_code", "x = 1", "rules-1", "1")
+    assert base == cache_key("review_code", "x = 1", "rules-1", "1")
+    assert base != cache_key("review_code", "x = 2", "rules-1", "1")
+    assert base != cache_key("review_code", "x = 1", "rules-2", "1")
+    assert base != cache_key("complexity_report", "x = 1", "rules-1", "1")
+
+def test_memory_lru_and_stats():
+    cache = ResultCache(max_entries=2)
+    calls = []
+    compute = lambda: calls.append(1) or {"report": "ok"}
+    assert cache.get_or_compute("a", compute) == {"report": "ok"}
+    assert cache.get_or_compute("a", compute) == {"report": "ok"}
+    assert len(calls) == 1
+    cache.set("b", 2)
+    cache.set("c", 3)  # evicts "a"
+    assert cache.get("a") is None
+    stats = cache.stats()
+    assert stats["hits"] == 1 and stats["misses"] == 2
+
+def test_disk_store_is_shared(tmp_path):
+    writer = ResultCache(directory=str(tmp_path))
+    writer.set("k" * 64, {"patterns": "none"})
+    reader = ResultCache(directory=str(tmp_path))
+    assert reader.get("k" * 64) == {"patterns": "none"}
+    assert reader.stats()["disk_hits"] == 1
+
+def test_size_based_eviction(tmp_path):
+    cache = ResultCache(max_entries=0, directory=str(tmp_path), max_disk_bytes=2000)
+    for i in range(20):
+        cache.set(f"{i:064x}", "x" * 200)
+    cache.evict()
+    total = sum(size for _p, size, _m in cache._disk_entries())
+    assert total <= 2000
+    assert cache.get(f"{19:064x}") == "x" * 200
@@ -0,0 +1,47 @@
+import pytest
+from neuro_symbolic_code_mentor.sandbox import SandboxPool
+from debugger import debug_code
+
+@pytest.fixture(scope="module")
+def pool():
+    with SandboxPool(workers=1, cpu_time=1, wall_time=2, memory_mb=256) as pool:
+        yield pool
+
+def test_reports_exception_and_output(pool):
+    result = pool.run("print('hello')\nx = 1 / 0")
+    assert not result["ok"]
+    assert result["error_type"] == "ZeroDivisionError"
+    assert 'File "<string>", line 2' in result["traceback"]
+    assert result["output"] == "hello\n"
+
+def test_worker_is_reused(pool):
+    pool.run("x = 1")
+    before = pool.respawned
+    assert pool.run("x = 2")["ok"]
+    assert pool.respawned == before
+
+def test_limits(pool):
+    assert pool.run("while True: pass")["cpu_exceeded"]
+    assert pool.run("import time\ntime.sleep(30)")["timed_out"]
+    assert pool.run("x = bytearray(8 * 1024 ** 3)")["memory_exceeded"]
+    # The pool keeps working after every kind of failure.
+    assert pool.run("x = sum(range(10))")["ok"]
+
+def test_profile_job(pool):
+    result = pool.run("def f():\n    return sum(range(100))\nf()", kind="profile")
+    assert result["profile"]["hot_paths"][0]["path"][1] == "f (line 1)"
+
+def test_lines_job(pool):
+    result = pool.run("for i in range(5):\n    x = i", kind="lines", options={"mode": "tracing"})
+    assert {entry["line"]: entry["hits"] for entry in result["lines"]["lines"]} == {1: 6, 2: 5}
+
+def test_debug_code_in_sandbox(pool):
+    message = debug_code("d = {}\nd['missing']", sandbox=pool)
+    assert "KeyError" in message and "dict.get" in message
+    assert "TimeoutError" in debug_code("import time\ntime.sleep(30)", sandbox=pool)
+
+def test_benchmark_jobs(pool):
+    options = {"repeat": 3, "warmup": 0, "sample_time": 0.001}
+    assert pool.run("x = 1", kind="benchmark", options=options)["benchmark"]["samples"] == 3
+    result = pool.run("x = 1", kind="compare", options=dict(options, optimized_code="x = 2"))
+    assert result["comparison"]["before"]["samples"] == 3
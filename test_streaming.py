@@ -0,0 +1,72 @@
+import asyncio
+import io
+import pytest
+from neuro_symbolic_code_mentor import streaming
+from neuro_symbolic_code_mentor.streaming import TimedStream, echo, explain, sse_event, stream_explanation
+
+class PlainAssistant:
+    def generate_explanation(self, prompt):
+        return f"answer to {prompt}"
+
+class AsyncStreamingAssistant:
+    async def stream_explanation(self, prompt):
+        for word in ["answer", " to ", prompt]:
+            await asyncio.sleep(0.01)
+            yield word
+
+@pytest.fixture(autouse=True)
+def no_api_key(monkeypatch):
+    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.delenv(streaming.STREAM_HTTP_ENV, raising=False)
+
+def test_assistant_without_streaming_is_one_chunk(monkeypatch):
+    assert list(stream_explanation(PlainAssistant(), "q")) == ["answer to q"]
+    # An API key alone does not send the prompt around the assistant.
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    assert list(stream_explanation(PlainAssistant(), "q")) == ["answer to q"]
+
+def test_http_streaming_is_opt_in(monkeypatch):
+    models = []
+
+    def client(model):
+        models.append(model)
+        return AsyncStreamingAssistant()
+
+    monkeypatch.setattr(streaming, "_streaming_client", client)
+    monkeypatch.setenv(streaming.STREAM_HTTP_ENV, "1")
+    assistant = PlainAssistant()
+    assistant.model = "gpt-test"
+    assert list(stream_explanation(assistant, "q")) == ["answer", " to ", "q"]
+    assert models == ["gpt-test"]
+
+def test_async_generator_is_iterated_as_it_yields():
+    assert list(stream_explanation(AsyncStreamingAssistant(), "q")) == ["answer", " to ", "q"]
+
+def test_async_errors_reach_the_caller():
+    class Failing:
+        async def stream_explanation(self, prompt):
+            yield "partial"
+            raise RuntimeError("connection lost")
+
+    chunks = stream_explanation(Failing(), "q")
+    assert next(chunks) == "partial"
+    with pytest.raises(RuntimeError):
+        next(chunks)
+
+def test_explain_writes_chunks_and_records_timing():
+    out = io.StringIO()
+    assert explain(AsyncStreamingAssistant(), "q", stream=out, label="test") == "answer to q"
+    assert out.getvalue() == "answer to q\n"
+    timing = streaming.STREAM_TIMINGS[-1]
+    assert timing.label == "test" and timing.chunks == 3
+    assert 0 < timing.first_token <= timing.total
+    assert explain(PlainAssistant(), "q") == "answer to q"
+    assert echo("fixed", out) == "fixed" and out.getvalue().endswith("fixed\n")
+
+def test_timed_stream_ignores_empty_chunks():
+    timed = TimedStream(["", "a", "b"])
+    assert list(timed) == ["", "a", "b"] and timed.text == "ab"
+    assert timed.first_token is not None
+
+def test_sse_event():
+    assert sse_event("a\nb", "token") == 'event: token\ndata: "a\\nb"\n\n'
@@ -0,0 +1,27 @@
+import io
+import pytest
+from style_enforcer import StyleEnforcer, check_file, compile_rules, iter_violations
+
+CODE = "def foo(): # style violation\n    pass\ndef bar():\n    return 1  # fine\n"
+
+def test_check_style_from_string():
+    assert StyleEnforcer(CODE).check_style() == [
+        (1, "def foo(): # style violation", "Avoid inline comments on function definition lines")
+    ]
+
+def test_streams_from_file_object():
+    violations = iter_violations(io.StringIO(CODE))
+    assert next(violations)[0] == 1
+    assert list(violations) == []
+
+def test_literal_prefilter_matches_plain_search():
+    rules = {r"^\s*def \w+\(.*\):\s*#.*": "inline comment", r"print\s*\(": "print call"}
+    table = compile_rules(rules)
+    assert [literal for _regex, _note, literal in table] == ["def ", "print"]
+    lines = ["  def f(x):  # c", "print (1)", "def g(): pass", "printer = 1"]
+    assert [v[0] for v in iter_violations(lines, table)] == [1, 2]
+
+def test_check_file(tmp_path):
+    path = tmp_path / "sample.py"
+    path.write_text(CODE * 3)
+    assert [v[0] for v in check_file(str(path))] == [1, 5, 9]
@@ -0,0 +1,76 @@
+import os
+from neuro_symbolic_code_mentor.symbol_index import SymbolIndex, split_identifier, tokenize
+
+PARSER = '''"""HTTP helpers."""
+
+class ResponseParser:
+    """Parses raw HTTP responses."""
+    def parseHeaders(self, raw):
+        return dict(line.split(":") for line in raw)
+
+def fetch_url(url):
+    """Downloads a page."""
+    return ResponseParser().parseHeaders(open_socket(url))
+'''
+
+def test_split_identifier():
+    assert split_identifier("parseHTTPResponse") == ("parse", "http", "response", "parsehttpresponse")
+    assert split_identifier("fetch_url") == ("fetch", "url", "fetch_url")
+    assert split_identifier("x") == ()
+    assert tokenize("Parses the raw_data") == ["parses", "raw", "data", "raw_data"]
+
+def test_search_ranks_symbols():
+    index = SymbolIndex()
+    index.add_source(PARSER, "net/http.py")
+    hits = index.search("parse headers")
+    assert hits[0]["name"] == "ResponseParser.parseHeaders"
+    assert (hits[0]["kind"], hits[0]["path"], hits[0]["line"]) == ("method", "net/http.py", 5)
+    assert index.search("download page")[0]["name"] == "fetch_url"
+    assert index.search("http", kinds=["module"])[0]["name"] == "net.http"
+    assert index.search("nothing matches this") == []
+    assert index.callers("parseHeaders") == [{"path": "net/http.py", "line": 10, "caller": "fetch_url"}]
+
+def test_incremental_update_and_persistence(tmp_path):
+    root = tmp_path / "repo"
+    root.mkdir()
+    (root / "http.py").write_text(PARSER)
+    (root / "util.py").write_text("def slugify(title):\n    return title.lower()\n")
+    path = str(tmp_path / "index.json")
+
+    index = SymbolIndex(path)
+    assert index.update(str(root)) == {"added": 2, "updated": 0, "unchanged": 0, "removed": 0, "errors": 0}
+    assert os.path.exists(path)
+
+    (root / "util.py").write_text("def slugify(title):\n    return title.casefold()\n")
+    (root / "http.py").unlink()
+    (root / "bad.py").write_text("def broken(:\n")
+    index = SymbolIndex(path)
+    assert index.search("slugify")[0]["path"] == "util.py"
+    counts = index.update(str(root))
+    assert counts == {"added": 1, "updated": 1, "unchanged": 0, "removed": 1, "errors": 1}
+    assert index.search("parse headers") == []
+    assert index.files["bad.py"]["error"].startswith("SyntaxError")
+
+    index = SymbolIndex(path)
+    assert index.update(str(root))["unchanged"] == 2
+    assert index.search("casefold")[0]["name"] == "slugify"
+
+def test_postings_are_read_on_demand(tmp_path):
+    root = tmp_path / "repo"
+    root.mkdir()
+    (root / "util.py").write_text("def slugify(title):\n    return title.lower()\n")
+    path = tmp_path / "index.sqlite"
+    path.write_text('{"version": 1}')  # an index in the old JSON format is replaced
+
+    built = SymbolIndex(str(path))
+    built.update(str(root))
+    index = SymbolIndex(str(path))
+    assert index.postings.loaded == {}
+    assert index.search("slugify")[0]["name"] == "slugify"
+    assert set(index.postings.loaded) == {"slugify"}
+    assert index.stats() == built.stats()
+
+    (root / "text.py").write_text("def title_case(title):\n    return title.title()\n")
+    assert index.update(str(root))["added"] == 1
+    assert SymbolIndex(str(path)).search("title")[0]["path"] in ("util.py", "text.py")
+    assert SymbolIndex(str(path)).stats() == index.stats()
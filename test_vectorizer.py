@@ -0,0 +1,63 @@
+import pytest
+from neuro_symbolic_code_mentor.vectorizer import check_rewrite, find_vectorizable_loops, vectorize
+
+CODE = """def stats(xs, ys):
+    total = 0
+    for x in xs:
+        total += x * x
+    out = []
+    for x, y in zip(xs, ys):
+        if x > 0:
+            out.append(x / 2 + y)
+    for x in xs:
+        print(x)
+    return total, out
+"""
+
+def test_finds_reduction_and_map():
+    found = find_vectorizable_loops(CODE)
+    assert [(entry["line"], entry["kind"]) for entry in found] == [(3, "reduction"), (6, "map")]
+    assert found[0]["rewrite"] == "xs_array = np.asarray(xs)\ntotal += np.sum(xs_array * xs_array).item()"
+    assert "out.extend((xs_array / 2 + ys_array)[xs_array > 0].tolist())" in found[1]["rewrite"]
+    diff = found[0]["diff"]
+    assert "+import numpy as np" in diff and "-    for x in xs:" in diff
+    assert "print(x)" not in found[0]["rewrite"]
+
+def test_recurrences_are_left_alone():
+    assert find_vectorizable_loops("for x in xs:\n    total += total * x\n") == []
+
+def test_integer_overflow_is_unsafe():
+    found = find_vectorizable_loops(CODE)
+    reduction = check_rewrite(found[0], size=100)
+    assert not reduction["safe"] and "overflow" in reduction["issues"][0]
+    assert check_rewrite(found[1], size=100)["safe"]
+
+def test_speedup_is_measured():
+    code = "total = 0.0\nfor x in xs:\n    total += x * 2.5 + 1\n"
+    result = vectorize(code, size=20000, repeat=5)[0]
+    assert result["benchmark"]["speedup"] > 1
+
+def test_constant_values_under_a_filter_are_repeated():
+    code = "for x in xs:\n    if x > 0:\n        total += 2\nfor x in xs:\n    if x > 0:\n        out.append(1)\n"
+    found = vectorize(code, measure=False)
+    assert [entry["rewrite"].splitlines()[-1] for entry in found] == [
+        "total += 2 * int(np.count_nonzero(xs_array > 0))",
+        "out.extend([1] * int(np.count_nonzero(xs_array > 0)))",
+    ]
+    assert all(entry["safety"]["safe"] for entry in found)
+    assert find_vectorizable_loops("for x in xs:\n    if w > 0:\n        total += x\n") == []
+
+def test_index_loop_keeps_the_ranged_sequence():
+    found = vectorize("for i in range(len(a)):\n    out[i] = b[i] + 0.5\n", measure=False)[0]
+    assert found["sequences"] == ["a", "b"]
+    assert found["rewrite"].endswith("out[:len(a_array)] = (b_array + 0.5).tolist()")
+    assert found["safety"]["safe"], found["safety"]
+
+def test_edge_cases_and_division_are_unsafe():
+    doubled = vectorize("for x in xs:\n    out.append(x * 2)\n", measure=False)[0]["safety"]
+    assert doubled["issues"] == ["edge ints: results differ; NumPy int64 overflows silently where Python ints grow"]
+    inverse = vectorize("total = 0\nfor x in xs:\n    total += 1 / x\n", measure=False)[0]["safety"]
+    assert inverse["issues"][0].startswith("divides by xs_array")
+    assert "edge floats: the loop raises ZeroDivisionError but the rewrite returns a value" in inverse["issues"]
+    power = vectorize("for x in xs:\n    out.append(x ** -1)\n", measure=False)[0]["safety"]
+    assert power["issues"][0].startswith("raises to the power -1")
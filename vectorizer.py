@@ -0,0 +1,535 @@
+# neuro_symbolic_code_mentor/vectorizer.py
+
+import ast
+import math
+import random
+from typing import Dict, List, Optional
+
+import astor
+
+from neuro_symbolic_code_mentor.benchmark_harness import compare
+from neuro_symbolic_code_mentor.refactor import RefactorTransformer
+from neuro_symbolic_code_mentor.review import generate_refactor_diff
+
+try:
+    import numpy as np  # only needed to run the rewrites, not to find them
+except ImportError:  # pragma: no cover
+    np = None
+
+BENCHMARK_SIZE = 10000  # elements per sequence when timing a rewrite
+CHECK_SIZE = 1000  # elements per sequence when checking a rewrite's results
+FREE_NAME_VALUE = 3  # stands in for loop-invariant names on synthetic data
+
+# Arithmetic NumPy applies element-wise with Python's semantics.
+ELEMENTWISE_OPS = (ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow)
+COMPARE_OPS = (ast.Gt, ast.GtE, ast.Lt, ast.LtE, ast.Eq, ast.NotEq)
+# Scalar function -> NumPy ufunc (name in the np namespace).
+UFUNCS = {"abs": "abs", "math.sqrt": "sqrt", "math.exp": "exp", "math.log": "log", "math.sin": "sin",
+          "math.cos": "cos", "math.floor": "floor", "math.ceil": "ceil", "min": "minimum", "max": "maximum"}
+# Accumulation operator -> NumPy reduction.
+REDUCTIONS = {ast.Add: "sum", ast.Sub: "sum", ast.Mult: "prod"}
+
+
+def _np(attr: str) -> ast.Attribute:
+    return ast.Attribute(value=ast.Name(id="np", ctx=ast.Load()), attr=attr, ctx=ast.Load())
+
+
+def _call(func: ast.AST, *args: ast.AST) -> ast.Call:
+    return ast.Call(func=func, args=list(args), keywords=[])
+
+
+def _method(value: ast.AST, name: str, *args: ast.AST) -> ast.Call:
+    return _call(ast.Attribute(value=value, attr=name, ctx=ast.Load()), *args)
+
+
+def _dotted(node: ast.AST) -> Optional[str]:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name):
+        return f"{node.value.id}.{node.attr}"
+    return None
+
+
+class _ElementwiseExpression:
+    """
+    Translates one loop-body expression into its array form: loop variables
+    (or `seq[i]` in an index loop) become the arrays of their sequences.
+    `translate` returns None for anything NumPy would not compute the same way.
+    """
+
+    def __init__(self, elements: Dict[str, str], index: Optional[str], arrays: Dict[str, str]):
+        self.elements = elements  # loop variable -> sequence name
+        self.index = index  # index variable of a range(len(...)) loop
+        self.arrays = arrays  # sequence name -> array variable
+        self.sequences: List[str] = []
+        self.free_names: List[str] = []
+
+    def _array(self, sequence: str) -> ast.Name:
+        if sequence not in self.sequences:
+            self.sequences.append(sequence)
+        return ast.Name(id=self.arrays.setdefault(sequence, f"{sequence}_array"), ctx=ast.Load())
+
+    def translate(self, node: ast.AST) -> Optional[ast.AST]:
+        if isinstance(node, ast.Name):
+            if node.id in self.elements:
+                return self._array(self.elements[node.id])
+            if node.id == self.index:
+                return None
+            if node.id not in self.free_names:
+                self.free_names.append(node.id)
+            return ast.Name(id=node.id, ctx=ast.Load())
+        if isinstance(node, ast.Subscript) and self.index is not None:
+            if isinstance(node.value, ast.Name) and isinstance(node.slice, ast.Name) and node.slice.id == self.index:
+                return self._array(node.value.id)
+            return None
+        if isinstance(node, ast.Constant):
+            return node if isinstance(node.value, (int, float)) and not isinstance(node.value, bool) else None
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ELEMENTWISE_OPS):
+            left, right = self.translate(node.left), self.translate(node.right)
+            return None if left is None or right is None else ast.BinOp(left=left, op=node.op, right=right)
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            operand = self.translate(node.operand)
+            return None if operand is None else ast.UnaryOp(op=node.op, operand=operand)
+        if isinstance(node, ast.Call) and not node.keywords:
+            ufunc = UFUNCS.get(_dotted(node.func))
+            if ufunc is None or (ufunc in ("minimum", "maximum") and len(node.args) != 2):
+                return None
+            args = [self.translate(arg) for arg in node.args]
+            return None if None in args or not args else _call(_np(ufunc), *args)
+        return None
+
+    def translate_condition(self, node: ast.AST) -> Optional[ast.AST]:
+        # Comparisons become boolean masks, combined with & and |.
+        if isinstance(node, ast.BoolOp):
+            parts = [self.translate_condition(value) for value in node.values]
+            if None in parts:
+                return None
+            op = ast.BitAnd() if isinstance(node.op, ast.And) else ast.BitOr()
+            combined = parts[0]
+            for part in parts[1:]:
+                combined = ast.BinOp(left=combined, op=op, right=part)
+            return combined
+        if isinstance(node, ast.Compare) and all(isinstance(op, COMPARE_OPS) for op in node.ops):
+            operands = [self.translate(value) for value in [node.left] + node.comparators]
+            if None in operands:
+                return None
+            masks = [ast.Compare(left=left, ops=[op], comparators=[right])
+                     for left, op, right in zip(operands, node.ops, operands[1:])]
+            combined = masks[0]
+            for mask in masks[1:]:  # a < x < b  ->  (a < x) & (x < b)
+                combined = ast.BinOp(left=combined, op=ast.BitAnd(), right=mask)
+            return combined
+        return None
+
+
+def _loop_elements(node: ast.For):
+    """
+    (loop variable -> sequence, index variable, sequence the index ranges
+    over) for `for x in xs`, `for x, y in zip(xs, ys)` and
+    `for i in range(len(xs))`; None otherwise.
+    """
+    target, iterable = node.target, node.iter
+    if isinstance(target, ast.Name) and isinstance(iterable, ast.Name):
+        return {target.id: iterable.id}, None, None
+    if isinstance(iterable, ast.Call) and _dotted(iterable.func) == "zip" and not iterable.keywords \
+            and isinstance(target, ast.Tuple) and len(target.elts) == len(iterable.args) \
+            and all(isinstance(e, ast.Name) for e in target.elts) \
+            and all(isinstance(a, ast.Name) for a in iterable.args):
+        return {e.id: a.id for e, a in zip(target.elts, iterable.args)}, None, None
+    if isinstance(target, ast.Name) and isinstance(iterable, ast.Call) and _dotted(iterable.func) == "range" \
+            and len(iterable.args) == 1 and isinstance(iterable.args[0], ast.Call) \
+            and _dotted(iterable.args[0].func) == "len" and len(iterable.args[0].args) == 1 \
+            and isinstance(iterable.args[0].args[0], ast.Name):
+        return {}, target.id, iterable.args[0].args[0].id
+    return None
+
+
+def _uses_arrays(node: ast.AST, expression: _ElementwiseExpression) -> bool:
+    # Whether a translated expression varies per element (refers to an array).
+    arrays = set(expression.arrays.values())
+    return any(isinstance(child, ast.Name) and child.id in arrays for child in ast.walk(node))
+
+
+def _count(mask: ast.AST) -> ast.Call:
+    return _call(ast.Name(id="int", ctx=ast.Load()), _call(_np("count_nonzero"), mask))
+
+
+class VectorizeTransformer(RefactorTransformer):
+    """
+    Rewrites loops that accumulate numeric results from element-wise
+    arithmetic into NumPy array expressions:
+
+      for x in xs: total += f(x)            ->  total += np.sum(f(xs_array)).item()
+      for x in xs: out.append(f(x))         ->  out.extend(f(xs_array).tolist())
+      for i in range(len(a)): out[i] = ...  ->  out[:len(a_array)] = (...).tolist()
+
+    optionally under a single `if` filter (which becomes a boolean mask), and
+    with `for x, y in zip(xs, ys)` and `a[i]` indexing. A value that is the
+    same for every element is repeated (or multiplied by the number of
+    matches) instead of being treated as an array. Results are turned
+    back into Python scalars / lists, so surrounding code keeps its types.
+    Every rewrite is recorded in `rewrites`; only loops are changed.
+    """
+
+    def __init__(self):
+        self.rewrites: List[Dict] = []
+
+    def visit_Compare(self, node):
+        return node
+
+    def visit_For(self, node: ast.For):
+        self.generic_visit(node)
+        rewrite = self._rewrite(node)
+        if rewrite is None:
+            return node
+        self.rewrites.append(rewrite)
+        return rewrite["statements"]
+
+    def _rewrite(self, node: ast.For) -> Optional[Dict]:
+        found = _loop_elements(node)
+        if found is None or node.orelse or len(node.body) != 1:
+            return None
+        elements, index, ranged = found
+        expression = _ElementwiseExpression(elements, index, {})
+        if ranged is not None:
+            length = ast.Name(id=expression.arrays.setdefault(ranged, f"{ranged}_array"), ctx=ast.Load())
+            expression.sequences.append(ranged)  # bound even when the body never reads it
+        else:
+            length = None
+        statement, mask = node.body[0], None
+        if isinstance(statement, ast.If) and not statement.orelse and len(statement.body) == 1:
+            mask = expression.translate_condition(statement.test)
+            if mask is None or not _uses_arrays(mask, expression):
+                return None
+            statement = statement.body[0]
+
+        built = self._vectorized(statement, expression, mask, index, length)
+        if built is None or not expression.sequences:
+            return None
+        kind, result = built
+        statements = [
+            ast.Assign(targets=[ast.Name(id=expression.arrays[sequence], ctx=ast.Store())],
+                       value=_call(_np("asarray"), ast.Name(id=sequence, ctx=ast.Load())))
+            for sequence in expression.sequences
+        ] + [result]
+        for new in statements:
+            ast.copy_location(new, node)
+        return {"line": node.lineno, "end_line": node.end_lineno, "col": node.col_offset, "kind": kind,
+                "loop": node, "statements": statements, "sequences": list(expression.sequences),
+                "free_names": [name for name in expression.free_names if name != _target_name(statement)],
+                "target": _target_name(statement)}
+
+    def _vectorized(self, statement, expression: _ElementwiseExpression, mask, index, length):
+        def masked(value):
+            return value if mask is None else ast.Subscript(value=value, slice=mask, ctx=ast.Load())
+
+        if isinstance(statement, ast.AugAssign) and isinstance(statement.target, ast.Name) \
+                and type(statement.op) in REDUCTIONS:
+            if any(isinstance(n, ast.Name) and n.id == statement.target.id for n in ast.walk(statement.value)):
+                return None  # a recurrence, not a reduction
+            if mask is not None and isinstance(statement.value, ast.Constant) and statement.value.value == 1 \
+                    and isinstance(statement.op, ast.Add):
+                return "count", ast.AugAssign(target=statement.target, op=ast.Add(), value=_count(mask))
+            value = expression.translate(statement.value)
+            if value is None or not expression.sequences:
+                return None
+            if not _uses_arrays(value, expression):
+                # The same value every time: repeat it once per (matching) element.
+                if mask is None:
+                    return None  # nothing element-wise left to vectorize
+                op = ast.Pow() if isinstance(statement.op, ast.Mult) else ast.Mult()
+                return "reduction", ast.AugAssign(target=statement.target, op=statement.op,
+                                                  value=ast.BinOp(left=value, op=op, right=_count(mask)))
+            reduced = _call(_np(REDUCTIONS[type(statement.op)]), masked(value))
+            return "reduction", ast.AugAssign(target=statement.target, op=statement.op, value=_method(reduced, "item"))
+
+        if isinstance(statement, ast.Expr) and isinstance(statement.value, ast.Call) \
+                and isinstance(statement.value.func, ast.Attribute) and statement.value.func.attr == "append" \
+                and isinstance(statement.value.func.value, ast.Name) and len(statement.value.args) == 1:
+            value = expression.translate(statement.value.args[0])
+            if value is None or not expression.sequences:
+                return None
+            if not _uses_arrays(value, expression):
+                if mask is None:
+                    return None
+                values = ast.BinOp(left=ast.List(elts=[value], ctx=ast.Load()), op=ast.Mult(), right=_count(mask))
+            else:
+                values = _method(masked(value), "tolist")
+            return "map", ast.Expr(value=_method(ast.Name(id=statement.value.func.value.id, ctx=ast.Load()),
+                                                 "extend", values))
+
+        if isinstance(statement, ast.Assign) and len(statement.targets) == 1 and index is not None and mask is None:
+            target = statement.targets[0]
+            if isinstance(target, ast.Subscript) and isinstance(target.value, ast.Name) \
+                    and isinstance(target.slice, ast.Name) and target.slice.id == index:
+                value = expression.translate(statement.value)
+                if value is None:
+                    return None
+                size = _call(ast.Name(id="len", ctx=ast.Load()), length)
+                where = ast.Subscript(value=ast.Name(id=target.value.id, ctx=ast.Load()),
+                                      slice=ast.Slice(upper=size), ctx=ast.Store())
+                if not _uses_arrays(value, expression):
+                    values = ast.BinOp(left=ast.List(elts=[value], ctx=ast.Load()), op=ast.Mult(), right=size)
+                else:
+                    values = _method(value, "tolist")
+                return "map", ast.Assign(targets=[where], value=values)
+        return None
+
+
+def _target_name(statement) -> Optional[str]:
+    if isinstance(statement, ast.If):
+        statement = statement.body[0]
+    if isinstance(statement, ast.AugAssign):
+        return statement.target.id
+    if isinstance(statement, ast.Expr):
+        return statement.value.func.value.id
+    if isinstance(statement, ast.Assign):
+        return statement.targets[0].value.id
+    return None
+
+
+def _source(statements: List[ast.AST], indent: int) -> str:
+    # No line wrapping: the rewrite is spliced into the user's own source.
+    text = astor.to_source(ast.Module(body=statements, type_ignores=[]), pretty_source="".join)
+    return "".join(" " * indent + line + "\n" for line in text.splitlines())
+
+
+def _splice(code: str, rewrite: Dict) -> str:
+    lines = code.splitlines(keepends=True)
+    new = lines[:rewrite["line"] - 1] + [_source(rewrite["statements"], rewrite["col"])] + lines[rewrite["end_line"]:]
+    text = "".join(new)
+    if not any(line.strip() in ("import numpy as np", "import numpy as np\n") for line in lines):
+        text = "import numpy as np\n" + text
+    return text
+
+
+def find_vectorizable_loops(code: str) -> List[Dict]:
+    """
+    Static part: every loop VectorizeTransformer can rewrite, with the
+    rewritten code and its unified diff against `code` (one loop at a time,
+    the rest of the source untouched).
+    """
+    transformer = VectorizeTransformer()
+    transformer.visit(ast.parse(code))
+    found = []
+    for rewrite in transformer.rewrites:
+        vectorized = _splice(code, rewrite)
+        found.append({
+            "line": rewrite["line"], "kind": rewrite["kind"], "sequences": rewrite["sequences"],
+            "target": rewrite["target"], "free_names": rewrite["free_names"],
+            "original": ast.unparse(rewrite["loop"]),
+            "rewrite": _source(rewrite["statements"], 0).rstrip("\n"),
+            "vectorized_code": vectorized,
+            "diff": generate_refactor_diff(code, vectorized),
+        })
+    return found
+
+
+# -- checking and timing on synthetic data --
+
+# Fixed values random data practically never hits: zeros (division), signed
+# zero, the int64 limits (overflow) and ints beyond them (object arrays).
+EDGE_CASES = {
+    "edge floats": [0.0, -0.0, 1.0, -1.0, 1e308, -1e308],
+    "edge ints": [0, 1, -1, 2 ** 63 - 1, -2 ** 63],
+    "ints beyond int64": [0, 1, -1, 2 ** 63, -2 ** 63 - 1, 10 ** 20],
+}
+
+
+def _datasets(size: int, seed: int = 0) -> Dict[str, callable]:
+    rng = random.Random(seed)
+    datasets = {
+        "floats": lambda: [rng.uniform(-100, 100) for _ in range(size)],
+        "small ints": lambda: [rng.randint(-1000, 1000) for _ in range(size)],
+        "large ints": lambda: [rng.randint(-2 ** 62, 2 ** 62) for _ in range(size)],
+        "empty": lambda: [],
+    }
+    datasets.update((name, lambda values=values: list(values)) for name, values in EDGE_CASES.items())
+    return datasets
+
+
+def _constant_value(node: ast.AST):
+    # The number a constant expression such as 2 or -0.5 stands for, else None.
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+        value = _constant_value(node.operand)
+        return None if value is None else (-value if isinstance(node.op, ast.USub) else value)
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+        return node.value
+    return None
+
+
+def _operator_issues(rewrite: str) -> List[str]:
+    """
+    Operators whose NumPy semantics differ from Python's on some values:
+    division and modulo by anything but a nonzero constant (NumPy gives
+    inf/nan/0 where the loop raises ZeroDivisionError) and powers that may
+    be negative (integer arrays raise, Python returns a float).
+    """
+    issues = []
+    for node in ast.walk(ast.parse(rewrite)):
+        if not isinstance(node, ast.BinOp):
+            continue
+        right = _constant_value(node.right)
+        if isinstance(node.op, (ast.Div, ast.FloorDiv, ast.Mod)) and not right:
+            issues.append(f"divides by {ast.unparse(node.right)}: NumPy returns inf/nan (or 0) for a zero "
+                          "divisor where the loop raises ZeroDivisionError")
+        elif isinstance(node.op, ast.Pow) and (right is None or right < 0):
+            issues.append(f"raises to the power {ast.unparse(node.right)}: NumPy integer arrays cannot take "
+                          "negative powers, where Python returns a float")
+    return issues
+
+
+def _harness(found: Dict, body: str, data: List) -> str:
+    # Accumulator set up the way such loops usually start.
+    if found["kind"] in ("reduction", "count"):
+        init = "1" if "np.prod" in found["rewrite"] else "0"
+    elif "[:len(" in found["rewrite"]:
+        init = f"[0] * {len(data)}"
+    else:
+        init = "[]"
+    return f"{found['target']} = {init}\n{body}\n"
+
+
+def _namespace(found: Dict, data: List) -> Dict:
+    namespace = {"np": np, "math": math}
+    for name in found["free_names"]:
+        namespace.setdefault(name, FREE_NAME_VALUE)
+    for sequence in found["sequences"]:
+        namespace[sequence] = list(data)
+    return namespace
+
+
+def _run(found: Dict, body: str, data: List):
+    namespace = _namespace(found, data)
+    try:
+        with np.errstate(all="ignore"):
+            exec(_harness(found, body, data), namespace)
+    except Exception as e:
+        return ("raises", type(e).__name__)
+    return ("value", namespace[found["target"]])
+
+
+def _compare_results(expected, actual):
+    """
+    "same", "rounding" (floats equal to ~1e-9), "type" (equal values,
+    different type) or "differs".
+    """
+    if expected[0] != actual[0]:
+        return "differs"
+    a, b = expected[1], actual[1]
+    if expected[0] == "raises":
+        return "same" if a == b else "differs"
+    pairs = list(zip(a, b)) if isinstance(a, list) and isinstance(b, list) and len(a) == len(b) else [(a, b)]
+    if isinstance(a, list) != isinstance(b, list) or (isinstance(a, list) and len(a) != len(b)):
+        return "differs"
+    verdict = "same"
+    for x, y in pairs:
+        if type(x) is not type(y):
+            if x != y:
+                return "differs"
+            verdict = "type"
+        elif x != y:
+            if isinstance(x, float) and (math.isclose(x, y, rel_tol=1e-9, abs_tol=1e-9)
+                                         or (math.isnan(x) and math.isnan(y))):
+                verdict = "rounding" if verdict == "same" else verdict
+            else:
+                return "differs"
+    return verdict
+
+
+def check_rewrite(found: Dict, size: int = CHECK_SIZE) -> Dict:
+    """
+    Runs the original loop and its rewrite on synthetic data (floats, small
+    and large ints, empty input and the EDGE_CASES) and compares the
+    results. Returns {"safe", "issues": [...], "notes": [...]}: the rewrite
+    is unsafe when on some data it computes a different value or raises
+    differently, e.g. int64 overflow where Python ints would just grow, or
+    when it uses an operator that does so on values not tried (see
+    _operator_issues).
+    """
+    issues, notes = _operator_issues(found["rewrite"]), []
+    if len(found["sequences"]) > 1:
+        notes.append("assumes " + ", ".join(found["sequences"]) + " have the same length "
+                     "(NumPy raises where the loop would stop at the shortest)")
+    if found["free_names"]:
+        notes.append("assumes " + ", ".join(found["free_names"]) + " are numbers that do not change in the loop")
+    for name, make in _datasets(size).items():
+        data = make()
+        expected = _run(found, found["original"], data)
+        actual = _run(found, found["rewrite"], data)
+        verdict = _compare_results(expected, actual)
+        if verdict == "differs":
+            if name in ("large ints", "edge ints") and expected[0] == actual[0] == "value":
+                issues.append(f"{name}: results differ; NumPy int64 overflows silently where Python ints grow")
+            elif expected[0] != actual[0] or expected[0] == "raises":
+                before = f"raises {expected[1]}" if expected[0] == "raises" else "returns a value"
+                after = f"raises {actual[1]}" if actual[0] == "raises" else "returns a value"
+                issues.append(f"{name}: the loop {before} but the rewrite {after}")
+            else:
+                issues.append(f"{name}: results differ")
+        elif verdict == "type":
+            notes.append(f"{name}: same value but a different result type")
+        elif verdict == "rounding":
+            notes.append(f"{name}: floating-point rounding differs in the last digits")
+    return {"safe": not issues, "issues": issues, "notes": notes}
+
+
+def measure_speedup(found: Dict, size: int = BENCHMARK_SIZE, **options) -> Dict:
+    """
+    benchmark_harness.compare() of the loop against its rewrite on `size`
+    random floats per sequence.
+    """
+    data = _datasets(size)["floats"]()
+    namespace = _namespace(found, data)
+    before = _harness(found, found["original"], data)
+    after = _harness(found, found["rewrite"], data)
+    with np.errstate(all="ignore"):
+        return compare(before, after, globals=namespace, **options)
+
+
+def vectorize(code: str, measure: bool = True, size: int = BENCHMARK_SIZE, **options) -> List[Dict]:
+    """
+    find_vectorizable_loops() plus, for each loop, "safety" (check_rewrite)
+    and, with `measure`, "benchmark" (measure_speedup). Needs NumPy to run
+    anything; without it only the static part is returned.
+    """
+    found = find_vectorizable_loops(code)
+    if np is None:
+        return found
+    for entry in found:
+        entry["safety"] = check_rewrite(entry)
+        if measure:
+            entry["benchmark"] = measure_speedup(entry, size=size, **options)
+    return found
+
+
+def format_vectorization(results: List[Dict]) -> str:
+    if not results:
+        return "No vectorizable loops found."
+    out = []
+    for entry in results:
+        out.append(f"Loop at line {entry['line']} ({entry['kind']}) can be vectorized:")
+        out.append(entry["diff"])
+        safety = entry.get("safety")
+        if safety is not None:
+            out.append("  SAFE" if safety["safe"] else "  UNSAFE: " + "; ".join(safety["issues"]))
+            out.extend(f"  note: {note}" for note in safety["notes"])
+        measured = entry.get("benchmark")
+        if measured is not None:
+            out.append(f"  measured: {measured['speedup']:.1f}x ({measured['verdict']})")
+        out.append("")
+    return "\n".join(out)
+
+
+def run_vectorization(code: str) -> None:
+    """
+    Prints every vectorizable loop with its NumPy rewrite, whether the
+    rewrite is safe and its measured speedup.
+    """
+    print("\n=== Loop Vectorization ===\n")
+    try:
+        results = vectorize(code)
+    except SyntaxError as e:
+        print(f"SyntaxError: {e}")
+        return
+    print(format_vectorization(results))
@@ -1,6 +1,10 @@
 import difflib
 import ast
+import sys
 from llm_handler import LLMAssistant
+from neuro_symbolic_code_mentor.analysis_context import AnalysisContext
+from neuro_symbolic_code_mentor.prompt_builder import default_budget, slice_code, truncate_to_budget
+from neuro_symbolic_code_mentor.streaming import explain
 
 class MergeConflictAnalyzer:
     """
@@ -10,6 +14,8 @@ class MergeConflictAnalyzer:
     def __init__(self, branch_a_code, branch_b_code):
         self.branch_a_code = branch_a_code
         self.branch_b_code = branch_b_code
+        self.context_a = AnalysisContext(branch_a_code, filename="branch_a")
+        self.context_b = AnalysisContext(branch_b_code, filename="branch_b")
         self.assistant = LLMAssistant()
 
     def generate_diff(self):
@@ -31,11 +37,8 @@ class MergeConflictAnalyzer:
         """
         issues = []
         try:
-            a_tree = ast.parse(self.branch_a_code)
-            b_tree = ast.parse(self.branch_b_code)
-
-            a_funcs = {node.name for node in ast.walk(a_tree) if isinstance(node, ast.FunctionDef)}
-            b_funcs = {node.name for node in ast.walk(b_tree) if isinstance(node, ast.FunctionDef)}
+            a_funcs = set(self.context_a.result("function_names"))
+            b_funcs = set(self.context_b.result("function_names"))
 
             overlap = a_funcs.intersection(b_funcs)
             if overlap:
@@ -45,19 +48,41 @@ class MergeConflictAnalyzer:
 
         return issues
 
-    def propose_merge_resolution(self):
+    def changed_lines(self):
+        """
+        Line numbers (1-based) that differ between the branches, as
+        (lines in branch A, lines in branch B).
+        """
+        a_lines = self.branch_a_code.splitlines()
+        b_lines = self.branch_b_code.splitlines()
+        changed_a, changed_b = [], []
+        matcher = difflib.SequenceMatcher(None, a_lines, b_lines, autojunk=False)
+        for tag, a_start, a_end, b_start, b_end in matcher.get_opcodes():
+            if tag == "equal":
+                continue
+            # a pure insertion/deletion is flagged at the line next to it
+            changed_a.extend(range(a_start + 1, a_end + 1) if a_end > a_start else [max(a_start, 1)])
+            changed_b.extend(range(b_start + 1, b_end + 1) if b_end > b_start else [max(b_start, 1)])
+        return changed_a, changed_b
+
+    def propose_merge_resolution(self, budget=None, stream=None):
         """
         Combine everything (diff + symbolic issues) into an LLM prompt to suggest a resolution.
+        The diff and each branch get a third of `budget` tokens; a branch too
+        large for its share is cut down to the changed code and what it references.
+        With `stream` (a file), the reply is written there as it is generated.
         """
-        diff_text = self.generate_diff()
+        share = (budget if budget is not None else default_budget()) // 3
+        diff_text = truncate_to_budget(self.generate_diff(), share)
         symbolic_issues = self.symbolic_analysis()
+        changed_a, changed_b = self.changed_lines()
         prompt = f"""
 We have two branches of Python code that might conflict.
 Branch A code:
-{self.branch_a_code}
+{slice_code(self.branch_a_code, lines=changed_a, budget=share, context=self.context_a)}
 
 Branch B code:
-{self.branch_b_code}
+{slice_code(self.branch_b_code, lines=changed_b, budget=share, context=self.context_b)}
 
 Diff:
 {diff_text}
@@ -67,13 +92,12 @@ Symbolic issues:
 
 Provide a merged version and explain the rationale for each conflict resolution step.
 """
-        return self.assistant.generate_explanation(prompt)
+        return explain(self.assistant, prompt, stream, label="propose_merge_resolution")
 
 def interactive_merge_resolution(code_a, code_b):
     """
     Day 11 main function: merges two code segments with LLM + symbolic analysis.
     """
     analyzer = MergeConflictAnalyzer(code_a, code_b)
-    resolution = analyzer.propose_merge_resolution()
     print("\n=== Proposed Merge Resolution ===\n")
-    print(resolution)
+    analyzer.propose_merge_resolution(stream=sys.stdout)
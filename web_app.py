@@ -1,18 +1,61 @@
-from flask import Flask, render_template, request
+import threading
+import time
+from flask import Flask, Response, render_template, request
 from neuro_symbolic_code_mentor.mentor import CodeMentor
+from neuro_symbolic_code_mentor.streaming import sse_event
 
 app = Flask(__name__)
 
+_mentor = None
+_mentor_lock = threading.Lock()
+
+def get_mentor() -> CodeMentor:
+    """
+    One mentor per process: the neural model is loaded on the first request
+    and reused (and micro-batched) for every request after that.
+    """
+    global _mentor
+    with _mentor_lock:
+        if _mentor is None:
+            # Enable neural suggestions in the web interface by default
+            _mentor = CodeMentor(use_neural=True)
+        return _mentor
+
 @app.route("/", methods=["GET", "POST"])
 def index():
     suggestions = []
     code_input = ""
     if request.method == "POST":
         code_input = request.form.get("code_input", "")
-        # Enable neural suggestions in the web interface by default
-        mentor = CodeMentor(use_neural=True)
-        suggestions = mentor.analyze(code_input)
+        suggestions = get_mentor().analyze(code_input)
     return render_template("index.html", suggestions=suggestions, code_input=code_input)
 
+@app.route("/stream", methods=["POST"])
+def stream():
+    """
+    Server-sent events for the analysis of the posted code: a "suggestion"
+    event per symbolic suggestion, "token" events while the neural
+    suggestion is generated, then "done" with the time to first token.
+    """
+    code_input = request.form.get("code_input", "")
+    mentor = get_mentor()
+
+    def events():
+        started = time.perf_counter()
+        first_token = None
+        for kind, text in mentor.stream(code_input):
+            if kind == "token" and first_token is None and text:
+                first_token = time.perf_counter() - started
+            yield sse_event(text, kind)
+        total = time.perf_counter() - started
+        app.logger.info("analysis streamed: first token %s, total %.3f s",
+                        f"{first_token:.3f} s" if first_token is not None else "-", total)
+        yield sse_event({"first_token_ms": first_token * 1000 if first_token is not None else None,
+                         "total_ms": total * 1000}, "done")
+
+    headers = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}  # no proxy buffering
+    return Response(events(), mimetype="text/event-stream", headers=headers)
+
 if __name__ == "__main__":
-    app.run(debug=True)
+    get_mentor()  # load the model before serving the first request
+    app.run(debug=True, threaded=True)